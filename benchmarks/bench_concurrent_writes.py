@@ -0,0 +1,82 @@
+"""Stress benchmark of concurrent config writes from several processes.
+
+Each writer process repeatedly saves its own tags into the configuration
+of the same GUI title. The benchmark reports the aggregated save
+throughput and checks that no update was lost.
+
+Usage:
+    python benchmarks/bench_concurrent_writes.py --writers 1 2 4 8
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from ezinput import ezinput_config
+
+TITLE = "bench_concurrent"
+
+
+def _writer(config_path, storage, writer, saves, keys, start):
+    ezinput_config.CONFIG_PATH = Path(config_path)
+    snapshot = {}
+    start.wait()
+    for i in range(saves):
+        cfg = {f"w{writer}_k{k}": i for k in range(keys)}
+        ezinput_config.save_config(TITLE, cfg, snapshot, storage)
+
+
+def run(writers, saves, keys, storage):
+    """Run one benchmark round, returning (seconds, lost updates)."""
+    with tempfile.TemporaryDirectory() as config_path:
+        start = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=_writer,
+                args=(config_path, storage, w, saves, keys, start),
+            )
+            for w in range(writers)
+        ]
+        for p in processes:
+            p.start()
+        t0 = time.perf_counter()
+        start.set()
+        for p in processes:
+            p.join()
+        elapsed = time.perf_counter() - t0
+
+        ezinput_config.CONFIG_PATH = Path(config_path)
+        ezinput_config.clear_cache()
+        cfg = ezinput_config.get_config(TITLE, storage)
+        lost = sum(
+            cfg.get(f"w{w}_k{k}") != saves - 1
+            for w in range(writers)
+            for k in range(keys)
+        )
+        return elapsed, lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=5)
+    parser.add_argument(
+        "--storage",
+        default="yaml",
+        choices=list(ezinput_config.STORAGES),
+    )
+    args = parser.parse_args()
+
+    print(f"storage={args.storage} saves={args.saves} keys={args.keys}")
+    print(f"{'writers':>8} {'seconds':>9} {'saves/s':>9} {'lost':>6}")
+    for writers in args.writers:
+        elapsed, lost = run(writers, args.saves, args.keys, args.storage)
+        rate = writers * args.saves / elapsed
+        print(f"{writers:>8} {elapsed:>9.3f} {rate:>9.0f} {lost:>6}")
+
+
+if __name__ == "__main__":
+    main()
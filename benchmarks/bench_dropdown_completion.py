@@ -0,0 +1,99 @@
+"""Benchmark of the per-keystroke latency of dropdown completion.
+
+For option lists of increasing size, the sample ID of one option is typed
+one character at a time and, after each keystroke, the completions are
+computed and the text is validated, as the prompt does while typing:
+
+- word: `WordCompleter` and a validator scanning the list, as
+  `add_dropdown` used to do
+- indexed: the `OptionIndex` completer and validator of `add_dropdown`
+- fuzzy: the same with `fuzzy=True`
+
+The index is built once per list, as `add_dropdown` does, and not timed.
+Results are saved and compared to a baseline by `regression.py`.
+
+Usage:
+    python benchmarks/bench_dropdown_completion.py --output dropdown.json
+    python benchmarks/bench_dropdown_completion.py --counts 1000 50000
+"""
+
+import time
+
+from prompt_toolkit.completion import CompleteEvent, WordCompleter
+from prompt_toolkit.document import Document
+from prompt_toolkit.validation import ValidationError, Validator
+from regression import create_parser, finish
+
+from ezinput.ezinput_options import IndexedCompleter, OptionIndex
+
+COUNTS = (1000, 10000, 50000, 100000)
+
+
+def _options(count):
+    return [f"sample_{i:06d}_{'abcdefgh'[i % 8]}" for i in range(count)]
+
+
+def _word(options):
+    validator = Validator.from_callable(lambda x: x in options)
+    return WordCompleter(options), validator
+
+
+def _indexed(options, fuzzy=False):
+    index = OptionIndex(options)
+    validator = Validator.from_callable(index.__contains__)
+    return IndexedCompleter(index, fuzzy=fuzzy), validator
+
+
+def _keystrokes(completer, validator, text):
+    """Time typing a text, in seconds per keystroke."""
+    event = CompleteEvent(text_inserted=True)
+    t0 = time.perf_counter()
+    for end in range(1, len(text) + 1):
+        document = Document(text[:end])
+        list(completer.get_completions(document, event))
+        try:
+            validator.validate(document)
+        except ValidationError:
+            pass
+    return (time.perf_counter() - t0) / len(text)
+
+
+def measure(counts, repeat):
+    """Run all measurements, returning the best time per keystroke of each
+    in seconds, as {name: {count: time}}."""
+    completers = {
+        "word": _word,
+        "indexed": _indexed,
+        "fuzzy": lambda options: _indexed(options, fuzzy=True),
+    }
+    results = {name: {} for name in completers}
+    for count in counts:
+        options = _options(count)
+        text = options[count * 2 // 3]
+        for name, create in completers.items():
+            completer, validator = create(options)
+            results[name][str(count)] = min(
+                _keystrokes(completer, validator, text) for _ in range(repeat)
+            )
+    return results
+
+
+def main():
+    parser = create_parser(__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=COUNTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = measure(args.counts, args.repeat)
+    print(f"{'options':>9}" + "".join(f" {name:>12}" for name in results))
+    for count in map(str, args.counts):
+        row = "".join(
+            f" {values[count] * 1e3:>9.3f} ms" for values in results.values()
+        )
+        print(f"{count:>9}{row}")
+
+    finish(args, results, digits=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark of the per-field overhead of the prompt backend.
+
+A form of many fields is answered through a prompt_toolkit pipe input, as
+in the tests, and the time per field is reported for:
+
+- before: one `prompt_toolkit.prompt` call per field, building a new
+  session, completer and validator each time, as EZInputPrompt used to
+- after: `EZInputPrompt`, which reuses one session for all its fields and
+  caches completers and validators
+
+Fields cycle through text, integer range, dropdown and yes/no widgets.
+Results are saved and compared to a baseline by `regression.py`.
+
+Usage:
+    python benchmarks/bench_prompt_fields.py --fields 40 --output fields.json
+    python benchmarks/bench_prompt_fields.py --baseline fields.json
+"""
+
+import os
+import tempfile
+import time
+
+from prompt_toolkit import prompt
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.completion import WordCompleter
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+from prompt_toolkit.validation import Validator
+from regression import create_parser, finish
+
+OPTIONS = [f"Option {i}" for i in range(20)]
+KINDS = ("text", "int_range", "dropdown", "check")
+ANSWERS = {"text": "text", "int_range": "5", "dropdown": "Option 3"}
+ANSWERS["check"] = "yes"
+
+
+def _answers(fields):
+    return "".join(ANSWERS[KINDS[i % len(KINDS)]] + "\n" for i in range(fields))
+
+
+def _before(fields):
+    """Ask every field with its own `prompt` call, as before."""
+    for i in range(fields):
+        kind = KINDS[i % len(KINDS)]
+        if kind == "text":
+            prompt("Text: ")
+        elif kind == "int_range":
+            prompt(
+                "Number: ",
+                validator=Validator.from_callable(
+                    lambda x: x.strip() != ""
+                    and x.isdigit()
+                    and 0 <= int(x) <= 10,
+                    error_message="Please enter a valid number (0-10).",
+                    move_cursor_to_end=True,
+                ),
+            )
+        elif kind == "dropdown":
+            prompt(
+                "Select: ",
+                completer=WordCompleter(OPTIONS),
+                validator=Validator.from_callable(
+                    lambda x: x in OPTIONS,
+                    error_message="Please select a valid choice.",
+                    move_cursor_to_end=True,
+                ),
+            )
+        else:
+            prompt(
+                "Check: ",
+                completer=WordCompleter(["yes", "no"]),
+                validator=Validator.from_callable(
+                    lambda x: x in ["yes", "no"],
+                    error_message="Please enter 'yes' or 'no'.",
+                    move_cursor_to_end=True,
+                ),
+            )
+
+
+def _after(fields):
+    """Ask every field with an `EZInputPrompt`."""
+    from ezinput import EZInput
+
+    gui = EZInput("bench_prompt_fields", mode="prompt")
+    for i in range(fields):
+        kind = KINDS[i % len(KINDS)]
+        tag = f"field_{i}"
+        if kind == "text":
+            gui.add_text(tag, "Text:")
+        elif kind == "int_range":
+            gui.add_int_range(tag, "Number:", 0, 10)
+        elif kind == "dropdown":
+            gui.add_dropdown(tag, OPTIONS, "Select:")
+        else:
+            gui.add_check(tag, "Check:")
+
+
+def _time(form, fields):
+    """Time answering a form through a pipe input, in seconds."""
+    with create_pipe_input() as pipe_input, create_app_session(
+        input=pipe_input, output=DummyOutput()
+    ):
+        pipe_input.send_text(_answers(fields))
+        t0 = time.perf_counter()
+        form(fields)
+        return time.perf_counter() - t0
+
+
+def measure(fields, repeat):
+    """Run all measurements, returning the best time per field of each
+    in seconds."""
+    with tempfile.TemporaryDirectory() as config_path:
+        os.environ["EZINPUT_CONFIG_PATH"] = config_path
+        benchmarks = {"before": _before, "after": _after}
+        return {
+            name: min(_time(form, fields) for _ in range(repeat)) / fields
+            for name, form in benchmarks.items()
+        }
+
+
+def main():
+    parser = create_parser(__doc__)
+    parser.add_argument("--fields", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = measure(args.fields, args.repeat)
+    print(f"{'benchmark':>16} {'ms/field':>9}")
+    for name, value in results.items():
+        print(f"{name:>16} {value * 1e3:>9.2f}")
+    print(f"{'speedup':>16} {results['before'] / results['after']:>9.1f}x")
+
+    finish(args, results, digits=2, fields=args.fields)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of the serializers used for config and parameter files.
+
+Each format dumps and parses a flat dictionary of mixed values. YAML is
+measured both with the pure Python safe classes and with libyaml, when
+PyYAML was built with it. Formats whose package is not installed are
+skipped.
+
+Usage:
+    python benchmarks/bench_serializers.py --keys 10 1000 100000
+"""
+
+import argparse
+import io
+import time
+
+import yaml
+
+from ezinput.ezinput_serializers import SERIALIZERS
+
+
+def _data(keys):
+    values = ("some text", 42, 3.14, True)
+    return {f"key_{i}": values[i % len(values)] for i in range(keys)}
+
+
+def _formats():
+    formats = {
+        "yaml (python)": (
+            lambda s: yaml.load(s, Loader=yaml.SafeLoader),
+            lambda d, s: yaml.dump(d, s, Dumper=yaml.SafeDumper),
+            False,
+        ),
+    }
+    if yaml.__with_libyaml__:
+        formats["yaml (libyaml)"] = SERIALIZERS[".yml"]
+    for suffix in (".json", ".toml", ".msgpack"):
+        formats[suffix[1:]] = SERIALIZERS[suffix]
+    return formats
+
+
+def _best(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(load, dump, binary, keys, repeat):
+    """Return the best (dump, load) times in seconds for one format."""
+    data = _data(keys)
+    new_stream = io.BytesIO if binary else io.StringIO
+
+    def _dump():
+        stream = new_stream()
+        dump(data, stream)
+        return stream.getvalue()
+
+    payload = _dump()
+    dump_time = _best(_dump, repeat)
+    load_time = _best(lambda: load(new_stream(payload)), repeat)
+    return dump_time, load_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'format':>15} {'keys':>8} {'dump ms':>10} {'load ms':>10}")
+    for name, (load, dump, binary) in _formats().items():
+        for keys in args.keys:
+            try:
+                dump_time, load_time = run(load, dump, binary, keys, args.repeat)
+            except ImportError as e:
+                print(f"{name:>15} skipped ({e.name} not installed)")
+                break
+            print(
+                f"{name:>15} {keys:>8} "
+                f"{dump_time * 1e3:>10.2f} {load_time * 1e3:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark of the startup cost of EZInput.
+
+Every measurement runs in a fresh interpreter, as a command line tool
+would, and keeps the best of several runs:
+
+- import_ezinput: cumulative import time of `ezinput`, from
+  `python -X importtime`
+- create_prompt: constructing `EZInput(title)` in a terminal
+- create_jupyter: constructing `EZInput(title)` in a simulated kernel,
+  with IPython already imported as it is in a notebook
+- first_prompt: from importing ezinput to the first `add_text` answered
+  through a prompt_toolkit pipe input
+
+Results are saved and compared to a baseline by `regression.py`.
+
+Usage:
+    python benchmarks/bench_startup.py --output baseline.json
+    python benchmarks/bench_startup.py --baseline baseline.json --threshold 0.2
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from regression import create_parser, finish
+
+IMPORT = "import ezinput"
+
+CREATE_PROMPT = """
+import time
+t0 = time.perf_counter()
+from ezinput import EZInput
+gui = EZInput("bench_startup")
+assert gui.mode == "prompt"
+print(time.perf_counter() - t0)
+"""
+
+CREATE_JUPYTER = """
+import time
+import types
+import IPython
+IPython.get_ipython = lambda: types.SimpleNamespace(config={"IPKernelApp": {}})
+t0 = time.perf_counter()
+from ezinput import EZInput
+gui = EZInput("bench_startup")
+assert gui.mode == "jupyter"
+print(time.perf_counter() - t0)
+"""
+
+FIRST_PROMPT = """
+import time
+t0 = time.perf_counter()
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+from ezinput import EZInput
+with create_pipe_input() as pipe_input:
+    with create_app_session(input=pipe_input, output=DummyOutput()):
+        pipe_input.send_text("answer\\n")
+        gui = EZInput("bench_startup")
+        gui.add_text("text", "Enter text:")
+print(time.perf_counter() - t0)
+"""
+
+
+def _run(code, env, args=()):
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time(env):
+    """Cumulative import time of ezinput in seconds."""
+    stderr = _run(IMPORT, env, ["-X", "importtime"]).stderr
+    for line in reversed(stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "ezinput":
+            return int(fields[1]) / 1e6
+    raise RuntimeError("ezinput not found in -X importtime output")
+
+
+def measure(repeat):
+    """Run all measurements, returning the best time of each in seconds."""
+    with tempfile.TemporaryDirectory() as config_path:
+        env = dict(
+            os.environ,
+            EZINPUT_CONFIG_PATH=config_path,
+            PYTHONDONTWRITEBYTECODE="1",
+        )
+        benchmarks = {
+            "import_ezinput": lambda: _import_time(env),
+            "create_prompt": lambda: float(_run(CREATE_PROMPT, env).stdout),
+            "create_jupyter": lambda: float(_run(CREATE_JUPYTER, env).stdout),
+            "first_prompt": lambda: float(_run(FIRST_PROMPT, env).stdout),
+        }
+        return {
+            name: min(bench() for _ in range(repeat))
+            for name, bench in benchmarks.items()
+        }
+
+
+def main():
+    parser = create_parser(__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    print(f"{'benchmark':>16} {'ms':>9}")
+    for name, value in results.items():
+        print(f"{name:>16} {value * 1e3:>9.1f}")
+
+    finish(args, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Saving benchmark results and comparing them to a baseline.
+
+Shared by the benchmarks tracking regressions: `create_parser` adds the
+`--output`, `--baseline` and `--threshold` options, and `finish` writes
+the results as JSON and exits with status 1 if any measurement is slower
+than the baseline by more than the threshold.
+
+Results map benchmark names to times in seconds, or to nested
+dictionaries of them, which are compared as "name/key".
+"""
+
+import argparse
+import json
+import platform
+import sys
+
+EPILOG = (
+    "Results are written as JSON. When a baseline file is given, the "
+    "script exits with status 1 if any measurement is slower than the "
+    "baseline by more than the threshold."
+)
+
+
+def create_parser(doc):
+    """Create the parser of a benchmark script, described by the first
+    line of its docstring, with the regression options."""
+    parser = argparse.ArgumentParser(
+        description=doc.splitlines()[0], epilog=EPILOG
+    )
+    parser.add_argument("--output", help="JSON file to write results to")
+    parser.add_argument("--baseline", help="JSON file of previous results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown over the baseline, as a fraction "
+        "(default: 0.25)",
+    )
+    return parser
+
+
+def _flatten(results, prefix=""):
+    flat = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}/"))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def compare(results, baseline, threshold):
+    """Get the measurements slower than the baseline by more than
+    `threshold` (a fraction), as {name: (baseline, result)}."""
+    results = _flatten(results)
+    baseline = _flatten(baseline)
+    return {
+        name: (baseline[name], value)
+        for name, value in results.items()
+        if name in baseline and value > baseline[name] * (1 + threshold)
+    }
+
+
+def finish(args, results, digits=1, **info):
+    """Write the results to `args.output` and compare them to
+    `args.baseline`, exiting with status 1 on a regression.
+
+    `digits` is the number of decimals of the reported milliseconds, and
+    `info` is written to the JSON file along with the results.
+    """
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    **info,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, (before, after) in regressions.items():
+            print(
+                f"Regression in {name}: {before * 1e3:.{digits}f} ms -> "
+                f"{after * 1e3:.{digits}f} ms"
+            )
+        if regressions:
+            sys.exit(1)
@@ -2,6 +2,26 @@
 .. include:: ../../README.md
 """
 
-from .ezinput_jupyter import EZInputJupyter
-from .ezinput_prompt import EZInputPrompt
 from .ezinput import EZInput
+
+__all__ = ["EZInput", "EZInputHeadless", "EZInputJupyter", "EZInputPrompt"]
+
+# the backends are imported on first use, so terminal programs don't load
+# the widget stack and notebooks don't load prompt_toolkit
+_BACKENDS = {
+    "EZInputHeadless": ".ezinput_headless",
+    "EZInputJupyter": ".ezinput_jupyter",
+    "EZInputPrompt": ".ezinput_prompt",
+}
+
+
+def __getattr__(name):
+    if name in _BACKENDS:
+        from importlib import import_module
+
+        return getattr(import_module(_BACKENDS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
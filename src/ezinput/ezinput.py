@@ -1,29 +1,19 @@
+from __future__ import annotations
+
 import os
 import sys
-import yaml
-import ipywidgets as widgets
-
-from pathlib import Path
 from typing import Optional
 
-from .ezinput_prompt import EZInputPrompt
-from .ezinput_jupyter import EZInputJupyter
-
-try:
-    from google.colab import output
-
-    output.enable_custom_widget_manager()
-except ImportError:
-    pass
+from .ezinput_cli import parse_argv, read_env
+from .ezinput_config import get_config, save_config, shared_config
+from .ezinput_serializers import load_file
+from .ezinput_spec import load_spec
 
 """
 A module to help simplify the create of GUIs in Jupyter notebooks and CLIs.
 """
 
-CONFIG_PATH = Path.home() / ".ezinput"
-
-if not os.path.exists(CONFIG_PATH):
-    os.makedirs(CONFIG_PATH)
+MODES = ("jupyter", "prompt", "headless")
 
 
 class EZInput:
@@ -33,37 +23,96 @@ class EZInput:
         width: str = "50%",
         mode=None,
         params_file: Optional[str] = None,
+        storage=None,
+        argv: list | None = None,
+        form: bool = False,
+        async_mode: bool = False,
+        express: bool = False,
+        add_help: bool = False,
     ):
         """
         Initializes an instance of the EZInput class.
         Args:
             title (str): The title of the input interface. Defaults to "base".
             width (str): The width of the input interface layout. Defaults to "50%".
+            mode (str): The backend, "jupyter", "prompt" or "headless".
+                Defaults to the `EZINPUT_MODE` environment variable, or to
+                "jupyter" in a notebook and "prompt" otherwise.
+            argv (list): Command-line arguments giving widget values, e.g.
+                `--threshold 0.5`, which are then not prompted for. Defaults
+                to `sys.argv[1:]`, pass [] to ignore the command line.
+                Values can also be set by `EZINPUT_<TITLE>_<TAG>`
+                environment variables, see `ezinput_cli`.
+            storage (str): Storage used to remember values, e.g. "yaml",
+                "journal" or "sqlite". Defaults to the `EZINPUT_STORAGE`
+                environment variable, or "yaml".
+            form (bool): In the terminal, ask all widgets in one full-screen
+                form when `show` is called instead of one at a time as they
+                are added. Defaults to False.
+            async_mode (bool): In the terminal, ask the widgets when
+                `await gui.show_async()` is called instead of as they are
+                added, without blocking the event loop. Defaults to False.
+            express (bool): In the terminal, list the values of all widgets
+                when `show` is called, from the parameters file, remembered
+                values or defaults, to accept them all with Enter or choose
+                the ones to change. Defaults to False.
+            add_help (bool): Outside Jupyter, make `-h`/`--help` list the
+                flags of the widgets and exit, once a value is first read
+                or at exit. Defaults to False, leaving these flags to the
+                script.
         """
 
         self.title = title
+        self._storage = storage
+        self.spec = None
         self.mode = None
         self._nLabels = 0
-        self.cfg = self._get_config(title)
+        self._sources = {}
+        self.env = read_env(title)
+        self.cfg = shared_config(title, self._storage)
         if params_file is not None:
             self.params = self._load_params(params_file)
             print(self.params)
         else:
             self.params = None
         self.elements = {}
+        self.form = form
+        self.async_mode = async_mode
+        self.express = express
 
-        if mode is None:
-            self._detect_env(width)
+        self._detect_env(
+            width, mode or os.environ.get("EZINPUT_MODE"), argv, add_help
+        )
+
+    @classmethod
+    def from_spec(cls, path: str, title: str | None = None, **kwargs):
+        """
+        Creates a GUI from a YAML or JSON spec file describing its widgets.
+        The compiled spec is cached by file hash, see `ezinput_spec`.
+        Args:
+            path (str): The path to the spec file.
+            title (str): The title of the GUI. Defaults to the title of the
+                spec, or to the file name.
+            **kwargs: Other arguments of `EZInput`, e.g. `params_file`.
+        Returns:
+            EZInput: The GUI with the widgets of the spec added. In the
+                terminal, the widgets are prompted for while building it.
+        """
+        spec = load_spec(path)
+        kwargs.setdefault("width", spec.width)
+        gui = cls(title or spec.title, **kwargs)
+        gui.spec = spec
+        spec.build(gui)
+        return gui
 
     def _load_params(self, params_file: Optional[str] = None):
         """
-        Loads parameters from a YAML file.
+        Loads parameters from a YAML, JSON, TOML or msgpack file.
         Args:
-            params_file (str): The path to the YAML file containing parameters.
+            params_file (str): The path to the file containing parameters.
         """
         if os.path.exists(params_file):
-            with open(params_file, "r") as stream:
-                return yaml.safe_load(stream)
+            return load_file(params_file)
         else:
             return None
 
@@ -85,33 +134,20 @@ class EZInput:
         if title is None:
             title = self.title
 
-        config_file = CONFIG_PATH / f"{title}.yml"
-
-        if not config_file.exists():
-            return {}
-
-        with open(config_file, "r") as f:
-            return yaml.load(f, Loader=yaml.SafeLoader)
+        return get_config(title, self._storage)
 
     def save_settings(self):
         """
         @unified
         Save the widget values to the configuration file.
         """
-        for tag in self.elements:
-            if tag.startswith("label_"):
-                pass
-            elif hasattr(self.elements[tag], "value"):
-                self.cfg[tag] = self.elements[tag].value
-        config_file = CONFIG_PATH / f"{self.title}.yml"
-        config_file.parent.mkdir(exist_ok=True)
-
-        base_config = self._get_config(self.title)  # loads the config file
-        for key, value in self.cfg.items():
-            base_config[key] = value
-
-        with open(config_file, "w") as f:
-            yaml.dump(base_config, f)
+        self.cfg.save(
+            {
+                tag: element.value
+                for tag, element in self.elements.items()
+                if not tag.startswith("label_") and hasattr(element, "value")
+            }
+        )
 
     def _save_config(self, title: str, cfg: dict):
         """
@@ -125,28 +161,52 @@ class EZInput:
         cfg : dict
             The configuration dictionary.
         """
-        config_file = CONFIG_PATH / f"{title}.yml"
-        config_file.parent.mkdir(exist_ok=True)
-
-        base_config = self._get_config(title)  # loads the config file
-        for key, value in cfg.items():
-            base_config[key] = value
-
-        with open(config_file, "w") as f:
-            yaml.dump(base_config, f)
-
-    def _detect_env(self, width):
-        try:
-            get_ipython = sys.modules["IPython"].get_ipython
-            if "IPKernelApp" in get_ipython().config:
-                self._layout = widgets.Layout(width=width)
-                self._style = {"description_width": "initial"}
-                self._main_display = widgets.VBox()
-                self.mode = "jupyter"
-                self.__class__ = EZInputJupyter
-            else:
-                self.mode = "prompt"
-                self.__class__ = EZInputPrompt
-        except Exception:
-            self.mode = "prompt"
+        save_config(title, cfg, storage=self._storage)
+
+    def _detect_env(self, width, mode=None, argv=None, add_help=False):
+        """
+        Switch to the Jupyter, terminal or headless backend, importing only
+        the one that is used.
+        Args:
+            width (str): The width of the Jupyter layout.
+            mode (str): The backend to use, detected if None.
+            argv (list): The command-line arguments, ignored in Jupyter.
+                Defaults to `sys.argv[1:]`.
+            add_help (bool): Whether `-h`/`--help` shows the help of the
+                widget flags.
+        """
+        if mode is None:
+            try:
+                # IPython is only in sys.modules if a shell imported it
+                get_ipython = sys.modules["IPython"].get_ipython
+                jupyter = "IPKernelApp" in get_ipython().config
+            except Exception:
+                jupyter = False
+            mode = "jupyter" if jupyter else "prompt"
+        if mode not in MODES:
+            raise ValueError(
+                f"Unknown mode '{mode}', expected one of {list(MODES)}."
+            )
+        self.cli, show_help = {}, False
+        if mode != "jupyter":
+            self.cli, show_help = parse_argv(argv)
+            show_help = show_help and add_help
+            if show_help:
+                # collect the widgets without prompting to describe them
+                mode = "headless"
+        if mode == "jupyter":
+            from .ezinput_jupyter import EZInputJupyter
+
+            self.__class__ = EZInputJupyter
+            self._init_display(width)
+        elif mode == "headless":
+            from .ezinput_headless import EZInputHeadless
+
+            self.__class__ = EZInputHeadless
+            self._init_headless(show_help)
+        else:
+            from .ezinput_prompt import EZInputPrompt
+
             self.__class__ = EZInputPrompt
+            self._init_prompt()
+        self.mode = mode
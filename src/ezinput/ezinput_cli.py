@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+from collections import namedtuple
+
+"""
+A module to give the values of GUI widgets as command-line flags or
+environment variables, overriding the other sources of values.
+
+Each widget tag is a flag, e.g. `--threshold 0.5` or `--threshold=0.5` for
+`add_float_range("threshold", ...)`, with "-" and "_" treated alike, so
+`--my-tag` matches the tag `my_tag`. Check widgets are set by `--invert` and
+`--no-invert`, which never take the next argument as value. Flags that match
+no widget are left to the script, which may parse them itself.
+
+Each widget can also be set by an `EZINPUT_<TITLE>_<TAG>` environment
+variable, with the title and tag in upper case and other characters than
+letters and digits replaced by "_", e.g. `EZINPUT_MY_APP_THRESHOLD=0.5`.
+The variables configuring EZInput itself, `RESERVED_ENV`, never set a
+widget, e.g. `EZINPUT_CONFIG_PATH` for the tag "path" of a GUI "config".
+Command-line flags take precedence over environment variables.
+"""
+
+HELP_FLAGS = ("-h", "--help")
+ENV_PREFIX = "EZINPUT_"
+RESERVED_ENV = frozenset(
+    {
+        "EZINPUT_CACHE_PATH",
+        "EZINPUT_CONFIG_PATH",
+        "EZINPUT_MODE",
+        "EZINPUT_STORAGE",
+    }
+)
+
+# a flag given without "=value", and the argument following it if it may be
+# its value: whether it is depends on the widget the flag is for
+BareFlag = namedtuple("BareFlag", ["next"])
+
+
+def _env_part(name) -> str:
+    return re.sub(r"[^0-9A-Za-z]", "_", str(name)).upper()
+
+
+def env_name(title: str, tag: str) -> str:
+    """Get the environment variable overriding the value of a widget."""
+    return f"{ENV_PREFIX}{_env_part(title)}_{_env_part(tag)}"
+
+
+def read_env(title: str, environ=None) -> dict:
+    """Read the widget values of a GUI from environment variables.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    environ : dict, optional
+        The environment. Default is `os.environ`.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping the tag part of the variable names to their
+        values, as strings. The variables of `RESERVED_ENV` are left out.
+    """
+    if environ is None:
+        environ = os.environ
+    prefix = f"{ENV_PREFIX}{_env_part(title)}_"
+    return {
+        name[len(prefix) :]: value
+        for name, value in environ.items()
+        if name.startswith(prefix)
+        and len(name) > len(prefix)
+        and name not in RESERVED_ENV
+    }
+
+
+def flag_name(tag) -> str:
+    """Get the name of a widget tag or command-line flag, without the
+    dashes, with "-" and "_" treated alike."""
+    return str(tag).replace("-", "_")
+
+
+def find_override(
+    tag: str, cli: dict, env: dict, flag: bool = False
+) -> tuple | None:
+    """Get the command-line or environment value of a widget.
+
+    Parameters
+    ----------
+    tag : str
+        The tag of the widget.
+    cli : dict
+        The values read by `parse_argv`.
+    env : dict
+        The values read by `read_env`.
+    flag : bool, optional
+        Whether the widget is a yes/no flag, set by `--TAG` and
+        `--no-TAG` without taking the next argument as value. Default is
+        False.
+
+    Returns
+    -------
+    tuple or None
+        The source, "command-line" or "env", and the value, or None if the
+        widget is not overridden.
+
+    Raises
+    ------
+    ValueError
+        If the flag of a widget other than a yes/no flag has no value.
+    """
+    name = flag_name(tag)
+    if name in cli:
+        value = cli[name]
+        if isinstance(value, BareFlag):
+            if flag:
+                value = True
+            elif value.next is None:
+                raise ValueError(f"--{tag}: expected a value")
+            else:
+                value = value.next
+        return "command-line", value
+    if flag and isinstance(cli.get(f"no_{name}"), BareFlag):
+        return "command-line", False
+    name = _env_part(tag)
+    if name in env:
+        return "env", env[name]
+    return None
+
+
+def parse_argv(argv=None) -> tuple:
+    """Read widget values from command-line arguments.
+
+    Flags without "=" are kept as `BareFlag`, resolved by `find_override`
+    once the type of the widget is known.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The arguments. Default is `sys.argv[1:]`.
+
+    Returns
+    -------
+    tuple
+        A dictionary mapping flag names, see `flag_name`, to their value,
+        a string or a `BareFlag`, and whether help was requested.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    values = {}
+    show_help = False
+    for i, arg in enumerate(argv):
+        if arg in HELP_FLAGS:
+            show_help = True
+            continue
+        if not arg.startswith("--") or arg == "--":
+            continue
+        name, sep, value = arg[2:].partition("=")
+        if not sep:
+            following = argv[i + 1] if i + 1 < len(argv) else None
+            if following is not None and following.startswith("--"):
+                following = None
+            value = BareFlag(following)
+        values[flag_name(name)] = value
+    return values, show_help
+
+
+def format_help(title: str, flags: dict, prog=None) -> str:
+    """Describe the command-line flags of a GUI.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    flags : dict
+        Dictionary mapping tags to (metavar, description, value) tuples.
+        An empty metavar marks a yes/no flag.
+    prog : str, optional
+        The program name. Default is the name of the running script.
+
+    Returns
+    -------
+    str
+        The help text.
+    """
+    if prog is None:
+        prog = os.path.basename(sys.argv[0]) if sys.argv[0] else "python"
+    rows = []
+    for tag, (metavar, description, value) in flags.items():
+        flag = "--" + tag.replace("_", "-")
+        if metavar:
+            flag += f" {metavar}"
+        else:
+            flag += f", --no-{tag.replace('_', '-')}"
+        if value is not None:
+            description = f"{description} (current: {value})"
+        rows.append((flag, description))
+    width = max((len(flag) for flag, _ in rows), default=0)
+    lines = [f"usage: {prog} [--TAG VALUE ...]", "", f"options of {title}:"]
+    lines.append(f"  {'-h, --help':<{width}}  show this help and exit")
+    lines.extend(f"  {flag:<{width}}  {text}" for flag, text in rows)
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+import base64
+import json
+from datetime import date, datetime, time
+from pathlib import Path, PurePath
+
+"""
+A module to store typed values in configuration and parameter files.
+
+Values that YAML, JSON or TOML can't represent natively are encoded as a
+single-key mapping whose key names the type, e.g. `{"!path": "/data"}` or
+`{"!tuple": [1, 2]}`. Decoding rebuilds the original value without
+evaluating any code, so the files stay readable by safe loaders.
+"""
+
+PREFIX = "!"
+_PLAIN = (str, int, float, bool, type(None))
+
+
+def _encode_array(value):
+    if value.dtype.hasobject:
+        raise TypeError("NumPy arrays of Python objects can't be stored.")
+    return {
+        "dtype": value.dtype.str,
+        "shape": list(value.shape),
+        "data": base64.b64encode(value.tobytes()).decode("ascii"),
+    }
+
+
+def _decode_array(value):
+    import numpy as np
+
+    data = base64.b64decode(value["data"])
+    array = np.frombuffer(data, dtype=value["dtype"]).reshape(value["shape"])
+    return array.copy()
+
+
+def _encode_numpy_scalar(value):
+    return {"dtype": value.dtype.str, "value": value.item()}
+
+
+def _decode_numpy_scalar(value):
+    import numpy as np
+
+    return np.dtype(value["dtype"]).type(value["value"])
+
+
+def _is_numpy(value, name=None) -> bool:
+    # numpy is optional, it is never imported just to check a value type
+    cls = type(value)
+    return cls.__module__ == "numpy" and name in (None, cls.__name__)
+
+
+def _set_items(value) -> list:
+    items = [encode(item) for item in value]
+    try:
+        return sorted(items)
+    except TypeError:
+        return items
+
+
+DECODERS = {
+    "path": Path,
+    "tuple": lambda value: tuple(decode(item) for item in value),
+    "set": lambda value: {decode(item) for item in value},
+    "frozenset": lambda value: frozenset(decode(item) for item in value),
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "ndarray": _decode_array,
+    "numpy": _decode_numpy_scalar,
+    "dict": lambda value: {key: decode(item) for key, item in value.items()},
+    "json": lambda value: decode(json.loads(value)),
+}
+
+
+def encode(value):
+    """Convert a value into data that safe serializers can write.
+
+    Parameters
+    ----------
+    value : Any
+        The value to encode. Paths, tuples, sets, datetimes and NumPy
+        scalars and arrays are converted into typed mappings, lists and
+        dicts are encoded recursively and other values are kept as is.
+
+    Returns
+    -------
+    Any
+        The encoded value.
+
+    Raises
+    ------
+    TypeError
+        If the value is a NumPy array of Python objects.
+    """
+    if type(value) in _PLAIN:
+        return value
+    if _is_numpy(value, "ndarray"):
+        return {PREFIX + "ndarray": _encode_array(value)}
+    if _is_numpy(value) and hasattr(value, "dtype"):
+        return {PREFIX + "numpy": _encode_numpy_scalar(value)}
+    if isinstance(value, dict):
+        encoded = {key: encode(item) for key, item in value.items()}
+        if len(encoded) == 1 and str(next(iter(encoded))).startswith(PREFIX):
+            # a plain dict that looks like an encoded value
+            return {PREFIX + "dict": encoded}
+        return encoded
+    if isinstance(value, list):
+        return [encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {PREFIX + "tuple": [encode(item) for item in value]}
+    if isinstance(value, frozenset):
+        return {PREFIX + "frozenset": _set_items(value)}
+    if isinstance(value, set):
+        return {PREFIX + "set": _set_items(value)}
+    if isinstance(value, PurePath):
+        return {PREFIX + "path": str(value)}
+    if isinstance(value, datetime):
+        return {PREFIX + "datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {PREFIX + "date": value.isoformat()}
+    if isinstance(value, time):
+        return {PREFIX + "time": value.isoformat()}
+    return value
+
+
+def decode(value):
+    """Rebuild a value converted by `encode`.
+
+    Parameters
+    ----------
+    value : Any
+        The value as read from a file.
+
+    Returns
+    -------
+    Any
+        The decoded value. Data that is not an encoded value is returned
+        unchanged, apart from its nested items.
+    """
+    if isinstance(value, dict):
+        if len(value) == 1:
+            key, item = next(iter(value.items()))
+            if isinstance(key, str) and key.startswith(PREFIX):
+                decoder = DECODERS.get(key[len(PREFIX) :])
+                if decoder is not None:
+                    return decoder(item)
+        return {key: decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
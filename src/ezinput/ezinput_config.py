@@ -0,0 +1,1986 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .ezinput_codec import PREFIX, decode, encode
+from .ezinput_serializers import yaml_dump, yaml_load
+
+"""
+A module to handle the persistence of GUI settings shared by all EZInput backends.
+"""
+
+CONFIG_PATH = Path(
+    os.environ.get("EZINPUT_CONFIG_PATH", Path.home() / ".ezinput")
+).expanduser()
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
+CompactInfo = namedtuple("CompactInfo", ["dropped", "reclaimed"])
+
+_CACHE = {}
+_CACHE_LOCK = threading.RLock()
+_STATS = {"hits": 0, "misses": 0}
+# live configs shared by the GUIs of the process, by storage key
+_SHARED = weakref.WeakValueDictionary()
+_MISSING = object()
+
+# values larger than this many characters (or bytes, for NumPy arrays) are
+# stored in blob files instead of the config
+BLOB_THRESHOLD = 64 * 1024
+# unreferenced blobs younger than this many seconds are kept by
+# collect_blobs, another process may still be saving the config using them
+BLOB_GRACE = 60.0
+BLOB_TAG = PREFIX + "blob"
+# seconds the write-back storage waits to merge saves into one sync
+SYNC_DELAY = 1.0
+# seconds the write-back storage waits for the first read of a config from
+# CONFIG_PATH, before finishing it in the background
+PULL_TIMEOUT = 0.5
+
+_PENDING_SYNCS = set()
+# set once the pending syncs were flushed at exit, later saves sync at once
+_EXITING = False
+
+# last-used timestamps are only rewritten once they are older than this
+# many seconds, so using a GUI doesn't write its usage file every time
+USAGE_RESOLUTION = 3600.0
+SECONDS_PER_DAY = 24 * 3600
+_USAGE = {}
+
+
+def set_config_path(path):
+    """Set the directory where GUI configurations are stored.
+
+    Defaults to the `EZINPUT_CONFIG_PATH` environment variable, or to
+    `~/.ezinput` if it is not set.
+
+    Parameters
+    ----------
+    path : str or Path
+        The configuration directory.
+    """
+    global CONFIG_PATH
+    with _CACHE_LOCK:
+        CONFIG_PATH = Path(path).expanduser()
+        _CACHE.clear()
+        _USAGE.clear()
+
+
+def config_file(title: str) -> Path:
+    """Get the path of the configuration file of a GUI.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+
+    Returns
+    -------
+    Path
+        The path of the YAML configuration file.
+    """
+    return CONFIG_PATH / f"{title}.yml"
+
+
+def _size(path: Path) -> int:
+    """Get the size of a file in bytes, or 0 if it does not exist."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _stamp(path: Path) -> tuple | None:
+    """Get a cheap fingerprint of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Hold an exclusive advisory lock on a file, shared by all processes.
+
+    On platforms without `fcntl` only threads of this process are
+    serialized, by the config cache lock held by the callers.
+    """
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        with open(path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                same = os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+            except FileNotFoundError:
+                same = False
+            if not same:
+                # removed by its holder while we waited, see `_remove_lock`
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            return
+
+
+def _remove_lock(path: Path | None):
+    """Delete a lock file held by the caller, once the configuration it
+    guards is gone. Processes waiting for it then lock a new file."""
+    if path is None or fcntl is None:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _atomic_write(path: Path, write, mode: str = "w"):
+    """Write a file through a temporary file renamed over it, so readers
+    never see a partially written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        with open(tmp, mode) as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if tmp.exists():
+            os.remove(tmp)
+        raise
+
+
+def _read_yaml(path: Path) -> dict:
+    """Read a YAML config file, returning an empty dict if it is missing."""
+    try:
+        with open(path, "r") as f:
+            return yaml_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+
+class YAMLStorage:
+    """Store the configuration of each GUI in a `<title>.yml` file.
+
+    This is the default storage. Every save rewrites the whole file.
+    """
+
+    name = "yaml"
+
+    def key(self, title: str) -> str:
+        """Get the key identifying a configuration in the cache."""
+        return f"{self.name}:{config_file(title)}"
+
+    def stamp(self, title: str) -> tuple | None:
+        """Get a fingerprint that changes whenever the stored
+        configuration changes, or None if nothing is stored."""
+        return _stamp(config_file(title))
+
+    def lock(self, title: str):
+        """Get a context manager giving exclusive access to the stored
+        configuration of a GUI, across processes."""
+        return _file_lock(self.lock_file(title))
+
+    def lock_file(self, title: str) -> Path | None:
+        """Get the path of the file locked by `lock`, or None if it locks
+        no file."""
+        return CONFIG_PATH / f".{title}.lock"
+
+    def usage_file(self, title: str) -> Path:
+        """Get the path of the file holding the last-used timestamps of the
+        tags of a GUI."""
+        return CONFIG_PATH / f".{title}.used.json"
+
+    def read(self, title: str) -> dict:
+        """Read the stored configuration of a GUI."""
+        return _read_yaml(config_file(title))
+
+    def write(self, title: str, cfg: dict, changes: dict):
+        """Store the configuration of a GUI.
+
+        Parameters
+        ----------
+        title : str
+            The title of the GUI.
+        cfg : dict
+            The complete configuration to store.
+        changes : dict
+            The values of `cfg` that changed since it was last stored.
+        """
+        _atomic_write(config_file(title), lambda f: yaml_dump(cfg, f))
+
+    def replace(self, title: str, cfg: dict):
+        """Store the configuration of a GUI, dropping the stored tags that
+        `cfg` does not have."""
+        self.write(title, cfg, cfg)
+
+    def delete(self, title: str):
+        """Delete the stored configuration of a GUI."""
+        path = config_file(title)
+        if path.exists():
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to remove {path}: {e}")
+
+    def size(self, title: str) -> int:
+        """Get the number of bytes used by the stored configuration of a
+        GUI."""
+        return _size(config_file(title))
+
+    def titles(self) -> list:
+        """Get the titles of all stored GUI configurations."""
+        return sorted(
+            path.stem
+            for path in CONFIG_PATH.glob("*.yml")
+            if not path.name.startswith(".")
+        )
+
+
+class JournalStorage(YAMLStorage):
+    """Store configurations as a snapshot plus an append-only journal.
+
+    Each save appends one JSON line per changed tag to `<title>.journal`,
+    so its cost depends on the number of changed values rather than on
+    the size of the configuration. Once the journal grows past
+    `compact_size` bytes, it is folded into the `<title>.yml` snapshot on
+    a background thread.
+
+    Records partially written before a crash are skipped when the journal
+    is replayed. Existing `<title>.yml` files are used as the initial
+    snapshot, and `compact` should be called before switching back to
+    `YAMLStorage`.
+
+    Parameters
+    ----------
+    compact_size : int, optional
+        Journal size in bytes above which it is compacted. Default is
+        64 KiB.
+    """
+
+    name = "journal"
+
+    def __init__(self, compact_size: int = 64 * 1024):
+        self.compact_size = compact_size
+        self._compacting = set()
+        self._compact_lock = threading.Lock()
+
+    @staticmethod
+    def journal_file(title: str) -> Path:
+        """Get the path of the journal file of a GUI."""
+        return CONFIG_PATH / f"{title}.journal"
+
+    def stamp(self, title: str) -> tuple | None:
+        snapshot = _stamp(config_file(title))
+        journal = _stamp(self.journal_file(title))
+        if snapshot is None and journal is None:
+            return None
+        return (snapshot, journal)
+
+    def read(self, title: str) -> dict:
+        cfg = _read_yaml(config_file(title))
+        cfg.update(self._replay(self.journal_file(title)))
+        return cfg
+
+    def write(self, title: str, cfg: dict, changes: dict):
+        path = self.journal_file(title)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        records = "".join(
+            json.dumps({"tag": tag, "value": value}) + "\n"
+            for tag, value in changes.items()
+        ).encode()
+        with open(path, "ab+") as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # an interrupted write left a partial record behind
+                    records = b"\n" + records
+            f.write(records)
+            size = f.tell()
+        if size > self.compact_size and title not in self._compacting:
+            self._compacting.add(title)
+            threading.Thread(
+                target=self.compact, args=(title,), daemon=True
+            ).start()
+
+    def replace(self, title: str, cfg: dict):
+        _atomic_write(config_file(title), lambda f: yaml_dump(cfg, f))
+        path = self.journal_file(title)
+        if path.exists():
+            os.remove(path)
+
+    def delete(self, title: str):
+        super().delete(title)
+        path = self.journal_file(title)
+        if path.exists():
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to remove {path}: {e}")
+
+    def size(self, title: str) -> int:
+        return super().size(title) + _size(self.journal_file(title))
+
+    def titles(self) -> list:
+        journals = {path.stem for path in CONFIG_PATH.glob("*.journal")}
+        return sorted(journals.union(super().titles()))
+
+    def compact(self, title: str):
+        """Fold the journal of a GUI into its snapshot file.
+
+        Parameters
+        ----------
+        title : str
+            The title of the GUI.
+        """
+        journal = self.journal_file(title)
+        try:
+            with self._compact_lock:
+                self._compact(title, journal)
+        finally:
+            self._compacting.discard(title)
+
+    def _compact(self, title: str, journal: Path):
+        snapshot = config_file(title)
+        with _CACHE_LOCK, self.lock(title):
+            stamp = self.stamp(title)
+            if stamp is None or stamp[1] is None:
+                return
+            cfg = dict(_load(title, self))
+        # the snapshot is written without holding the locks, values saved
+        # in the meantime stay in the journal
+        tmp = snapshot.with_name(f".{snapshot.name}.{os.getpid()}.compact")
+        with open(tmp, "w") as f:
+            yaml_dump(_encode_values(cfg), f)
+        with _CACHE_LOCK, self.lock(title):
+            current = self.stamp(title)
+            if (
+                current is None
+                or current[0] != stamp[0]
+                or current[1] is None
+                or current[1][2] != stamp[1][2]
+            ):
+                # compacted or deleted by another process in the meantime
+                os.remove(tmp)
+                return
+            with open(journal, "r") as f:
+                f.seek(stamp[1][1])
+                tail = f.read()
+            os.replace(tmp, snapshot)
+            _atomic_write(journal, lambda f: f.write(tail))
+            entry = _CACHE.get(self.key(title))
+            if entry is not None:
+                _CACHE[self.key(title)] = (self.stamp(title), entry[1])
+
+    @staticmethod
+    def _replay(path: Path) -> dict:
+        """Read the values recorded in a journal file."""
+        cfg = {}
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # partial record left by an interrupted write
+                        continue
+                    cfg[record["tag"]] = record["value"]
+        except FileNotFoundError:
+            pass
+        return cfg
+
+
+class SQLiteStorage:
+    """Store the configurations of all GUIs in a single SQLite database.
+
+    Values are kept in a table indexed by (title, tag), so looking up a GUI
+    does not require opening and parsing a file, and all the changed tags
+    of a save are written in one transaction. The database uses WAL mode
+    so that readers in other processes are not blocked by writers.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Path of the database. Default is `CONFIG_PATH / "ezinput.db"`.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path=None):
+        self._path = path
+        self._conn = None
+        self._conn_path = None
+
+    @property
+    def path(self) -> Path:
+        """The path of the database file."""
+        if self._path is not None:
+            return Path(self._path)
+        return CONFIG_PATH / "ezinput.db"
+
+    def _connect(self):
+        import sqlite3
+
+        path = self.path
+        if self._conn is None or self._conn_path != path:
+            if self._conn is not None:
+                self._conn.close()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # access is serialized by the config cache lock
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS config ("
+                    "title TEXT NOT NULL, tag TEXT NOT NULL, "
+                    "value TEXT NOT NULL, PRIMARY KEY (title, tag)) "
+                    "WITHOUT ROWID"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS titles ("
+                    "title TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+                )
+            self._conn = conn
+            self._conn_path = path
+        return self._conn
+
+    def key(self, title: str) -> str:
+        return f"{self.name}:{self.path}:{title}"
+
+    def stamp(self, title: str) -> tuple | None:
+        row = (
+            self._connect()
+            .execute("SELECT version FROM titles WHERE title = ?", (title,))
+            .fetchone()
+        )
+        return None if row is None else tuple(row)
+
+    def lock_file(self, title: str) -> Path | None:
+        # the database locks itself
+        return None
+
+    @contextmanager
+    def lock(self, title: str):
+        conn = self._connect()
+        # take the database write lock before reading, so that no other
+        # process can change the values between our read and write
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                conn.commit()
+
+    def usage_file(self, title: str) -> Path:
+        return self.path.parent / f".{title}.used.json"
+
+    def read(self, title: str) -> dict:
+        rows = self._connect().execute(
+            "SELECT tag, value FROM config WHERE title = ?", (title,)
+        )
+        return {tag: json.loads(value) for tag, value in rows}
+
+    def write(self, title: str, cfg: dict, changes: dict):
+        self.write_many({title: changes})
+
+    def write_many(self, configs: dict):
+        """Store the values of several GUIs in a single transaction.
+
+        Parameters
+        ----------
+        configs : dict
+            Dictionary mapping GUI titles to the values to store.
+        """
+        conn = self._connect()
+        with conn:
+            for title, values in configs.items():
+                conn.executemany(
+                    "INSERT OR REPLACE INTO config (title, tag, value) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (title, tag, json.dumps(value, default=str))
+                        for tag, value in values.items()
+                    ],
+                )
+                conn.execute(
+                    "INSERT INTO titles (title, version) VALUES (?, 1) "
+                    "ON CONFLICT (title) DO UPDATE SET version = version + 1",
+                    (title,),
+                )
+
+    def replace(self, title: str, cfg: dict):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM config WHERE title = ?", (title,))
+            self.write_many({title: cfg})
+
+    def delete(self, title: str):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM config WHERE title = ?", (title,))
+            # the version row is kept, so that the next save gets a new
+            # version and caches in other processes see the change
+            conn.execute(
+                "UPDATE titles SET version = version + 1 WHERE title = ?",
+                (title,),
+            )
+
+    def size(self, title: str) -> int:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT SUM(LENGTH(tag) + LENGTH(value)) FROM config "
+                "WHERE title = ?",
+                (title,),
+            )
+            .fetchone()
+        )
+        return row[0] or 0
+
+    def vacuum(self):
+        """Shrink the database file, once rows were deleted."""
+        conn = self._connect()
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def titles(self) -> list:
+        """Get the titles of all stored GUI configurations."""
+        rows = self._connect().execute("SELECT DISTINCT title FROM config")
+        return [title for (title,) in rows]
+
+
+def _flush_pending_syncs():
+    """Sync every write-back storage that still holds unsynced changes."""
+    global _EXITING
+    _EXITING = True
+    for storage in list(_PENDING_SYNCS):
+        storage.flush()
+
+
+# registered on import, before the hooks of the backends that may still
+# save at exit, so that it runs after them
+atexit.register(_flush_pending_syncs)
+
+
+class WriteBackStorage(YAMLStorage):
+    """Store configurations in a local cache, synced to `CONFIG_PATH` on a
+    background thread.
+
+    Meant for a `CONFIG_PATH` on a slow or network file system: reads and
+    saves only touch the local cache, and the YAML and blob files of
+    `CONFIG_PATH` are updated `sync_delay` seconds after the last save.
+    Values changed both locally and in `CONFIG_PATH` since the last sync
+    are reported as conflicts and the local values are kept. Pending syncs
+    are flushed when the interpreter exits.
+
+    A configuration used for the first time is copied from `CONFIG_PATH`,
+    waiting at most `pull_timeout` seconds: a slower copy is finished in
+    the background, and its values are seen on the next refresh.
+
+    Parameters
+    ----------
+    cache_path : str or Path, optional
+        The local cache directory. Defaults to the `EZINPUT_CACHE_PATH`
+        environment variable, or to a directory in the system temporary
+        directory. A sub-directory is used for each `CONFIG_PATH`.
+    sync_delay : float, optional
+        Seconds to wait after a save before syncing. Default is
+        `SYNC_DELAY`.
+    pull_timeout : float, optional
+        Seconds to wait for the first copy of a configuration. Default is
+        `PULL_TIMEOUT`.
+    """
+
+    name = "writeback"
+
+    def __init__(
+        self,
+        cache_path=None,
+        sync_delay: float = SYNC_DELAY,
+        pull_timeout: float = PULL_TIMEOUT,
+    ):
+        self._cache_path = cache_path
+        self.sync_delay = sync_delay
+        self.pull_timeout = pull_timeout
+        self.conflicts = []
+        self._synced = {}
+        self._pending = set()
+        self._deleted = set()
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.RLock()
+        self._timer = None
+
+    @property
+    def cache_path(self) -> Path:
+        """The local directory caching the configurations of
+        `CONFIG_PATH`."""
+        root = self._cache_path or os.environ.get("EZINPUT_CACHE_PATH")
+        if root is None:
+            import getpass
+            import tempfile
+
+            root = Path(tempfile.gettempdir(), f"ezinput-{getpass.getuser()}")
+        digest = hashlib.sha256(str(CONFIG_PATH).encode()).hexdigest()
+        return Path(root) / digest[:16]
+
+    def local_file(self, title: str) -> Path:
+        """Get the path of the cached configuration file of a GUI."""
+        return self.cache_path / f"{title}.yml"
+
+    @property
+    def blob_dir(self) -> Path:
+        """The local directory of the blob files not synced yet."""
+        return self.cache_path / "blobs"
+
+    @property
+    def pending(self) -> bool:
+        """Whether saved changes are waiting to be synced."""
+        return bool(self._pending)
+
+    def key(self, title: str) -> str:
+        return f"{self.name}:{self.local_file(title)}"
+
+    def stamp(self, title: str) -> tuple | None:
+        local = self.local_file(title)
+        if title not in self._seen:
+            self._seen.add(title)
+            if local.exists():
+                # pick up changes made elsewhere without waiting for them
+                self._schedule(title)
+            else:
+                self._pull(title)
+        return _stamp(local)
+
+    def lock(self, title: str):
+        return _file_lock(self.lock_file(title))
+
+    def lock_file(self, title: str) -> Path | None:
+        return self.cache_path / f".{title}.lock"
+
+    def usage_file(self, title: str) -> Path:
+        # usage is recorded on every show, kept off the slow file system
+        return self.cache_path / f".{title}.used.json"
+
+    def read(self, title: str) -> dict:
+        return _read_yaml(self.local_file(title))
+
+    def write(self, title: str, cfg: dict, changes: dict):
+        _atomic_write(self.local_file(title), lambda f: yaml_dump(cfg, f))
+        self._schedule(title)
+
+    def size(self, title: str) -> int:
+        return _size(self.local_file(title))
+
+    def titles(self) -> list:
+        local = {
+            path.stem
+            for path in self.cache_path.glob("*.yml")
+            if not path.name.startswith(".")
+        }
+        return sorted(local.union(super().titles()))
+
+    def delete(self, title: str):
+        path = self.local_file(title)
+        if path.exists():
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to remove {path}: {e}")
+        with self._lock:
+            self._deleted.add(title)
+        self._schedule(title)
+
+    def flush(self):
+        """Sync all pending changes now, waiting for a sync in progress."""
+        with self._sync_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                titles = self._pending
+                self._pending = set()
+            for title in titles:
+                try:
+                    self.sync(title)
+                except OSError as e:
+                    print(f"Failed to sync {title} to {CONFIG_PATH}: {e}")
+            with self._lock:
+                if not self._pending:
+                    _PENDING_SYNCS.discard(self)
+
+    def sync(self, title: str):
+        """Merge the cached and canonical configurations of a GUI.
+
+        Parameters
+        ----------
+        title : str
+            The title of the GUI.
+        """
+        local = self.local_file(title)
+        remote = config_file(title)
+        with self._sync_lock, _file_lock(CONFIG_PATH / f".{title}.lock"):
+            with self._lock:
+                deleted = title in self._deleted
+                self._deleted.discard(title)
+            if deleted:
+                super().delete(title)
+                self._set_synced(title, None, None)
+            remote_stamp = _stamp(remote)
+            base_stamp, base = self._get_synced(title)
+            if remote_stamp is None:
+                remote_cfg = None
+            elif remote_stamp == base_stamp:
+                remote_cfg = base
+            else:
+                remote_cfg = _read_yaml(remote)
+            # the local cache is only locked once the slow reads are done
+            with _CACHE_LOCK, self.lock(title):
+                if not local.exists() and remote_cfg is None:
+                    _remove_lock(self.lock_file(title))
+                    _remove_lock(CONFIG_PATH / f".{title}.lock")
+                    return
+                cfg = _read_yaml(local)
+                if remote_cfg is not None and remote_stamp != base_stamp:
+                    merged = self._merge(title, cfg, base, remote_cfg)
+                    if merged != cfg or not local.exists():
+                        _atomic_write(local, lambda f: yaml_dump(merged, f))
+                    cfg = merged
+            self._push_blobs(cfg)
+            if cfg != remote_cfg:
+                _atomic_write(remote, lambda f: yaml_dump(cfg, f))
+            self._set_synced(title, _stamp(remote), cfg)
+
+    def _push_blobs(self, cfg: dict):
+        """Move the blob files used by a configuration from the local cache
+        to `CONFIG_PATH`, before the configuration refers to them there."""
+        for value in cfg.values():
+            if not _is_blob_ref(value):
+                continue
+            local = self.blob_dir / value[BLOB_TAG]
+            if not local.exists():
+                continue
+            remote = blob_dir() / local.name
+            if not remote.exists():
+                data = local.read_bytes()
+                _atomic_write(remote, lambda f, data=data: f.write(data), "wb")
+            # blobs fall back to CONFIG_PATH once they are not staged
+            os.remove(local)
+
+    def _synced_file(self, title: str) -> Path:
+        return self.cache_path / f".{title}.synced.yml"
+
+    def _get_synced(self, title: str) -> tuple:
+        """Get the stamp and content of `CONFIG_PATH` at the last sync."""
+        if title not in self._synced:
+            synced = _read_yaml(self._synced_file(title))
+            stamp = synced.get("stamp")
+            self._synced[title] = (
+                None if stamp is None else tuple(stamp),
+                synced.get("config"),
+            )
+        return self._synced[title]
+
+    def _set_synced(self, title: str, stamp, cfg):
+        # kept on disk, so the next process can tell which values changed
+        self._synced[title] = (stamp, cfg)
+        synced = {"stamp": None if stamp is None else list(stamp)}
+        synced["config"] = cfg
+        _atomic_write(
+            self._synced_file(title), lambda f: yaml_dump(synced, f)
+        )
+
+    def _pull(self, title: str):
+        """Copy the configuration of a GUI from `CONFIG_PATH` into the
+        local cache, when it is used for the first time, finishing in the
+        background after `pull_timeout` seconds."""
+        state = {"waiting": True}
+        guard = threading.Lock()
+        done = threading.Event()
+
+        def read():
+            pulled = self._read_remote(title)
+            with guard:
+                state["pulled"] = pulled
+                waiting = state["waiting"]
+            done.set()
+            if not waiting:
+                with self.lock(title):
+                    self._adopt(title, pulled)
+
+        threading.Thread(target=read, daemon=True).start()
+        done.wait(self.pull_timeout)
+        with guard:
+            state["waiting"] = False
+            pulled = state.get("pulled", _MISSING)
+        if pulled is not _MISSING:
+            self._adopt(title, pulled)
+
+    @staticmethod
+    def _read_remote(title: str) -> tuple | None:
+        """Read the stamp and content of a configuration in `CONFIG_PATH`,
+        or None if there is none."""
+        try:
+            with open(config_file(title), "r") as f:
+                stamp = os.fstat(f.fileno())
+                cfg = yaml_load(f) or {}
+        except FileNotFoundError:
+            return None
+        return (stamp.st_mtime_ns, stamp.st_size, stamp.st_ino), cfg
+
+    def _adopt(self, title: str, pulled: tuple | None):
+        """Store a configuration read by `_read_remote` in the local
+        cache."""
+        if pulled is None:
+            return
+        local = self.local_file(title)
+        if local.exists():
+            # saved before the copy finished: the saved values are merged
+            # over the ones of CONFIG_PATH by the next sync
+            self._schedule(title)
+            return
+        stamp, cfg = pulled
+        _atomic_write(local, lambda f: yaml_dump(cfg, f))
+        self._set_synced(title, stamp, cfg)
+
+    def _merge(self, title: str, cfg: dict, base, remote: dict) -> dict:
+        """Merge values changed in `CONFIG_PATH` into the cached ones."""
+        if base is None:
+            # never synced: the cached values are all unsynced changes
+            merged = dict(remote)
+            merged.update(cfg)
+            return merged
+        local_changes = changed_values(cfg, base)
+        remote_changes = changed_values(remote, base)
+        conflicts = sorted(
+            tag
+            for tag in local_changes.keys() & remote_changes.keys()
+            if not _same(local_changes[tag], remote_changes[tag])
+        )
+        if conflicts:
+            self.conflicts.append((title, conflicts))
+            print(
+                f"Conflicting changes of {conflicts} in "
+                f"{config_file(title)}, keeping the local values."
+            )
+        merged = dict(remote)
+        merged.update(local_changes)
+        for tag in base.keys() - cfg.keys():
+            if tag in remote and _same(remote[tag], base[tag]):
+                # removed locally, e.g. by compact_config
+                del merged[tag]
+        return merged
+
+    def _schedule(self, title: str):
+        with self._lock:
+            self._pending.add(title)
+            _PENDING_SYNCS.add(self)
+            exiting = _EXITING
+            if not exiting and self._timer is None:
+                self._timer = threading.Timer(self.sync_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if exiting:
+            # a timer would never fire at exit
+            self.flush()
+
+
+STORAGES = {
+    "yaml": YAMLStorage,
+    "journal": JournalStorage,
+    "sqlite": SQLiteStorage,
+    "writeback": WriteBackStorage,
+}
+
+_STORAGE = None
+_NAMED_STORAGES = {}
+
+
+def get_storage(storage=None):
+    """Get the storage used to persist GUI configurations.
+
+    Defaults to the storage named by the `EZINPUT_STORAGE` environment
+    variable, or to YAML files if it is not set.
+
+    Parameters
+    ----------
+    storage : str or YAMLStorage, optional
+        A storage instance, or the name of one of the `STORAGES`. Named
+        storages are shared by all GUIs of the process. If None, returns
+        the default storage.
+
+    Returns
+    -------
+    YAMLStorage
+        The storage.
+    """
+    global _STORAGE
+    if storage is not None:
+        return _make_storage(storage)
+    if _STORAGE is None:
+        _STORAGE = _make_storage(os.environ.get("EZINPUT_STORAGE", "yaml"))
+    return _STORAGE
+
+
+def set_storage(storage):
+    """Set the default storage used to persist GUI configurations.
+
+    Parameters
+    ----------
+    storage : str or YAMLStorage
+        A storage instance, or the name of one of the `STORAGES`.
+    """
+    global _STORAGE
+    _STORAGE = _make_storage(storage)
+
+
+def _make_storage(storage):
+    if isinstance(storage, str):
+        if storage not in STORAGES:
+            raise ValueError(
+                f"Unknown storage '{storage}', "
+                f"expected one of {list(STORAGES)}."
+            )
+        if storage not in _NAMED_STORAGES:
+            _NAMED_STORAGES[storage] = STORAGES[storage]()
+        return _NAMED_STORAGES[storage]
+    return storage
+
+
+def blob_dir() -> Path:
+    """Get the directory of the values stored outside the config files."""
+    return CONFIG_PATH / "blobs"
+
+
+class Blob:
+    """A config value stored in a content-addressed file of `blob_dir()`,
+    read on first access.
+
+    Parameters
+    ----------
+    name : str
+        The file name: the SHA-256 digest of the content, with a ".json"
+        extension, or ".npy" for NumPy arrays.
+    value : Any, optional
+        The value, when it is already in memory.
+    staged : Path, optional
+        The local directory of a `WriteBackStorage` the blob may still be
+        in, before it is synced to `blob_dir()`.
+    """
+
+    __slots__ = ("_staged", "_value", "name")
+
+    def __init__(self, name: str, value=_MISSING, staged=None):
+        self.name = name
+        self._value = value
+        self._staged = staged
+
+    @property
+    def path(self) -> Path:
+        """The path of the blob file."""
+        if self._staged is not None:
+            path = self._staged / self.name
+            if path.exists():
+                return path
+        return blob_dir() / self.name
+
+    def load(self):
+        """Get the value, reading the blob file on first access.
+
+        NumPy arrays are memory-mapped read-only rather than read.
+        """
+        if self._value is _MISSING:
+            if self.name.endswith(".npy"):
+                import numpy as np
+
+                self._value = np.load(self.path, mmap_mode="r")
+            else:
+                with open(self.path, "r") as f:
+                    self._value = decode(json.load(f))
+        return self._value
+
+    def ref(self) -> dict:
+        """Get the reference to the blob stored in the config."""
+        return {BLOB_TAG: self.name}
+
+    def __eq__(self, other):
+        if isinstance(other, Blob):
+            return self.name == other.name
+        return _same(self.load(), other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Blob({self.name!r})"
+
+
+class LazyConfig(dict):
+    """Configuration dictionary reading `Blob` values on first access.
+
+    Copies made with `dict()` keep the blobs unread.
+    """
+
+    def __getitem__(self, tag):
+        value = dict.__getitem__(self, tag)
+        if isinstance(value, Blob):
+            value = value.load()
+            dict.__setitem__(self, tag, value)
+        return value
+
+    def get(self, tag, default=None):
+        try:
+            return self[tag]
+        except KeyError:
+            return default
+
+    def pop(self, tag, *default):
+        value = dict.pop(self, tag, *default)
+        return value.load() if isinstance(value, Blob) else value
+
+    def items(self):
+        return [(tag, self[tag]) for tag in self]
+
+    def values(self):
+        return [self[tag] for tag in self]
+
+    def copy(self):
+        return LazyConfig(self)
+
+
+def _staged_blob_dir(storage) -> Path | None:
+    """Get the local directory a storage writes blobs to before syncing
+    them, or None if it writes them to `blob_dir()`."""
+    if isinstance(storage, WriteBackStorage):
+        return storage.blob_dir
+    return None
+
+
+def _write_blob(name: str, write, mode: str = "w", staged=None):
+    """Write a blob file unless one with the same content exists."""
+    path = (blob_dir() if staged is None else staged) / name
+    if not path.exists():
+        _atomic_write(path, write, mode)
+
+
+def _to_blob(value, storage=None):
+    """Move a value to a blob file if it is larger than `BLOB_THRESHOLD`.
+
+    Returns the `Blob`, or the value itself if it is small. The blobs of a
+    `WriteBackStorage` are written to its local cache.
+    """
+    staged = _staged_blob_dir(storage)
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        if value.nbytes <= BLOB_THRESHOLD or value.dtype.hasobject:
+            return value
+        array = np.ascontiguousarray(value)
+        digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.reshape(-1).view(np.uint8))
+        name = digest.hexdigest() + ".npy"
+        _write_blob(name, lambda f: np.save(f, array), "wb", staged)
+        return Blob(name, value, staged)
+    if isinstance(value, str):
+        if len(value) <= BLOB_THRESHOLD:
+            return value
+    elif not isinstance(value, (list, dict, tuple, set, frozenset)):
+        return value
+    data = json.dumps(encode(value))
+    if len(data) <= BLOB_THRESHOLD:
+        return value
+    name = hashlib.sha256(data.encode()).hexdigest() + ".json"
+    _write_blob(name, lambda f: f.write(data), staged=staged)
+    return Blob(name, value, staged)
+
+
+def _is_blob_ref(value) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_TAG in value
+
+
+def _encode_values(cfg: dict) -> dict:
+    """Encode the values of a config to be written by a storage."""
+    return {
+        tag: value.ref() if isinstance(value, Blob) else encode(value)
+        for tag, value in dict.items(cfg)
+    }
+
+
+def _decode_values(cfg: dict, staged=None) -> dict:
+    """Decode the values of a config read by a storage, leaving the
+    values stored in blob files unread."""
+    return {
+        tag: (
+            Blob(value[BLOB_TAG], staged=staged)
+            if _is_blob_ref(value)
+            else decode(value)
+        )
+        for tag, value in cfg.items()
+    }
+
+
+def config_blobs(title: str, storage=None) -> set:
+    """Get the names of the blob files used by the saved configuration of
+    a GUI, e.g. to `collect_blobs` only those once it is deleted.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : str or YAMLStorage, optional
+        The storage of the configuration. Default is `get_storage()`.
+    """
+    storage = get_storage(storage)
+    with _CACHE_LOCK:
+        cfg = _load(title, storage)
+        return {v.name for v in dict.values(cfg) if isinstance(v, Blob)}
+
+
+def _config_files(storage=None) -> list:
+    """Get the files of `CONFIG_PATH`, and of the local cache of a
+    `WriteBackStorage`, that may reference blobs."""
+    paths = list(CONFIG_PATH.glob("*.yml"))
+    paths.extend(CONFIG_PATH.glob("*.journal"))
+    if isinstance(storage, WriteBackStorage):
+        # values saved locally but not synced yet
+        paths.extend(storage.cache_path.glob("*.yml"))
+    return paths
+
+
+def _databases(storage=None) -> list:
+    databases = {CONFIG_PATH / "ezinput.db"}
+    if isinstance(storage, SQLiteStorage):
+        databases.add(storage.path)
+    return [path for path in databases if path.exists()]
+
+
+def _referenced_blobs(storage=None) -> set:
+    """Get the names of the blobs used by any stored configuration."""
+    import sqlite3
+
+    configs = []
+    for path in _config_files(storage):
+        if path.suffix == ".journal":
+            configs.append(JournalStorage._replay(path))
+            continue
+        try:
+            configs.append(_read_yaml(path))
+        except yaml.YAMLError:
+            continue
+    for path in _databases(storage):
+        conn = sqlite3.connect(str(path))
+        try:
+            rows = conn.execute(
+                "SELECT value FROM config WHERE value LIKE ?",
+                (f'{{"{BLOB_TAG}"%',),
+            ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        finally:
+            conn.close()
+        configs.append({i: json.loads(v) for i, (v,) in enumerate(rows)})
+    return {
+        value[BLOB_TAG]
+        for cfg in configs
+        for value in cfg.values()
+        if _is_blob_ref(value)
+    }
+
+
+def _find_blobs(names: set, storage=None) -> set:
+    """Get which of some blobs are used by a stored configuration.
+
+    Unlike `_referenced_blobs`, the files are searched for the blob names
+    without being parsed, and the search stops once all are found.
+    """
+    import sqlite3
+
+    missing = set(names)
+    for path in _config_files(storage):
+        if not missing:
+            break
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+        except OSError:
+            continue
+        missing = {name for name in missing if name not in text}
+    for path in _databases(storage):
+        if not missing:
+            break
+        conn = sqlite3.connect(str(path))
+        try:
+            for name in list(missing):
+                row = conn.execute(
+                    "SELECT 1 FROM config WHERE value LIKE ? LIMIT 1",
+                    (f"%{name}%",),
+                ).fetchone()
+                if row is not None:
+                    missing.discard(name)
+        except sqlite3.Error:
+            # the blobs can't be proven unused
+            missing = set()
+        finally:
+            conn.close()
+    return set(names) - missing
+
+
+def collect_blobs(
+    storage=None, grace: float | None = None, names=None
+) -> list:
+    """Delete the blob files no longer used by any stored configuration.
+
+    Parameters
+    ----------
+    storage : str or YAMLStorage, optional
+        A storage to scan for references, in addition to the files and
+        database of `CONFIG_PATH`. The blobs a `WriteBackStorage` has not
+        synced yet are collected too.
+    grace : float, optional
+        Blobs written less than this many seconds ago are kept. Default is
+        `BLOB_GRACE`.
+    names : iterable of str, optional
+        Only consider these blobs, e.g. the `config_blobs` of a deleted
+        configuration, instead of scanning every stored configuration.
+
+    Returns
+    -------
+    list
+        The names of the deleted blob files.
+    """
+    grace = BLOB_GRACE if grace is None else grace
+    storage = get_storage(storage)
+    folders = [blob_dir(), _staged_blob_dir(storage)]
+    folders = [folder for folder in folders if folder and folder.exists()]
+    if not folders:
+        return []
+    with _CACHE_LOCK:
+        if names is None:
+            paths = [path for folder in folders for path in folder.iterdir()]
+            referenced = _referenced_blobs(storage)
+        else:
+            paths = [folder / name for folder in folders for name in names]
+            if not paths:
+                return []
+            referenced = _find_blobs(set(names), storage)
+        removed = []
+        now = time.time()
+        for path in paths:
+            if path.name.startswith(".") or path.name in referenced:
+                continue
+            try:
+                if now - path.stat().st_mtime < grace:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed.append(path.name)
+        return removed
+
+
+def _stored(title: str, storage) -> bool:
+    """Check if any file of `CONFIG_PATH`, or of the local cache of a
+    `WriteBackStorage`, stores the configuration of a GUI."""
+    paths = [config_file(title), JournalStorage.journal_file(title)]
+    if isinstance(storage, WriteBackStorage):
+        paths.append(storage.local_file(title))
+    return any(path.exists() for path in paths)
+
+
+def collect_locks(storage=None) -> list:
+    """Delete the lock files of the configurations no longer stored, e.g.
+    deleted by older versions or by hand.
+
+    Parameters
+    ----------
+    storage : str or YAMLStorage, optional
+        A storage whose local cache is also swept, in addition to
+        `CONFIG_PATH`.
+
+    Returns
+    -------
+    list
+        The paths of the deleted lock files.
+    """
+    storage = get_storage(storage)
+    folders = [CONFIG_PATH]
+    if isinstance(storage, WriteBackStorage):
+        folders.append(storage.cache_path)
+    removed = []
+    with _CACHE_LOCK:
+        for folder in folders:
+            for path in folder.glob(".*.lock"):
+                title = path.name[1 : -len(".lock")]
+                if _stored(title, storage):
+                    continue
+                with _file_lock(path):
+                    # saved by another process in the meantime
+                    if _stored(title, storage):
+                        continue
+                    _remove_lock(path)
+                removed.append(path)
+    return removed
+
+
+def _same(a, b) -> bool:
+    """Check if two config values are equal, without treating e.g. 1,
+    1.0 and True as the same value."""
+    if isinstance(a, Blob) and isinstance(b, Blob):
+        return a.name == b.name
+    if isinstance(a, Blob):
+        a = a.load()
+    if isinstance(b, Blob):
+        b = b.load()
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(a, np.ndarray):
+        return (
+            isinstance(b, np.ndarray)
+            and a.dtype == b.dtype
+            and np.array_equal(a, b)
+        )
+    return type(a) is type(b) and a == b
+
+
+def changed_values(cfg: dict, snapshot: dict) -> dict:
+    """Get the values that differ from a previously persisted snapshot.
+
+    Parameters
+    ----------
+    cfg : dict
+        The current configuration values.
+    snapshot : dict
+        The values as they were last loaded from or written to disk.
+
+    Returns
+    -------
+    dict
+        The tags of `cfg` whose value is new or differs from `snapshot`.
+    """
+    return {
+        tag: value
+        # dict.items does not load the blobs of a LazyConfig
+        for tag, value in dict.items(cfg)
+        if not _same(snapshot.get(tag, _MISSING), value)
+    }
+
+
+def _load(title: str, storage=None) -> dict:
+    """Get the cached configuration of a GUI, re-reading it only if it
+    changed on disk. The returned dict must not be modified."""
+    storage = get_storage(storage)
+    key = storage.key(title)
+    with _CACHE_LOCK:
+        stamp = storage.stamp(title)
+        entry = _CACHE.get(key)
+        if entry is not None and entry[0] == stamp:
+            _STATS["hits"] += 1
+            return entry[1]
+        _STATS["misses"] += 1
+        if stamp is None:
+            cfg = {}
+        else:
+            staged = _staged_blob_dir(storage)
+            cfg = _decode_values(storage.read(title), staged)
+        _CACHE[key] = (stamp, cfg)
+        return cfg
+
+
+def get_config(title: str, storage=None) -> dict:
+    """Get the saved configuration of a GUI.
+
+    The configuration is read from a process-wide cache that is validated
+    against the file's modification time, size and inode, so the YAML file
+    is only parsed again when it was changed by another process.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : str or YAMLStorage, optional
+        The storage to read from. Default is `get_storage()`.
+
+    Returns
+    -------
+    dict
+        A copy of the configuration dictionary, with typed values such as
+        paths or tuples decoded. Values stored in blob files are read on
+        first access. Empty if no config exists.
+    """
+    return LazyConfig(_load(title, storage))
+
+
+def save_config(
+    title: str, cfg: dict, snapshot: dict | None = None, storage=None
+) -> bool:
+    """Merge values into the saved configuration of a GUI.
+
+    Only tags whose value changed are merged, and the file is only
+    rewritten if the merged content differs from what is on disk.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    cfg : dict
+        The values to store. Tags not present are kept as saved.
+    snapshot : dict, optional
+        The values last persisted by the caller. Tags whose value did not
+        change since are skipped, and if nothing changed no disk access is
+        made at all. Updated in place with the saved values.
+    storage : str or YAMLStorage, optional
+        The storage to write to. Default is `get_storage()`.
+
+    Returns
+    -------
+    bool
+        True if the configuration file was written.
+    """
+    if snapshot is not None:
+        cfg = changed_values(cfg, snapshot)
+        if not cfg:
+            return False
+    storage = get_storage(storage)
+    with _CACHE_LOCK, storage.lock(title):
+        # changes made by other processes are picked up here, and only the
+        # tags changed by this caller are merged on top of them
+        base_config = _load(title, storage)
+        changes = changed_values(cfg, base_config)
+        if snapshot is not None:
+            snapshot.update(cfg)
+        if not changes:
+            return False
+        changes = {
+            tag: _to_blob(value, storage) for tag, value in changes.items()
+        }
+        base_config = dict(base_config)
+        base_config.update(changes)
+        storage.write(
+            title, _encode_values(base_config), _encode_values(changes)
+        )
+        _CACHE[storage.key(title)] = (storage.stamp(title), base_config)
+        return True
+
+
+def delete_config(title: str, storage=None):
+    """Delete the saved configuration of a GUI.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : str or YAMLStorage, optional
+        The storage to delete from. Default is `get_storage()`.
+    """
+    storage = get_storage(storage)
+    with _CACHE_LOCK, storage.lock(title):
+        _CACHE.pop(storage.key(title), None)
+        storage.delete(title)
+        _forget_usage(storage.usage_file(title))
+        shared = _SHARED.get(storage.key(title))
+        if shared is not None:
+            shared.reset()
+        _remove_lock(storage.lock_file(title))
+
+
+class SharedConfig(LazyConfig):
+    """The live configuration of a GUI title, shared by all the GUIs of
+    the process using that title. Get it with `shared_config`.
+
+    Values set by one GUI are seen by the others. Values saved by other
+    processes are adopted on `refresh`, unless they were changed here and
+    not saved yet. Saves of all GUIs are serialized by the config cache
+    lock.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : YAMLStorage
+        The storage the configuration is kept in.
+    """
+
+    def __init__(self, title: str, storage):
+        super().__init__()
+        self.title = title
+        self.storage = storage
+        # the values as last loaded from or written to the storage
+        self.snapshot = {}
+        self._stamp = _MISSING
+        self.refresh()
+
+    def refresh(self):
+        """Adopt the values saved by other processes since the last
+        refresh, keeping the values changed here but not saved yet."""
+        with _CACHE_LOCK:
+            stamp = self.storage.stamp(self.title)
+            if stamp != self._stamp:
+                self._adopt(_load(self.title, self.storage), stamp)
+
+    def save(self, values: dict | None = None) -> bool:
+        """Save the values changed since the last save.
+
+        Parameters
+        ----------
+        values : dict, optional
+            Values to set before saving, e.g. the current widget values.
+
+        Returns
+        -------
+        bool
+            True if the configuration was written.
+        """
+        with _CACHE_LOCK:
+            if values:
+                dict.update(self, values)
+                touch_tags(self.title, values, storage=self.storage)
+            written = save_config(
+                self.title, self, self.snapshot, self.storage
+            )
+            entry = _CACHE.get(self.storage.key(self.title))
+            if entry is not None:
+                self._adopt(entry[1], entry[0])
+            return written
+
+    def touch(self, tags):
+        """Record that a GUI uses tags now, see `touch_tags`."""
+        touch_tags(self.title, tags, storage=self.storage)
+
+    def reset(self):
+        """Forget all values, after the configuration was deleted."""
+        with _CACHE_LOCK:
+            self.clear()
+            self.snapshot.clear()
+            self._stamp = None
+
+    def _adopt(self, saved: dict, stamp):
+        unsaved = changed_values(self, self.snapshot)
+        for tag in list(self.snapshot):
+            if tag not in saved and tag not in unsaved:
+                # deleted by another process
+                dict.pop(self, tag, None)
+                del self.snapshot[tag]
+        for tag, value in saved.items():
+            if tag not in unsaved:
+                dict.__setitem__(self, tag, value)
+                self.snapshot[tag] = value
+        self._stamp = stamp
+
+
+def shared_config(title: str, storage=None) -> SharedConfig:
+    """Get the live configuration of a GUI, shared by all the GUIs of the
+    process with the same title and storage.
+
+    The configuration is loaded once, and refreshed from the storage when
+    another process changed it.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : str or YAMLStorage, optional
+        The storage to read from. Default is `get_storage()`.
+
+    Returns
+    -------
+    SharedConfig
+        The live configuration.
+    """
+    storage = get_storage(storage)
+    key = storage.key(title)
+    with _CACHE_LOCK:
+        shared = _SHARED.get(key)
+        if shared is None:
+            shared = SharedConfig(title, storage)
+            _SHARED[key] = shared
+        else:
+            shared.refresh()
+        return shared
+
+
+def usage_file(title: str, storage=None) -> Path:
+    """Get the path of the file holding the last-used timestamps of the
+    tags of a GUI.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : str or YAMLStorage, optional
+        The storage of the configuration. Default is `get_storage()`.
+    """
+    return get_storage(storage).usage_file(title)
+
+
+def _read_usage(path: Path) -> dict:
+    try:
+        with open(path, "r") as f:
+            usage = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return usage if isinstance(usage, dict) else {}
+
+
+def _usage(path: Path) -> dict:
+    """Get the cached last-used timestamps kept in a usage file."""
+    if path not in _USAGE:
+        _USAGE[path] = _read_usage(path)
+    return _USAGE[path]
+
+
+def _write_usage(path: Path, usage: dict):
+    # merge the timestamps recorded by other processes in the meantime
+    for tag, used in _read_usage(path).items():
+        if tag in usage and used > usage[tag]:
+            usage[tag] = used
+    _atomic_write(path, lambda f: json.dump(usage, f))
+
+
+def _forget_usage(path: Path):
+    _USAGE.pop(path, None)
+    if path.exists():
+        os.remove(path)
+
+
+def tag_usage(title: str, storage=None) -> dict:
+    """Get when each tag of a GUI was last used.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    storage : str or YAMLStorage, optional
+        The storage of the configuration. Default is `get_storage()`.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping tags to the time they were last used, in seconds
+        since the epoch. Tags never recorded are missing.
+    """
+    with _CACHE_LOCK:
+        return dict(_usage(usage_file(title, storage)))
+
+
+def touch_tags(title: str, tags, now: float | None = None, storage=None):
+    """Record that a GUI uses tags, for `compact_config` to find the ones
+    no longer used.
+
+    Timestamps are kept in `usage_file(title, storage)`, which is only
+    rewritten when a tag is new or its timestamp is older than
+    `USAGE_RESOLUTION`. For a `WriteBackStorage`, the file is kept in its
+    local cache.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    tags : iterable of str
+        The tags in use.
+    now : float, optional
+        The time of use, in seconds since the epoch. Default is now.
+    storage : str or YAMLStorage, optional
+        The storage of the configuration. Default is `get_storage()`.
+    """
+    now = time.time() if now is None else now
+    path = usage_file(title, storage)
+    with _CACHE_LOCK:
+        usage = _usage(path)
+        stale = [
+            tag
+            for tag in tags
+            if not str(tag).startswith("label_")
+            and now - usage.get(tag, -USAGE_RESOLUTION) >= USAGE_RESOLUTION
+        ]
+        if not stale:
+            return
+        for tag in stale:
+            usage[tag] = now
+        try:
+            _write_usage(path, usage)
+        except OSError as e:
+            print(f"Failed to record the usage of {title}: {e}")
+
+
+def compact_config(
+    title: str,
+    keep=None,
+    days: float | None = None,
+    storage=None,
+) -> CompactInfo:
+    """Drop the stale tags from the saved configuration of a GUI.
+
+    Saves only ever add tags to a configuration, so tags of renamed or
+    removed widgets stay in it forever. Stale tags are the ones absent
+    from `keep`, the ones not used for `days` days and the `label_*` tags
+    written by older versions. Tags with no recorded usage are considered
+    used now, so they are dropped `days` days later at the earliest.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    keep : iterable of str, optional
+        The tags of the current GUI. If None, tags are kept regardless of
+        the widgets.
+    days : float, optional
+        Drop the tags not used for this many days. If None, tags are kept
+        regardless of their age.
+    storage : str or YAMLStorage, optional
+        The storage of the configuration. Default is `get_storage()`.
+
+    Returns
+    -------
+    CompactInfo
+        Named tuple with the `dropped` tags and the number of bytes
+        `reclaimed` in the storage.
+    """
+    storage = get_storage(storage)
+    keep = None if keep is None else set(keep)
+    now = time.time()
+    key = storage.key(title)
+    with _CACHE_LOCK, storage.lock(title):
+        cfg = _load(title, storage)
+        path = storage.usage_file(title)
+        usage = _usage(path)
+        unseen = [tag for tag in cfg if tag not in usage]
+        dropped = sorted(
+            tag
+            for tag in cfg
+            if str(tag).startswith("label_")
+            or (keep is not None and tag not in keep)
+            or (
+                days is not None
+                and now - usage.get(tag, now) > days * SECONDS_PER_DAY
+            )
+        )
+        if unseen or dropped:
+            for tag in unseen:
+                usage[tag] = now
+            for tag in dropped:
+                usage.pop(tag, None)
+            _write_usage(path, usage)
+        if not dropped:
+            return CompactInfo([], 0)
+        before = storage.size(title)
+        kept = {tag: v for tag, v in cfg.items() if tag not in dropped}
+        if kept:
+            storage.replace(title, _encode_values(kept))
+        else:
+            storage.delete(title)
+        _CACHE[key] = (storage.stamp(title), kept)
+        shared = _SHARED.get(key)
+        if shared is not None:
+            for tag in dropped:
+                dict.pop(shared, tag, None)
+                shared.snapshot.pop(tag, None)
+        return CompactInfo(dropped, max(before - storage.size(title), 0))
+
+
+def _disk_usage(path: Path) -> int:
+    """Get the total size of the files in a directory, in bytes."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                continue
+    return total
+
+
+def compact_configs(days: float | None = None, storage=None) -> dict:
+    """Drop the stale tags of all saved configurations, see
+    `compact_config`, and delete the blob files no longer used.
+
+    Parameters
+    ----------
+    days : float, optional
+        Drop the tags not used for this many days. If None, only the
+        `label_*` tags are dropped.
+    storage : str or YAMLStorage, optional
+        The storage of the configurations. Default is `get_storage()`.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping the titles of the compacted configurations to
+        their `CompactInfo`.
+    """
+    storage = get_storage(storage)
+    compacted = {}
+    for title in storage.titles():
+        info = compact_config(title, days=days, storage=storage)
+        if info.dropped:
+            compacted[title] = info
+    if compacted and hasattr(storage, "vacuum"):
+        storage.vacuum()
+    if isinstance(storage, WriteBackStorage):
+        storage.flush()
+    collect_blobs(storage)
+    return compacted
+
+
+def cache_info() -> CacheInfo:
+    """Get statistics of the configuration cache.
+
+    Returns
+    -------
+    CacheInfo
+        Named tuple with the number of cache `hits`, `misses` and the
+        number of cached configurations (`currsize`).
+    """
+    with _CACHE_LOCK:
+        return CacheInfo(_STATS["hits"], _STATS["misses"], len(_CACHE))
+
+
+def clear_cache():
+    """Drop all cached configurations and reset the cache statistics."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _STATS["hits"] = 0
+        _STATS["misses"] = 0
+
+
+def migrate_configs(
+    storage="sqlite", remove: bool = False, config_path=None
+) -> list:
+    """Import the YAML configuration files of all GUIs into a storage.
+
+    Parameters
+    ----------
+    storage : str or YAMLStorage, optional
+        The storage to import into. Default is "sqlite".
+    remove : bool, optional
+        If True, deletes each YAML file once imported. Default is False.
+    config_path : str or Path, optional
+        Directory containing the YAML files. Default is `CONFIG_PATH`.
+
+    Returns
+    -------
+    list
+        The titles of the imported configurations.
+    """
+    storage = get_storage(storage)
+    folder = Path(config_path) if config_path is not None else CONFIG_PATH
+    configs = {}
+    for path in sorted(folder.glob("*.yml")):
+        if path.name.startswith("."):
+            continue
+        try:
+            # legacy python/* tags are read back and stored encoded
+            cfg = _decode_values(_read_yaml(path))
+            configs[path.stem] = _encode_values(cfg)
+        except yaml.YAMLError as e:
+            print(f"Skipping {path}: {e}")
+    with _CACHE_LOCK:
+        if hasattr(storage, "write_many"):
+            storage.write_many(configs)
+        else:
+            for title, cfg in configs.items():
+                storage.write(title, cfg, cfg)
+        for title in configs:
+            _CACHE.pop(storage.key(title), None)
+    if remove:
+        for title in configs:
+            os.remove(folder / f"{title}.yml")
+    return list(configs)
+
+
+def migrate():
+    """Console script importing YAML configuration files into a storage.
+
+    Usage:
+        ezinput-migrate [--to sqlite] [--remove] [--path DIR]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="ezinput-migrate",
+        description="Import ~/.ezinput/*.yml files into another storage.",
+    )
+    parser.add_argument(
+        "--to",
+        default="sqlite",
+        choices=[name for name in STORAGES if name != "yaml"],
+        help="storage to import into (default: sqlite)",
+    )
+    parser.add_argument(
+        "--remove",
+        action="store_true",
+        help="delete the YAML files once imported",
+    )
+    parser.add_argument(
+        "--path", default=None, help="directory of the YAML files"
+    )
+    args = parser.parse_args()
+    titles = migrate_configs(args.to, args.remove, args.path)
+    print(f"Imported {len(titles)} configurations into '{args.to}'.")
+
+
+def gc():
+    """Console script dropping stale tags from all saved configurations.
+
+    Usage:
+        ezinput-gc [--days N] [--storage NAME] [--path DIR]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="ezinput-gc",
+        description="Drop stale tags from the configurations in "
+        "~/.ezinput and delete unused blob files.",
+    )
+    parser.add_argument(
+        "--days",
+        type=float,
+        default=None,
+        help="drop the tags not used for this many days "
+        "(default: only drop label tags)",
+    )
+    parser.add_argument(
+        "--storage",
+        default=None,
+        choices=list(STORAGES),
+        help="storage of the configurations (default: $EZINPUT_STORAGE "
+        "or yaml)",
+    )
+    parser.add_argument(
+        "--path", default=None, help="configuration directory"
+    )
+    args = parser.parse_args()
+    if args.path is not None:
+        set_config_path(args.path)
+    before = _disk_usage(CONFIG_PATH)
+    compacted = compact_configs(args.days, args.storage)
+    collect_locks(args.storage)
+    for title, info in compacted.items():
+        print(f"{title}: dropped {', '.join(map(str, info.dropped))}")
+    reclaimed = max(before - _disk_usage(CONFIG_PATH), 0)
+    print(
+        f"Compacted {len(compacted)} configurations in {CONFIG_PATH}, "
+        f"reclaimed {reclaimed} bytes."
+    )
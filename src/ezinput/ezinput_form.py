@@ -0,0 +1,203 @@
+from collections import namedtuple
+
+from prompt_toolkit.application import Application
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.document import Document
+from prompt_toolkit.filters import Condition, has_completions
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import (
+    ConditionalContainer,
+    Float,
+    FloatContainer,
+    HSplit,
+    Layout,
+    VSplit,
+    Window,
+)
+from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+from prompt_toolkit.layout.menus import CompletionsMenu
+
+"""
+A module to ask all the fields of a terminal GUI in one full-screen form.
+
+The form is a single prompt_toolkit `Application`: every field is rendered
+at once, Tab / Shift-Tab (or Down / Up) move between fields and Enter
+validates the current field before moving to the next one. A field failing
+its validator shows the error below it, and the form is submitted by Enter
+on the last field once every field is valid. The renderer only redraws
+the parts of the screen that changed, e.g. the field being edited.
+"""
+
+FormField = namedtuple(
+    "FormField", ["tag", "message", "default", "completer", "validator"]
+)
+
+HELP = (
+    " Tab/Shift-Tab: move  Enter: next field, submit on the last"
+    "  Ctrl-C: cancel "
+)
+
+
+def _error(buffer):
+    """Get the validation error to show below the field of a buffer."""
+    if buffer.validation_error is None:
+        return ""
+    return f"  {buffer.validation_error.message}"
+
+
+def create_form(title: str, rows: list) -> Application:
+    """Create the application of a form.
+
+    Parameters
+    ----------
+    title : str
+        The title shown above the fields.
+    rows : list
+        The rows of the form, in order: `FormField` for fields and strings
+        for labels.
+
+    Returns
+    -------
+    Application
+        The application, whose result is a dictionary mapping the tags of
+        the fields to their text.
+    """
+    fields = [row for row in rows if isinstance(row, FormField)]
+    buffers = {
+        field.tag: Buffer(
+            document=Document(field.default, len(field.default)),
+            completer=field.completer,
+            validator=field.validator,
+            complete_while_typing=field.completer is not None,
+            multiline=False,
+            name=field.tag,
+        )
+        for field in fields
+    }
+    width = max((len(field.message) for field in fields), default=0)
+    children = [Window(FormattedTextControl(title), height=1, style="bold")]
+    for row in rows:
+        if not isinstance(row, FormField):
+            children.append(
+                Window(FormattedTextControl(row), height=1, style="underline")
+            )
+            continue
+        buffer = buffers[row.tag]
+        children.append(
+            VSplit(
+                [
+                    Window(
+                        FormattedTextControl(row.message),
+                        width=width,
+                        height=1,
+                    ),
+                    Window(BufferControl(buffer), height=1),
+                ]
+            )
+        )
+        children.append(
+            ConditionalContainer(
+                Window(
+                    FormattedTextControl(lambda b=buffer: _error(b)),
+                    height=1,
+                    style="class:validation-toolbar",
+                ),
+                filter=Condition(
+                    lambda b=buffer: b.validation_error is not None
+                ),
+            )
+        )
+    children.append(Window(height=1, char=" "))
+    children.append(Window(FormattedTextControl(HELP), style="reverse"))
+
+    order = [buffers[field.tag] for field in fields]
+    kb = KeyBindings()
+
+    @kb.add("tab")
+    @kb.add("down", filter=~has_completions)
+    def _next(event):
+        event.current_buffer.validate()
+        event.app.layout.focus_next()
+
+    @kb.add("s-tab")
+    @kb.add("up", filter=~has_completions)
+    def _previous(event):
+        event.current_buffer.validate()
+        event.app.layout.focus_previous()
+
+    @kb.add("enter")
+    def _enter(event):
+        buffer = event.current_buffer
+        if buffer.complete_state is not None:
+            completion = buffer.complete_state.current_completion
+            if completion is not None:
+                buffer.apply_completion(completion)
+            buffer.cancel_completion()
+        if not buffer.validate():
+            return
+        if buffer is not order[-1]:
+            event.app.layout.focus_next()
+            return
+        for other in order:
+            if not other.validate():
+                event.app.layout.focus(other)
+                return
+        event.app.exit(result={tag: b.text for tag, b in buffers.items()})
+
+    @kb.add("c-c")
+    def _cancel(event):
+        event.app.exit(exception=KeyboardInterrupt())
+
+    root = FloatContainer(
+        HSplit(children),
+        floats=[
+            Float(
+                xcursor=True,
+                ycursor=True,
+                content=CompletionsMenu(max_height=8),
+            )
+        ],
+    )
+    layout = Layout(root)
+    if order:
+        layout.focus(order[0])
+    return Application(
+        layout=layout,
+        key_bindings=kb,
+        full_screen=True,
+        mouse_support=True,
+    )
+
+
+def run_form(title: str, rows: list) -> dict:
+    """Ask the fields of a form.
+
+    Parameters
+    ----------
+    title : str
+        The title shown above the fields.
+    rows : list
+        The rows of the form, in order: `FormField` for fields and strings
+        for labels.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping the tags of the fields to their text.
+
+    Raises
+    ------
+    KeyboardInterrupt
+        If the form is cancelled with Ctrl-C.
+    """
+    if not any(isinstance(row, FormField) for row in rows):
+        return {}
+    return create_form(title, rows).run()
+
+
+async def run_form_async(title: str, rows: list) -> dict:
+    """Ask the fields of a form without blocking the event loop, see
+    `run_form`."""
+    if not any(isinstance(row, FormField) for row in rows):
+        return {}
+    return await create_form(title, rows).run_async()
@@ -0,0 +1,749 @@
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+from fnmatch import fnmatch
+from pathlib import Path, PurePath
+
+from .ezinput_cli import find_override, format_help, read_env
+from .ezinput_config import (
+    collect_blobs,
+    compact_config,
+    config_blobs,
+    delete_config,
+    get_config,
+    shared_config,
+)
+from .ezinput_serializers import dump_file, is_supported, load_file
+
+"""
+A module to run GUIs without user interaction, e.g. in batch jobs or CI.
+
+Selected with `EZInput(title, mode="headless")` or by setting the
+`EZINPUT_MODE` environment variable to "headless". Neither prompt_toolkit
+nor ipywidgets are imported.
+"""
+
+_MISSING = object()
+
+
+class Element:
+    """A simple wrapper class for widget values.
+
+    Parameters
+    ----------
+    value : Any
+        The value to store in the element.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _HelpElement(Element):
+    """Element of a GUI run with `--help`, printing the help and exiting
+    when its value is first read, as the value may be missing."""
+
+    def __init__(self, value, gui):
+        self._value = value
+        self._gui = gui
+
+    @property
+    def value(self):
+        if self._gui._show_help:
+            self._gui._print_help()
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+def _to_int(value) -> int:
+    if isinstance(value, bool):
+        raise TypeError(f"expected an integer, got {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value.strip())
+    raise TypeError(f"expected an integer, got {value!r}")
+
+
+def _to_float(value) -> float:
+    if isinstance(value, bool):
+        raise TypeError(f"expected a number, got {value!r}")
+    if isinstance(value, (int, float, str)):
+        return float(value)
+    raise TypeError(f"expected a number, got {value!r}")
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        answer = value.strip().lower()
+        if answer in ("yes", "true", "1"):
+            return True
+        if answer in ("no", "false", "0"):
+            return False
+    raise ValueError(f"expected yes or no, got {value!r}")
+
+
+def _to_str(value) -> str:
+    if not isinstance(value, str):
+        raise TypeError(f"expected a string, got {value!r}")
+    return value
+
+
+def _to_path(value) -> Path:
+    if not isinstance(value, (str, PurePath)):
+        raise TypeError(f"expected a path, got {value!r}")
+    return Path(value)
+
+
+def _to_tuple(value) -> tuple:
+    if isinstance(value, str):
+        return tuple(item.strip() for item in value.split(","))
+    if not isinstance(value, (list, tuple)):
+        raise TypeError(f"expected a list, got {value!r}")
+    return tuple(value)
+
+
+def _in_range(vmin, vmax):
+    def check(value):
+        if not vmin <= value <= vmax:
+            raise ValueError(f"{value} is out of [{vmin}, {vmax}]")
+
+    return check
+
+
+def _to_option(options):
+    # command-line values are strings, match them to options of any type
+    def convert(value):
+        if isinstance(value, str) and value not in options:
+            for option in options:
+                if str(option) == value:
+                    return option
+        return value
+
+    return convert
+
+
+def _to_options(options):
+    to_option = _to_option(options)
+    return lambda value: tuple(to_option(item) for item in _to_tuple(value))
+
+
+def _one_of(options):
+    def check(value):
+        if value not in options:
+            raise ValueError(f"{value!r} is not one of {list(options)}")
+
+    return check
+
+
+def _all_of(options):
+    def check(value):
+        for item in value:
+            if item not in options:
+                raise ValueError(f"{item!r} is not one of {list(options)}")
+
+    return check
+
+
+def _exists(value):
+    if not value.exists():
+        raise ValueError(f"{value} does not exist")
+
+
+def _exists_matching(accept):
+    if isinstance(accept, str):
+        accept = accept.replace(",", ";").split(";")
+    patterns = [pattern.strip() for pattern in accept if pattern.strip()]
+
+    def check(value):
+        _exists(value)
+        if patterns and not any(fnmatch(value.name, p) for p in patterns):
+            raise ValueError(f"{value} does not match {', '.join(patterns)}")
+
+    return check
+
+
+def coerce(value, like, options=None, vmin=None, vmax=None):
+    """Convert a value, e.g. a string from an environment variable, to the
+    type of a widget value and check it.
+
+    Parameters
+    ----------
+    value : Any
+        The value to convert.
+    like : Any
+        A value of the widget, giving the type.
+    options : list, optional
+        The allowed values, or items of tuple values.
+    vmin, vmax : int or float, optional
+        The allowed range.
+
+    Returns
+    -------
+    Any
+        The converted value.
+
+    Raises
+    ------
+    TypeError
+        If the value has a type that can't be converted.
+    ValueError
+        If the value can't be converted or is not allowed.
+    """
+    if options is not None:
+        if isinstance(like, tuple):
+            value = _to_options(options)(value)
+            _all_of(options)(value)
+        else:
+            value = _to_option(options)(value)
+            _one_of(options)(value)
+        return value
+    for cls, convert in (
+        (bool, _to_bool),
+        (int, _to_int),
+        (float, _to_float),
+        (PurePath, _to_path),
+        (str, _to_str),
+    ):
+        if isinstance(like, cls):
+            value = convert(value)
+            break
+    if vmin is not None and vmax is not None:
+        _in_range(vmin, vmax)(value)
+    return value
+
+
+class EZInputHeadless:
+    """A class to run GUIs without any user interaction.
+
+    Each widget takes its value from the command line, else from its
+    `EZINPUT_<TITLE>_<TAG>` environment variable, else from the parameters
+    file, else from the remembered value, else from its default. Values are
+    validated like in the other backends: invalid parameters and defaults
+    are errors, while invalid remembered values, e.g. out of a range
+    changed since, are skipped. All the missing or invalid values are
+    reported together, with a ValueError raised by `show`, `get_values` or
+    `add_callback`.
+
+    Remembered values are never written, so parallel jobs don't contend on
+    the configuration file and don't change the values of the GUI.
+
+    Parameters
+    ----------
+    title : str
+        Title of the GUI, used to find the remembered values.
+
+    Examples
+    --------
+    >>> gui = EZInput("my_app", mode="headless", params_file="job_1.yml")
+    >>> gui.add_int_range("threshold", "Threshold", 0, 255)
+    >>> gui.show()  # raises if threshold is missing from job_1.yml
+    """
+
+    def __init__(self, title: str, storage=None):
+        """Initialize the headless GUI.
+
+        Parameters
+        ----------
+        title : str
+            Title of the GUI, used to identify the configuration file.
+        storage : str or YAMLStorage, optional
+            Storage of the remembered values, e.g. "yaml", "journal" or
+            "sqlite". Default is the `EZINPUT_STORAGE` environment
+            variable, or "yaml".
+        """
+        self.title = title
+        self._storage = storage
+        self.elements = {}
+        self.cfg = shared_config(title, self._storage)
+        self.params = None
+        self.cli = {}
+        self.env = read_env(title)
+        self._nLabels = 0
+        self._init_headless()
+
+    def _init_headless(self, show_help: bool = False):
+        """**@headless** - Internal method to set up the value errors.
+
+        Parameters
+        ----------
+        show_help : bool, optional
+            If True, the command-line help is printed instead of checking
+            the values, and the program exits, once a value is first read
+            or at exit. Default is False.
+        """
+        self._errors = {}
+        self._flags = {}
+        self._sources = {}
+        self._show_help = show_help
+        if show_help:
+            atexit.register(self._print_help, exit=False)
+
+    def _print_help(self, exit: bool = True):
+        """**@headless** - Internal method printing the command-line help
+        once, then exiting if `exit`."""
+        if self._show_help:
+            self._show_help = False
+            print(format_help(self.title, self._flags))
+        if exit:
+            sys.exit(0)
+
+    def __getvalue__(self, tag: str):
+        """
+        @unified
+        Get the value of a widget.
+
+        Parameters
+        ----------
+        tag : str
+            Tag to identify the widget.
+
+        Returns
+        -------
+        Any
+            The value of the widget.
+        """
+        return self.elements[tag].value
+
+    def _add(
+        self,
+        tag: str,
+        convert,
+        check=None,
+        default=_MISSING,
+        remember_value=True,
+        *,
+        metavar: str = "VALUE",
+        description: str = "",
+    ) -> Element:
+        """**@headless** - Internal method to resolve the value of a widget.
+
+        Parameters
+        ----------
+        tag : str
+            Unique identifier for the widget.
+        convert : callable
+            Converts a value to the type of the widget, raising ValueError
+            if it can't.
+        check : callable, optional
+            Raises ValueError if a converted value is not allowed.
+        default : Any, optional
+            The default value. If not given, the value is missing unless it
+            is in the parameters or remembered.
+        remember_value : bool, optional
+            If True, the remembered value is used. Default is True.
+        metavar : str, optional
+            The value of the command-line flag in the help, or "" for a
+            yes/no flag. Default is "VALUE".
+        description : str, optional
+            The description of the flag in the help. Default is "".
+
+        Returns
+        -------
+        Element
+            An Element with the value, or None if it is missing or invalid.
+        """
+        self._errors.pop(tag, None)
+        sources = []
+        override = find_override(tag, self.cli, self.env, flag=metavar == "")
+        if override is not None:
+            sources.append(override)
+        if self.params is not None and tag in self.params:
+            sources.append(("params", self.params[tag]))
+        if remember_value and tag in self.cfg:
+            sources.append(("cfg", self.cfg[tag]))
+        if default is not _MISSING:
+            sources.append(("default", default))
+        value = None
+        error = "missing value"
+        for source, candidate in sources:
+            try:
+                candidate = convert(candidate)
+                if check is not None:
+                    check(candidate)
+            except (ValueError, TypeError) as e:
+                if source == "cfg":
+                    # remembered with other ranges or options
+                    continue
+                error = f"invalid {source} value, {e}"
+                break
+            value, error = candidate, None
+            self._sources[tag] = source
+            break
+        if error is not None:
+            self._errors[tag] = error
+        self._flags[tag] = (metavar, description, value)
+        if self._show_help:
+            self.elements[tag] = _HelpElement(value, self)
+        else:
+            self.elements[tag] = Element(value)
+        return self.elements[tag]
+
+    def _check(self):
+        """**@headless** - Internal method raising the value errors.
+
+        Raises
+        ------
+        ValueError
+            Listing every missing or invalid value.
+        """
+        if self._show_help:
+            self._print_help()
+        if self._errors:
+            raise ValueError(
+                f"Missing or invalid values for '{self.title}':\n"
+                + "\n".join(
+                    f"  {tag}: {error}" for tag, error in self._errors.items()
+                )
+            )
+
+    def add_label(
+        self, tag: str | None = None, value: str = "", *args, **kwargs
+    ):
+        """**@unified** - Add a label, which has no value."""
+        self._nLabels += 1
+        if tag is None:
+            tag = f"label_{self._nLabels}"
+        self.elements[tag] = Element(value)
+
+    def add_HTML(self, tag: str, value: str, *args, **kwargs):
+        """**@jupyter** - Add an HTML widget, holding its content."""
+        self.elements[tag] = Element(value)
+        return self.elements[tag]
+
+    def add_output(self, tag: str, *args, **kwargs):
+        """**@unified** - Add an output widget (no-op in headless mode)."""
+
+    def add_callback(
+        self, tag, func, values: dict, description="Run", *args, **kwargs
+    ):
+        """**@unified** - Run a callback, once all values are valid.
+
+        Parameters
+        ----------
+        tag : str
+            Unique identifier for this widget (unused).
+        func : callable
+            Function to call with `values`.
+        values : dict
+            Dictionary of widget values to pass to the callback function.
+
+        Raises
+        ------
+        ValueError
+            If any widget value is missing or invalid.
+        """
+        self._check()
+        func(values)
+
+    def add_text(
+        self,
+        tag: str,
+        description: str = "",
+        placeholder: str = "",
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@unified** - Add a text value, defaulting to `value` or "".
+        The `placeholder` is only a hint, never the value."""
+        default = kwargs.get("value", kwargs.get("default", ""))
+        return self._add(
+            tag,
+            _to_str,
+            None,
+            default,
+            remember_value,
+            metavar="TEXT",
+            description=description,
+        )
+
+    add_text_area = add_text
+
+    def add_int_range(
+        self,
+        tag: str,
+        description: str,
+        vmin: int,
+        vmax: int,
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@unified** - Add an integer value within [vmin, vmax]."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_int,
+            _in_range(vmin, vmax),
+            default,
+            remember_value,
+            metavar="INT",
+            description=f"{description} ({vmin}-{vmax})",
+        )
+
+    add_int_slider = add_bounded_int_text = add_int_range
+
+    def add_float_range(
+        self,
+        tag: str,
+        description: str,
+        vmin: float,
+        vmax: float,
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@unified** - Add a float value within [vmin, vmax]."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_float,
+            _in_range(vmin, vmax),
+            default,
+            remember_value,
+            metavar="FLOAT",
+            description=f"{description} ({vmin}-{vmax})",
+        )
+
+    add_float_slider = add_bounded_float_text = add_float_range
+
+    def add_int_text(
+        self,
+        tag: str,
+        description: str = "",
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@unified** - Add an integer value."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_int,
+            None,
+            default,
+            remember_value,
+            metavar="INT",
+            description=description,
+        )
+
+    def add_float_text(
+        self,
+        tag: str,
+        description: str = "",
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@unified** - Add a float value."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_float,
+            None,
+            default,
+            remember_value,
+            metavar="FLOAT",
+            description=description,
+        )
+
+    def add_check(
+        self, tag: str, description: str, *args, remember_value=True, **kwargs
+    ):
+        """**@unified** - Add a yes/no value."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_bool,
+            None,
+            default,
+            remember_value,
+            metavar="",
+            description=description,
+        )
+
+    add_checkbox = add_check
+
+    def add_dropdown(
+        self,
+        tag: str,
+        options: list,
+        description: str = "",
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@unified** - Add a value that is one of `options`."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_option(options),
+            _one_of(options),
+            default,
+            remember_value,
+            metavar="{" + ",".join(map(str, options)) + "}",
+            description=description,
+        )
+
+    def add_select_multiple(
+        self,
+        tag: str,
+        options: list,
+        description: str = "",
+        *args,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@jupyter** - Add a tuple of values of `options`, by default
+        empty."""
+        default = kwargs.get("value", ())
+        names = ", ".join(map(str, options))
+        return self._add(
+            tag,
+            _to_options(options),
+            _all_of(options),
+            default,
+            remember_value,
+            metavar="A,B,...",
+            description=f"{description} (any of {names})",
+        )
+
+    def add_path_completer(
+        self,
+        tag: str,
+        description: str,
+        *args,
+        accept=None,
+        remember_value=True,
+        **kwargs,
+    ):
+        """**@prompt** - Add the path of an existing file or directory,
+        matching the `accept` file name pattern(s) if given."""
+        default = kwargs.get("value", kwargs.get("default", _MISSING))
+        return self._add(
+            tag,
+            _to_path,
+            _exists if accept is None else _exists_matching(accept),
+            default,
+            remember_value,
+            metavar="PATH",
+            description=description,
+        )
+
+    def clear_elements(self):
+        """**@unified** - Clear all widgets from the GUI."""
+        self.elements = {}
+        self._errors = {}
+        self._flags = {}
+        self._sources = {}
+
+    def save_parameters(self, path: str):
+        """**@unified** - Save current widget values to a parameter file.
+
+        Parameters
+        ----------
+        path : str
+            The file path for saving parameters. The format is chosen from
+            the extension (.yml, .yaml, .json, .toml or .msgpack). Otherwise
+            the filename will be auto-generated as '{title}_parameters.yml'.
+        """
+        if not is_supported(path):
+            path += f"{self.title}_parameters.yml"
+        dump_file(self.get_values(), path)
+
+    def load_parameters(self, path: str):
+        """**@unified** - Load widget values from a parameter file.
+
+        Parameters
+        ----------
+        path : str
+            The file path to load parameters from.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the specified file does not exist.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"The file {path} does not exist.")
+        self.params = load_file(path)
+
+    def show(self):
+        """**@unified** - Check that every widget has a valid value.
+
+        Raises
+        ------
+        ValueError
+            Listing every missing or invalid value.
+        """
+        self._check()
+
+    async def show_async(self):
+        """**@unified** - Same as `show`, which does not wait for input."""
+        self.show()
+
+    def _get_config(self, title: str | None = None) -> dict:
+        """Internal method to retrieve saved configuration."""
+        if title is None:
+            title = self.title
+        return get_config(title, self._storage)
+
+    def get_values(self, with_sources: bool = False) -> dict:
+        """**@unified** - Get current values of all widgets.
+
+        Parameters
+        ----------
+        with_sources : bool, optional
+            If True, each value is given with its source: "command-line",
+            "env", "params", "cfg" or "default". Default is False.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping widget tags to their values, or to (value,
+            source) tuples, excluding labels.
+
+        Raises
+        ------
+        ValueError
+            Listing every missing or invalid value.
+        """
+        self._check()
+        return {
+            tag: (
+                (element.value, self._sources.get(tag, "widget"))
+                if with_sources
+                else element.value
+            )
+            for tag, element in self.elements.items()
+            if not tag.startswith("label_")
+        }
+
+    def restore_defaults(self):
+        """**@unified** - Delete the remembered values of the GUI."""
+        blobs = config_blobs(self.title, self._storage)
+        delete_config(self.title, self._storage)
+        collect_blobs(self._storage, names=blobs)
+
+    def compact_config(self, days: float | None = None):
+        """**@unified** - Drop stale tags from the memory file, see
+        `EZInputPrompt.compact_config`."""
+        blobs = config_blobs(self.title, self._storage)
+        info = compact_config(
+            self.title,
+            keep=self.elements,
+            days=days,
+            storage=self._storage,
+        )
+        collect_blobs(self._storage, names=blobs)
+        return info
@@ -1,20 +1,158 @@
-import os
-import yaml
-from ipyfilechooser import FileChooser
-import ipywidgets as widgets
-from IPython.display import display, clear_output
-from pathlib import Path
+from __future__ import annotations
 
+import atexit
+import os
+import threading
+import time
 from typing import Optional
 
+import ipywidgets as widgets
+from ipyfilechooser import FileChooser
+from IPython.display import clear_output, display
+
+from .ezinput_cli import env_name, find_override, read_env
+from .ezinput_config import (
+    collect_blobs,
+    compact_config,
+    config_blobs,
+    delete_config,
+    get_config,
+    shared_config,
+)
+from .ezinput_headless import coerce
+from .ezinput_serializers import dump_file, is_supported, load_file
+
 """
 A module to help simplify the create of GUIs in Jupyter notebooks using ipywidgets.
 """
 
-CONFIG_PATH = Path.home() / ".ezinput"
+SAVE_DELAY = 0.5
+MAX_SAVE_DELAY = 2.0
+
+_PENDING_SAVERS = set()
+_ATEXIT_REGISTERED = False
+_COLAB_ENABLED = False
+
+
+def enable_colab():
+    """Enable the custom widget manager when running in Google Colab.
+
+    Called when the first Jupyter GUI is created, rather than at import.
+    """
+    global _COLAB_ENABLED
+    if _COLAB_ENABLED:
+        return
+    _COLAB_ENABLED = True
+    try:
+        from google.colab import output
+
+        output.enable_custom_widget_manager()
+    except ImportError:
+        pass
+
 
-if not os.path.exists(CONFIG_PATH):
-    os.makedirs(CONFIG_PATH)
+def _flush_pending_savers():
+    """Flush every saver that still holds unsaved changes."""
+    for saver in list(_PENDING_SAVERS):
+        saver.flush()
+
+
+class DebouncedSaver:
+    """Coalesce bursts of save requests into a single write.
+
+    A save is performed once no new request has arrived for `delay`
+    seconds, or at the latest `max_delay` seconds after the first request
+    of the burst. Pending saves are flushed when the interpreter exits.
+
+    Parameters
+    ----------
+    callback : callable
+        Function performing the actual save. Called without arguments.
+    delay : float, optional
+        Quiet period in seconds before a save is flushed. Default is
+        `SAVE_DELAY`.
+    max_delay : float, optional
+        Maximum time in seconds a request can stay pending. Default is
+        `MAX_SAVE_DELAY`.
+    """
+
+    def __init__(
+        self,
+        callback,
+        delay: float = SAVE_DELAY,
+        max_delay: float = MAX_SAVE_DELAY,
+    ):
+        self.callback = callback
+        self.delay = delay
+        self.max_delay = max(max_delay, delay)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._first = None
+        self._last = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a save has been requested but not yet flushed."""
+        return self._first is not None
+
+    def request(self):
+        """Schedule a save, merging it with any pending one."""
+        global _ATEXIT_REGISTERED
+        with self._lock:
+            now = time.monotonic()
+            self._last = now
+            if self._first is None:
+                self._first = now
+                _PENDING_SAVERS.add(self)
+                if not _ATEXIT_REGISTERED:
+                    atexit.register(_flush_pending_savers)
+                    _ATEXIT_REGISTERED = True
+            if self._timer is None:
+                self._arm(self.delay)
+
+    def flush(self):
+        """Run the pending save immediately, if there is one."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._first is None:
+                return
+            self._first = None
+            _PENDING_SAVERS.discard(self)
+        with self._flush_lock:
+            self.callback()
+
+    def cancel(self):
+        """Drop the pending save, if there is one, and wait for a save in
+        progress to finish."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._first = None
+            _PENDING_SAVERS.discard(self)
+        with self._flush_lock:
+            pass
+
+    def _arm(self, interval: float):
+        self._timer = threading.Timer(interval, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._first is None:
+                return
+            due = min(self._last + self.delay, self._first + self.max_delay)
+            remaining = due - time.monotonic()
+            if remaining > 0:
+                # requests kept arriving, wait for the burst to settle
+                self._arm(remaining)
+                return
+        self.flush()
 
 
 class EZInputJupyter:
@@ -41,7 +179,14 @@ class EZInputJupyter:
     >>> gui.show()
     """
 
-    def __init__(self, title="basic_gui", width="50%"):
+    def __init__(
+        self,
+        title="basic_gui",
+        width="50%",
+        save_delay: float | None = SAVE_DELAY,
+        max_save_delay: float = MAX_SAVE_DELAY,
+        storage=None,
+    ):
         """Initialize the Jupyter GUI container.
 
         Creates a new GUI instance with a widget container and loads any
@@ -53,15 +198,98 @@ class EZInputJupyter:
             The title used to identify the configuration file. Default is "basic_gui".
         width : str, optional
             The CSS width specification for the widget container. Default is "50%".
+        save_delay : float, optional
+            Quiet period in seconds after the last value change before
+            settings are written to disk. Use None or 0 to save on every
+            change. Default is `SAVE_DELAY`.
+        max_save_delay : float, optional
+            Maximum time in seconds a value change can wait before being
+            written to disk. Default is `MAX_SAVE_DELAY`.
+        storage : str or YAMLStorage, optional
+            Storage used to remember values, e.g. "yaml", "journal" or
+            "sqlite". Default is the `EZINPUT_STORAGE` environment
+            variable, or "yaml".
         """
         self.title = title
+        self._storage = storage
         self.elements = {}
-        self.cfg = self._get_config(title)
+        self.cfg = shared_config(title, self._storage)
         self.params = None
+        self.env = read_env(title)
         self._nLabels = 0
+        self._init_display(width, save_delay, max_save_delay)
+
+    def _init_display(
+        self,
+        width: str = "50%",
+        save_delay: float | None = SAVE_DELAY,
+        max_save_delay: float = MAX_SAVE_DELAY,
+    ):
+        """**@jupyter** - Internal method creating the widget container.
+
+        Also used by `EZInput` when it switches to this backend.
+
+        Parameters
+        ----------
+        width : str, optional
+            The CSS width specification for the widget container.
+        save_delay : float, optional
+            Quiet period in seconds before settings are saved.
+        max_save_delay : float, optional
+            Maximum time in seconds before settings are saved.
+        """
+        enable_colab()
         self._layout = widgets.Layout(width=width)
         self._style = {"description_width": "initial"}
         self._main_display = widgets.VBox()
+        self._overrides = {}
+        self._saver = None
+        if save_delay:
+            self._saver = DebouncedSaver(
+                self._save_settings, save_delay, max_save_delay
+            )
+
+    def _apply_override(self, tag: str):
+        """**@jupyter** - Internal method setting the value of a widget from
+        its `EZINPUT_<TITLE>_<TAG>` environment variable, if set.
+
+        The value is converted to the type of the widget and checked
+        against its range or options.
+
+        Parameters
+        ----------
+        tag : str
+            Unique identifier of the widget.
+
+        Raises
+        ------
+        ValueError
+            If the value is invalid for the widget.
+        """
+        override = find_override(tag, {}, self.env)
+        if override is None:
+            return
+        widget = self.elements[tag]
+        try:
+            value = coerce(
+                override[1],
+                widget.value,
+                options=getattr(widget, "options", None),
+                vmin=getattr(widget, "min", None),
+                vmax=getattr(widget, "max", None),
+            )
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid value of {env_name(self.title, tag)}: {e}"
+            ) from None
+        widget.value = value
+        self._overrides[tag] = override[0], value
+
+    def _is_overridden(self, tag: str) -> bool:
+        """**@jupyter** - Internal method checking whether a widget still
+        holds the value set by `_apply_override`."""
+        override = self._overrides.get(tag)
+        return override is not None and override[1] == self.elements[tag].value
 
     def __getvalue__(self, tag: str):
         """
@@ -207,6 +435,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         return self.elements[tag]
 
@@ -252,7 +481,8 @@ class EZInputJupyter:
         )
 
         def wrapped(button):
-            self._save_settings()
+            self._request_save()
+            self._flush_settings()
             func(values)
 
         self.elements[tag].on_click(wrapped)
@@ -330,6 +560,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -454,6 +685,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -578,6 +810,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -690,6 +923,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -753,6 +987,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -824,6 +1059,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -887,6 +1123,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -959,6 +1196,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -1005,6 +1243,8 @@ class EZInputJupyter:
         >>> gui.add_dropdown("color", ["red", "green", "blue"], "Color:")
         >>> gui.add_dropdown("method", ["A", "B", "C"], value="B")
         """
+        # fuzzy completion of the terminal, not needed with a real dropdown
+        kwargs.pop("fuzzy", None)
         if remember_value and tag in self.cfg and self.cfg[tag] in options:
             kwargs["value"] = self.cfg[tag]
         if self.params is not None and tag in self.params:
@@ -1018,6 +1258,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         if on_change is not None:
             self.elements[tag].observe(on_change, names="value")
@@ -1073,7 +1314,13 @@ class EZInputJupyter:
         return self.elements[tag]
 
     def add_select_multiple(
-        self, tag: str, options: list, description: str = "", *args, **kwargs
+        self,
+        tag: str,
+        options: list,
+        description: str = "",
+        *args,
+        remember_value=True,
+        **kwargs,
     ):
         """**@jupyter** - Add a multiple selection widget.
 
@@ -1088,6 +1335,9 @@ class EZInputJupyter:
             List of available options to select from.
         description : str, optional
             Label text displayed next to the selection box. Default is "".
+        remember_value : bool, optional
+            If True, remembers and restores the last selected items that
+            are still in options. Default is True.
         *args : tuple
             Additional positional arguments for ipywidgets.SelectMultiple.
         **kwargs : dict
@@ -1103,6 +1353,12 @@ class EZInputJupyter:
         >>> gui.add_select_multiple("features", ["A", "B", "C", "D"],
         ...                         "Select features:")
         """
+        if remember_value and isinstance(self.cfg.get(tag), (list, tuple)):
+            kwargs["value"] = tuple(
+                item for item in self.cfg[tag] if item in options
+            )
+        if self.params is not None and tag in self.params:
+            kwargs["value"] = tuple(self.params[tag])
         style = kwargs.pop("style", self._style)
         self.elements[tag] = widgets.SelectMultiple(
             options=options,
@@ -1112,6 +1368,7 @@ class EZInputJupyter:
             layout=self._layout,
             style=style,
         )
+        self._apply_override(tag)
 
         return self.elements[tag]
 
@@ -1158,7 +1415,7 @@ class EZInputJupyter:
             )
             self.elements[tag].reset()
 
-        self.elements[tag].register_callback(self._save_settings)
+        self.elements[tag].register_callback(self._request_save)
         if accept is not None:
             self.elements[tag].filter_pattern = accept
 
@@ -1258,14 +1515,16 @@ class EZInputJupyter:
         return self.elements[tag]
 
     def save_parameters(self, path: str):
-        """**@unified** - Save current widget values to a YAML file.
+        """**@unified** - Save current widget values to a parameter file.
 
-        Exports all widget values to a YAML file that can be loaded later.
+        Exports all widget values to a YAML, JSON, TOML or msgpack file
+        that can be loaded later.
 
         Parameters
         ----------
         path : str
-            The file path for saving parameters. If it doesn't end with '.yml',
+            The file path for saving parameters. The format is chosen from
+            the extension (.yml, .yaml, .json, .toml or .msgpack). Otherwise
             the filename will be auto-generated as '{title}_parameters.yml'.
 
         Examples
@@ -1277,17 +1536,16 @@ class EZInputJupyter:
         --------
         load_parameters : Load parameters from a file
         """
-        if not path.endswith(".yml"):
+        if not is_supported(path):
             path += f"{self.title}_parameters.yml"
         out = {}
         for tag in self.elements:
             if hasattr(self.elements[tag], "value"):
                 out[tag] = self.elements[tag].value
-        with open(path, "w") as f:
-            yaml.dump(out, f)
+        dump_file(out, path)
 
     def load_parameters(self, path: str):
-        """**@unified** - Load widget values from a YAML file.
+        """**@unified** - Load widget values from a parameter file.
 
         Loads parameters from a previously saved file. Values will be used
         as defaults when creating widgets.
@@ -1313,9 +1571,7 @@ class EZInputJupyter:
         """
         if not os.path.exists(path):
             raise FileNotFoundError(f"The file {path} does not exist.")
-        with open(path, "r") as f:
-            params = yaml.load(f, Loader=yaml.SafeLoader)
-        self.params = params
+        self.params = load_file(path)
 
     def _save_settings(self):
         """**@unified** - Internal method to save settings automatically.
@@ -1326,26 +1582,49 @@ class EZInputJupyter:
         Notes
         -----
         Configuration files are stored in `~/.ezinput/{title}.yml`.
-        Tuple values (from SelectMultiple) are excluded from saving.
+        Values that YAML can't represent natively, such as the tuples of
+        SelectMultiple, are stored with `ezinput_codec`. Widgets still
+        holding the value of their environment variable are not saved.
         """
-        for tag in self.elements:
-            if hasattr(self.elements[tag], "value"):
-                if type(self.elements[tag].value) != tuple:
-                    self.cfg[tag] = self.elements[tag].value
-        config_file = CONFIG_PATH / f"{self.title}.yml"
-        config_file.parent.mkdir(exist_ok=True)
+        self.cfg.save(
+            {
+                tag: element.value
+                for tag, element in self.elements.items()
+                if not tag.startswith("label_")
+                and hasattr(element, "value")
+                and not self._is_overridden(tag)
+            }
+        )
 
-        base_config = self._get_config(self.title)  # loads the config file
-        for key, value in self.cfg.items():
-            base_config[key] = value
+    def _request_save(self, *args):
+        """**@jupyter** - Internal method to schedule a settings save.
 
-        with open(config_file, "w") as f:
-            yaml.dump(base_config, f)
+        When write-behind saving is enabled, the save is deferred and merged
+        with other requests arriving in the same burst. Otherwise settings
+        are saved immediately.
+
+        Parameters
+        ----------
+        *args : tuple
+            Ignored. Allows use as a widget callback.
+        """
+        saver = getattr(self, "_saver", None)
+        if saver is None:
+            self._save_settings()
+        else:
+            saver.request()
+
+    def _flush_settings(self):
+        """**@jupyter** - Internal method to write any pending settings now."""
+        saver = getattr(self, "_saver", None)
+        if saver is not None:
+            saver.flush()
 
     def _on_value_change(self, change):
         """**@jupyter** - Internal callback for automatic settings persistence.
 
-        Automatically saves settings whenever a widget value changes.
+        Schedules a settings save whenever a widget value changes. Bursts of
+        changes, such as dragging a slider, are written once.
         This method is called internally and should not be called directly.
 
         Parameters
@@ -1353,7 +1632,7 @@ class EZInputJupyter:
         change : dict
             The change event dictionary from ipywidgets.
         """
-        self._save_settings()
+        self._request_save()
 
     def show(self):
         """**@unified** - Display all widgets in the Jupyter notebook.
@@ -1375,10 +1654,15 @@ class EZInputJupyter:
         """
         for tag in self.elements:
             self.elements[tag].observe(self._on_value_change, names="value")
+        self.cfg.touch(self.elements)
         self._main_display.children = tuple(self.elements.values())
         clear_output()
         display(self._main_display)
 
+    async def show_async(self):
+        """**@unified** - Same as `show`, which does not wait for input."""
+        self.show()
+
     def clear_elements(self):
         """**@unified** - Clear all widgets from the container.
 
@@ -1412,23 +1696,25 @@ class EZInputJupyter:
         if title is None:
             title = self.title
 
-        config_file = CONFIG_PATH / f"{title}.yml"
-
-        if not config_file.exists():
-            return {}
+        return get_config(title, self._storage)
 
-        with open(config_file, "r") as f:
-            return yaml.load(f, Loader=yaml.SafeLoader)
-
-    def get_values(self) -> dict:
+    def get_values(self, with_sources: bool = False) -> dict:
         """**@unified** - Get current values of all widgets.
 
         Returns a dictionary of all widget values, excluding label widgets.
 
+        Parameters
+        ----------
+        with_sources : bool, optional
+            If True, each value is given with its source: "env" while it is
+            the value of an environment variable, else "widget". Default is
+            False.
+
         Returns
         -------
         dict
-            Dictionary mapping widget tags to their current values.
+            Dictionary mapping widget tags to their current values, or to
+            (value, source) tuples.
             Label widgets (starting with 'label_') are excluded.
 
         Examples
@@ -1443,6 +1729,11 @@ class EZInputJupyter:
                 pass
             elif hasattr(self.elements[tag], "value"):
                 out[tag] = self.elements[tag].value
+                if with_sources:
+                    source = "widget"
+                    if self._is_overridden(tag):
+                        source = self._overrides[tag][0]
+                    out[tag] = (out[tag], source)
         return out
 
     def restore_defaults(self):
@@ -1450,15 +1741,50 @@ class EZInputJupyter:
 
         Deletes the memory file, restoring the values to the defaults setup by the developer.
         Requires rerunning the GUI to take effect. Does not affect saved configuration files.
+        Large values stored in blob files no longer used by any GUI are deleted.
 
         Examples
         --------
         >>> gui.restore_defaults()
         """
-        config_file = CONFIG_PATH / f"{self.title}.yml"
-        if config_file.exists():
-            try:
-                os.remove(config_file)
-            except OSError as e:
-                print(f"Failed to remove {config_file}: {e}")
-        self.cfg = {}
+        saver = getattr(self, "_saver", None)
+        if saver is not None:
+            # a pending save would write the values back after the delete
+            saver.cancel()
+        blobs = config_blobs(self.title, self._storage)
+        delete_config(self.title, self._storage)
+        collect_blobs(self._storage, names=blobs)
+
+    def compact_config(self, days: float | None = None):
+        """**@unified** - Drop stale tags from the memory file.
+
+        Removes the remembered values of tags that are not widgets of this
+        GUI, such as renamed or removed widgets, and of tags not used for
+        `days` days. Large values stored in blob files no longer used by any
+        GUI are deleted.
+
+        Parameters
+        ----------
+        days : float, optional
+            Also drop the tags not used for this many days. Default is None.
+
+        Returns
+        -------
+        CompactInfo
+            Named tuple with the `dropped` tags and the number of bytes
+            `reclaimed`.
+
+        Examples
+        --------
+        >>> gui.compact_config()
+        CompactInfo(dropped=['old_name'], reclaimed=24)
+        """
+        blobs = config_blobs(self.title, self._storage)
+        info = compact_config(
+            self.title,
+            keep=self.elements,
+            days=days,
+            storage=self._storage,
+        )
+        collect_blobs(self._storage, names=blobs)
+        return info
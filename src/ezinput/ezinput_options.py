@@ -0,0 +1,164 @@
+import heapq
+from bisect import bisect_left
+
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+
+"""
+A module to complete dropdown options in the terminal without scanning the
+whole list on every keystroke.
+
+`OptionIndex` keeps the options sorted, case-insensitively, so the options
+starting with the typed text are found by bisection, and a set of them to
+validate answers. Fuzzy matching, i.e. the typed characters appearing in
+order anywhere in an option, only scans the options containing the rarest
+typed character, or the matches of the previous keystroke while typing, and
+keeps the best `limit` matches.
+"""
+
+COMPLETION_LIMIT = 100
+
+# sorts after every other character, to find the end of a prefix range
+_LAST = chr(0x10FFFF)
+
+
+class OptionIndex:
+    """Index of the options of a dropdown.
+
+    Parameters
+    ----------
+    options : list
+        The options, completed as strings.
+    """
+
+    def __init__(self, options: list):
+        self.options = [str(option) for option in options]
+        try:
+            self.choices = frozenset(options)
+        except TypeError:
+            self.choices = list(options)
+        keyed = sorted(
+            (option.casefold(), i) for i, option in enumerate(self.options)
+        )
+        self._keys = [key for key, _ in keyed]
+        self._ids = [i for _, i in keyed]
+        self._postings = None
+        # the last fuzzy search, refined while the text is typed
+        self._last = ("", None)
+
+    def __contains__(self, value) -> bool:
+        return value in self.choices
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def prefix(self, text: str, limit: int = COMPLETION_LIMIT) -> list:
+        """Find the options starting with a text, ignoring case.
+
+        Parameters
+        ----------
+        text : str
+            The start of the options.
+        limit : int, optional
+            Maximum number of options returned.
+
+        Returns
+        -------
+        list of int
+            Positions of the options in the list, in list order when there
+            are no more than `limit` of them.
+        """
+        if not text:
+            return list(range(min(limit, len(self.options))))
+        key = text.casefold()
+        start = bisect_left(self._keys, key)
+        stop = bisect_left(self._keys, key + _LAST, start)
+        return sorted(self._ids[start : min(stop, start + limit)])
+
+    def _get_postings(self) -> dict:
+        if self._postings is None:
+            postings = {}
+            for i, key in enumerate(self._keys):
+                for char in set(key):
+                    postings.setdefault(char, []).append(self._ids[i])
+            self._postings = postings
+        return self._postings
+
+    def fuzzy(self, text: str, limit: int = COMPLETION_LIMIT, exclude=()):
+        """Find the options containing the characters of a text in order,
+        ignoring case.
+
+        Parameters
+        ----------
+        text : str
+            The characters to look for.
+        limit : int, optional
+            Maximum number of options returned.
+        exclude : collection of int, optional
+            Positions of options to leave out, e.g. the prefix matches.
+
+        Returns
+        -------
+        list of int
+            Positions of the best `limit` options in the list, the tightest
+            and earliest matches first.
+        """
+        key = text.casefold()
+        if not key or limit <= 0:
+            return []
+        last_key, last_ids = self._last
+        if last_ids is not None and key.startswith(last_key):
+            # options matching the text also match its start
+            candidates = last_ids
+        else:
+            postings = self._get_postings()
+            candidates = min(
+                (postings.get(char, ()) for char in set(key)), key=len
+            )
+        scores = []
+        for i in candidates:
+            option = self.options[i].casefold()
+            start = position = option.find(key[0])
+            for char in key[1:]:
+                position = option.find(char, position + 1)
+                if position < 0:
+                    break
+            else:
+                scores.append((position - start, start, len(option), i))
+        self._last = (key, [score[-1] for score in scores])
+        scores = (score for score in scores if score[-1] not in exclude)
+        return [score[-1] for score in heapq.nsmallest(limit, scores)]
+
+
+class IndexedCompleter(Completer):
+    """Completer of the options of an `OptionIndex`, replacing the whole
+    text typed so far.
+
+    Parameters
+    ----------
+    index : OptionIndex
+        The options.
+    fuzzy : bool, optional
+        Whether to also complete the options containing the typed
+        characters in order, after the options starting with them. Default
+        is False.
+    limit : int, optional
+        Maximum number of completions. Default is `COMPLETION_LIMIT`.
+    """
+
+    def __init__(self, index: OptionIndex, fuzzy=False, limit=None):
+        self.index = index
+        self.fuzzy = fuzzy
+        self.limit = COMPLETION_LIMIT if limit is None else limit
+
+    def get_completions(
+        self, document: Document, complete_event: CompleteEvent
+    ):
+        text = document.text_before_cursor
+        ids = self.index.prefix(text, self.limit)
+        if self.fuzzy and text and len(ids) < self.limit:
+            ids += self.index.fuzzy(
+                text, self.limit - len(ids), exclude=set(ids)
+            )
+        for i in ids:
+            yield Completion(self.index.options[i], start_position=-len(text))
@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+from prompt_toolkit.completion import (
+    CompleteEvent,
+    Completer,
+    Completion,
+    ThreadedCompleter,
+)
+from prompt_toolkit.document import Document
+from prompt_toolkit.validation import ValidationError, Validator
+
+"""
+A module to complete and validate paths in the terminal without hitting the
+filesystem on every keystroke.
+
+Directory listings are cached for `PATH_CACHE_TTL` seconds and listed in a
+thread by the completer, so that completing in folders of many thousands of
+files on network shares doesn't freeze the prompt. The validator, which runs
+while typing, answers from the cached listings when it can and memoizes the
+other existence checks for the same time.
+"""
+
+PATH_CACHE_TTL = 5.0
+MAX_ENTRIES = 4096
+
+
+def accept_patterns(accept) -> tuple:
+    """Get the glob patterns of an `accept` filter, e.g. "*.csv",
+    "*.tif;*.tiff" or a list of patterns."""
+    if accept is None:
+        return ()
+    if isinstance(accept, str):
+        accept = accept.replace(",", ";").split(";")
+    return tuple(pattern.strip() for pattern in accept if pattern.strip())
+
+
+def matches(path, accept) -> bool:
+    """Check if the file name of a path matches an `accept` filter."""
+    patterns = accept_patterns(accept)
+    name = Path(path).name
+    return not patterns or any(fnmatch(name, p) for p in patterns)
+
+
+class DirectoryCache:
+    """Directory listings and existence checks cached for a time.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Seconds the results are reused for. Default is `PATH_CACHE_TTL`.
+    """
+
+    def __init__(self, ttl: float = PATH_CACHE_TTL):
+        self.ttl = ttl
+        self._listings = {}
+        self._exists = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cache: dict, key):
+        with self._lock:
+            entry = cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def _put(self, cache: dict, key, value):
+        now = time.monotonic()
+        with self._lock:
+            if len(cache) >= MAX_ENTRIES:
+                # drop the expired results, or the oldest half
+                ttl = self.ttl
+                expired = [k for k, v in cache.items() if now - v[0] >= ttl]
+                for k in expired or list(cache)[: MAX_ENTRIES // 2]:
+                    del cache[k]
+            cache[key] = (now, value)
+
+    def listdir(self, directory: str) -> dict:
+        """List a directory.
+
+        Parameters
+        ----------
+        directory : str
+            The directory.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping the names of the entries to whether they are
+            directories, empty if the directory can't be listed.
+        """
+        entries = self._get(self._listings, directory)
+        if entries is None:
+            entries = {}
+            try:
+                with os.scandir(directory or ".") as it:
+                    for entry in it:
+                        try:
+                            entries[entry.name] = entry.is_dir()
+                        except OSError:
+                            entries[entry.name] = False
+            except OSError:
+                pass
+            self._put(self._listings, directory, entries)
+        return entries
+
+    def exists(self, path) -> bool:
+        """Check if a path exists, like `Path(path).exists()`.
+
+        The cached listing of its directory is used when there is one, so
+        that checking the path typed in a prompt doesn't access the
+        filesystem once its directory was listed for completion.
+        """
+        path = Path(path)
+        if path.name not in ("", ".", ".."):
+            entries = self._get(self._listings, str(path.parent))
+            if entries is not None:
+                return path.name in entries
+        key = str(path)
+        exists = self._get(self._exists, key)
+        if exists is None:
+            exists = path.exists()
+            self._put(self._exists, key, exists)
+        return exists
+
+    def clear(self):
+        """Forget all cached results."""
+        with self._lock:
+            self._listings.clear()
+            self._exists.clear()
+
+
+PATH_CACHE = DirectoryCache()
+
+
+class CachedPathCompleter(Completer):
+    """Completer of paths listing directories through a `DirectoryCache`.
+
+    Parameters
+    ----------
+    accept : str or list of str, optional
+        Glob patterns of the files to complete, e.g. "*.csv". Directories
+        are always completed. Default is all files.
+    cache : DirectoryCache, optional
+        The cache of listings. Default is `PATH_CACHE`.
+    expanduser : bool, optional
+        Whether to expand "~" to the home directory. Default is False.
+    """
+
+    def __init__(self, accept=None, cache=None, expanduser=False):
+        self.patterns = accept_patterns(accept)
+        self.cache = PATH_CACHE if cache is None else cache
+        self.expanduser = expanduser
+
+    def get_completions(
+        self, document: Document, complete_event: CompleteEvent
+    ):
+        text = document.text_before_cursor
+        if self.expanduser:
+            text = os.path.expanduser(text)
+        directory, prefix = os.path.split(text)
+        entries = self.cache.listdir(directory or ".")
+        for name in sorted(entries):
+            if not name.startswith(prefix):
+                continue
+            is_dir = entries[name]
+            if (
+                not is_dir
+                and self.patterns
+                and not any(fnmatch(name, p) for p in self.patterns)
+            ):
+                continue
+            yield Completion(
+                text=name[len(prefix) :],
+                start_position=0,
+                display=name + "/" if is_dir else name,
+            )
+
+
+class PathValidator(Validator):
+    """Validator of existing paths, optionally matching an `accept` filter.
+
+    Parameters
+    ----------
+    accept : str or list of str, optional
+        Glob patterns the file name must match, e.g. "*.csv". Default is
+        any name.
+    cache : DirectoryCache, optional
+        The cache of existence checks. Default is `PATH_CACHE`.
+    """
+
+    def __init__(self, accept=None, cache=None):
+        self.patterns = accept_patterns(accept)
+        self.cache = PATH_CACHE if cache is None else cache
+
+    def validate(self, document: Document):
+        text = document.text
+        if not self.cache.exists(text):
+            raise ValidationError(
+                message="Please enter a valid path.",
+                cursor_position=len(text),
+            )
+        if self.patterns and not matches(text, self.patterns):
+            raise ValidationError(
+                message="Please enter a path matching "
+                f"{', '.join(self.patterns)}.",
+                cursor_position=len(text),
+            )
+
+
+def path_completer(accept=None) -> Completer:
+    """Get a completer of paths listing directories in a thread."""
+    return ThreadedCompleter(CachedPathCompleter(accept))
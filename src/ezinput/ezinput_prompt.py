@@ -1,34 +1,173 @@
+from __future__ import annotations
+
 import os
-import yaml
-from prompt_toolkit import prompt
-from prompt_toolkit.completion import WordCompleter, PathCompleter
-from prompt_toolkit.validation import Validator, ValidationError
+import re
+from functools import lru_cache
 from pathlib import Path
-
 from typing import Optional
 
+from prompt_toolkit import PromptSession
+from prompt_toolkit.completion import WordCompleter
+from prompt_toolkit.document import Document
+from prompt_toolkit.history import DummyHistory
+from prompt_toolkit.validation import ValidationError, Validator
+
+from .ezinput_cli import env_name, find_override, read_env
+from .ezinput_config import (
+    collect_blobs,
+    compact_config,
+    config_blobs,
+    delete_config,
+    get_config,
+    shared_config,
+)
+from .ezinput_form import FormField, run_form, run_form_async
+from .ezinput_headless import Element
+from .ezinput_options import IndexedCompleter, OptionIndex
+from .ezinput_paths import PathValidator, accept_patterns, path_completer
+from .ezinput_serializers import dump_file, is_supported, load_file
+
 """
 A module to help simplify the create of GUIs in terminals using python prompt-toolkit.
 """
 
+# completers and validators are stateless, they are shared by all fields
+# with the same options or range instead of being rebuilt for each field
+_YES_NO_COMPLETER = WordCompleter(["yes", "no"])
+_YES_NO_VALIDATOR = Validator.from_callable(
+    lambda x: x in ["yes", "no"],
+    error_message="Please enter 'yes' or 'no'.",
+    move_cursor_to_end=True,
+)
+_INT_VALIDATOR = Validator.from_callable(
+    lambda x: x.isdigit(),
+    error_message="Please enter a valid number.",
+    move_cursor_to_end=True,
+)
+_FLOAT_VALIDATOR = Validator.from_callable(
+    lambda x: x.replace(".", "", 1).isdigit(),
+    error_message="Please enter a valid number.",
+    move_cursor_to_end=True,
+)
+
+
+@lru_cache(maxsize=256, typed=True)
+def _range_validator(cast, vmin, vmax) -> Validator:
+    """Get a validator of numbers of type `cast` within [vmin, vmax]."""
+    if cast is int:
+        digits = str.isdigit
+    else:
+        digits = lambda x: x.replace(".", "", 1).isdigit()
+    return Validator.from_callable(
+        lambda x: x.strip() != "" and digits(x) and vmin <= cast(x) <= vmax,
+        error_message=f"Please enter a valid number ({vmin}-{vmax}).",
+        move_cursor_to_end=True,
+    )
+
+
+def _cached(function):
+    """Cache a function of a list of options by their content, falling
+    back to calling it for options that can't be hashed."""
+    cached = lru_cache(maxsize=256)(lambda options: function(list(options)))
+
+    def wrapper(options):
+        try:
+            return cached(tuple(options))
+        except TypeError:
+            return function(options)
+
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+@lru_cache(maxsize=64)
+def _path_widgets(patterns: tuple) -> tuple:
+    """Get the completer and validator of paths matching glob patterns."""
+    return path_completer(patterns), PathValidator(patterns)
+
+
+@_cached
+def _option_index(options: list) -> OptionIndex:
+    """Get the index of the options of a dropdown, built once per list."""
+    return OptionIndex(options)
+
+
+@lru_cache(maxsize=256)
+def _index_completer(index: OptionIndex, fuzzy: bool) -> IndexedCompleter:
+    return IndexedCompleter(index, fuzzy=fuzzy)
+
+
+@lru_cache(maxsize=256)
+def _index_validator(index: OptionIndex) -> Validator:
+    return Validator.from_callable(
+        index.__contains__,
+        error_message="Please select a valid choice from the dropdown.",
+        move_cursor_to_end=True,
+    )
+
+
+def _choice_completer(options: list, fuzzy: bool = False):
+    """Get a completer of the options of a dropdown."""
+    return _index_completer(_option_index(options), fuzzy)
+
+
+def _choice_validator(options: list) -> Validator:
+    """Get a validator of the options of a dropdown."""
+    return _index_validator(_option_index(options))
+
+
+def _is_yes(value: str) -> bool:
+    return value.lower() == "yes"
+
+
+def _print_label(value: str):
+    print("-" * len(value))
+    print(value)
+    print("-" * len(value))
+
+
+def _parse_selection(text: str, count: int) -> set:
+    """Parse the numbers of the fields to change in express mode, e.g.
+    "2, 5-7", raising ValueError if any is not between 1 and `count`."""
+    selected = set()
+    for token in re.split(r"[,\s]+", text.strip()):
+        if not token:
+            continue
+        first, _, last = token.partition("-")
+        first = int(first)
+        last = int(last) if last else first
+        if not 1 <= first <= last <= count:
+            raise ValueError(f"{token} is not between 1 and {count}")
+        selected.update(range(first, last + 1))
+    return selected
+
+
+@lru_cache(maxsize=64)
+def _selection_validator(count: int) -> Validator:
+    def is_valid(text):
+        try:
+            _parse_selection(text, count)
+        except ValueError:
+            return False
+        return True
 
-CONFIG_PATH = Path.home() / ".ezinput"
-
-if not os.path.exists(CONFIG_PATH):
-    os.makedirs(CONFIG_PATH)
-
+    return Validator.from_callable(
+        is_valid,
+        error_message=f"Please enter numbers from 1 to {count}, e.g. 2,5-7.",
+        move_cursor_to_end=True,
+    )
 
-class Element:
-    """A simple wrapper class for widget values.
-
-    Parameters
-    ----------
-    value : Any
-        The value to store in the element.
-    """
 
-    def __init__(self, value):
-        self.value = value
+def _prompt_kwargs(field: FormField) -> dict:
+    """Get the prompt arguments of a field waiting to be asked."""
+    kwargs = {
+        "message": field.message,
+        "default": field.default,
+        "completer": field.completer,
+        "validator": field.validator,
+    }
+    # None would keep the completer or validator of the previous field
+    return {name: value for name, value in kwargs.items() if value is not None}
 
 
 class EZInputPrompt:
@@ -52,7 +191,14 @@ class EZInputPrompt:
     >>> gui.show()
     """
 
-    def __init__(self, title: str):
+    def __init__(
+        self,
+        title: str,
+        storage=None,
+        form: bool = False,
+        async_mode: bool = False,
+        express: bool = False,
+    ):
         """Initialize the terminal-based GUI.
 
         Creates a new GUI instance and loads any previously saved settings
@@ -62,12 +208,44 @@ class EZInputPrompt:
         ----------
         title : str
             Title of the GUI, used to identify the configuration file.
+        storage : str or YAMLStorage, optional
+            Storage used to remember values, e.g. "yaml", "journal" or
+            "sqlite". Default is the `EZINPUT_STORAGE` environment
+            variable, or "yaml".
+        form : bool, optional
+            If True, widgets are not prompted for when added, but all
+            together in one full-screen form by `show`. Default is False.
+        async_mode : bool, optional
+            If True, widgets are not prompted for when added, but by
+            `await show_async()`, which lets the other tasks of the event
+            loop run while waiting for answers. Default is False.
+        express : bool, optional
+            If True, widgets are not prompted for when added, but `show`
+            lists all their values at once, to accept them with a single
+            Enter or choose the few to change. Default is False.
         """
         self.title = title
+        self._storage = storage
         self.elements = {}
-        self.cfg = self._get_config(title)
+        self.cfg = shared_config(title, self._storage)
         self.params = None
+        self.cli = {}
+        self.env = read_env(title)
+        self._sources = {}
         self._nLabels = 0
+        self.form = form
+        self.async_mode = async_mode
+        self.express = express
+        self._init_prompt()
+
+    def _init_prompt(self):
+        """Internal method initializing the widgets waiting to be asked by
+        `show` when `form`, `async_mode` or `express` is set: the rows,
+        the converters of its fields from text and the callbacks run once
+        it is submitted."""
+        self._form = []
+        self._converters = {}
+        self._callbacks = []
 
     def __getvalue__(self, tag: str):
         """
@@ -86,6 +264,169 @@ class EZInputPrompt:
         """
         return self.elements[tag].value
 
+    @property
+    def _deferred(self) -> bool:
+        """Whether widgets are asked by `show` instead of when added."""
+        return self.form or self.async_mode or self.express
+
+    def _get_session(self, kwargs: dict) -> PromptSession:
+        """Internal method getting the session of the GUI for a prompt.
+
+        The `PromptSession`, with its layout, key bindings and renderer, is
+        created once for the GUI. Each field only sets its message, default,
+        completer and validator, and the settings a previous field changed
+        are restored first.
+
+        Parameters
+        ----------
+        kwargs : dict
+            Keyword arguments of the prompt.
+
+        Returns
+        -------
+        PromptSession
+            The session.
+        """
+        session = getattr(self, "_session", None)
+        if session is None:
+            # answers of other fields are not offered as history
+            session = self._session = PromptSession(history=DummyHistory())
+            self._session_defaults = {}
+        defaults = self._session_defaults
+        for name, value in defaults.items():
+            if name not in kwargs:
+                setattr(session, name, value)
+        for name in kwargs:
+            if name not in defaults and hasattr(session, name):
+                defaults[name] = getattr(session, name)
+        return session
+
+    def _prompt(self, *args, **kwargs) -> str:
+        """Internal method prompting with the session of the GUI.
+
+        Parameters
+        ----------
+        *args : tuple
+            Positional arguments for `PromptSession.prompt`.
+        **kwargs : dict
+            Keyword arguments for `PromptSession.prompt`.
+
+        Returns
+        -------
+        str
+            The answer.
+        """
+        return self._get_session(kwargs).prompt(*args, **kwargs)
+
+    async def _prompt_async(self, *args, **kwargs) -> str:
+        """Internal method prompting with the session of the GUI without
+        blocking the event loop, see `_prompt`."""
+        session = self._get_session(kwargs)
+        return await session.prompt_async(*args, **kwargs)
+
+    def _field(
+        self, tag: str, convert, *args, flag: bool = False, **kwargs
+    ) -> Element:
+        """Internal method adding a widget answered by prompting.
+
+        Parameters
+        ----------
+        tag : str
+            Unique identifier of the widget.
+        convert : callable
+            Converter of the answer, validated as text, to the value.
+        *args : tuple
+            Positional arguments for `PromptSession.prompt`.
+        flag : bool, optional
+            Whether the widget is a yes/no command-line flag, see
+            `find_override`. Default is False.
+        **kwargs : dict
+            Keyword arguments for `PromptSession.prompt`.
+
+        Returns
+        -------
+        Element
+            The element of the widget. In form or async mode, its value is
+            the default until it is answered in `show`, or None if there is
+            no valid default.
+        """
+        override = find_override(tag, self.cli, self.env, flag)
+        if self._deferred and override is None:
+            default = str(kwargs.get("default", ""))
+            validator = kwargs.get("validator")
+            try:
+                if validator is not None:
+                    validator.validate(Document(default))
+                value = convert(default)
+            except (ValidationError, ValueError):
+                value = None
+            self._form.append(
+                FormField(
+                    tag,
+                    kwargs.get("message", ""),
+                    default,
+                    kwargs.get("completer"),
+                    validator,
+                )
+            )
+            self._converters[tag] = convert
+            self.elements[tag] = Element(value)
+            return self.elements[tag]
+        value = convert(self._ask(tag, *args, flag=flag, **kwargs))
+        if override is None:
+            # command-line and environment values are not remembered
+            self.cfg[tag] = value
+        self.elements[tag] = Element(value)
+        return self.elements[tag]
+
+    def _ask(self, tag: str, *args, flag: bool = False, **kwargs) -> str:
+        """Internal method prompting for the value of a widget, unless it
+        was given on the command line or by an environment variable.
+
+        Parameters
+        ----------
+        tag : str
+            Unique identifier of the widget.
+        *args : tuple
+            Positional arguments for `prompt_toolkit.prompt`.
+        flag : bool, optional
+            Whether the widget is a yes/no command-line flag. Default is
+            False.
+        **kwargs : dict
+            Keyword arguments for `prompt_toolkit.prompt`.
+
+        Returns
+        -------
+        str
+            The answer, or the overriding value.
+
+        Raises
+        ------
+        ValueError
+            If the overriding value is rejected by the validator.
+        """
+        override = find_override(tag, self.cli, self.env, flag)
+        if override is None:
+            self._sources[tag] = "prompt"
+            return self._prompt(*args, **kwargs)
+        source, value = override
+        if isinstance(value, bool):
+            value = "yes" if value else "no"
+        validator = kwargs.get("validator")
+        if validator is not None:
+            try:
+                validator.validate(Document(value))
+            except ValidationError as e:
+                if source == "command-line":
+                    name = f"--{tag}"
+                else:
+                    name = env_name(self.title, tag)
+                raise ValueError(
+                    f"Invalid value of {name}: {e.message}"
+                ) from None
+        self._sources[tag] = source
+        return value
+
     def add_label(self, tag: Optional[str] = None, value: str = ""):
         """**@unified** - Add a label/header to the GUI.
 
@@ -109,11 +450,11 @@ class EZInputPrompt:
         self._nLabels += 1
         if tag is None:
             tag = f"label_{self._nLabels}"
-        self.cfg[tag] = value
-        self.elements[tag] = Element(self.cfg[tag])
-        print("-" * len(value))
-        print(value)
-        print("-" * len(value))
+        self.elements[tag] = Element(value)
+        if self._deferred:
+            self._form.append(value)
+            return
+        _print_label(value)
 
     def add_text(
         self,
@@ -166,10 +507,9 @@ class EZInputPrompt:
             kwargs["default"] = self.cfg[tag]
         if self.params is not None and tag in self.params:
             kwargs["default"] = self.params[tag]
-        value = prompt(message=description + ": ", *args, **kwargs)  # type: ignore[misc]
-        self.cfg[tag] = value
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
+        return self._field(
+            tag, str, *args, message=description + ": ", **kwargs
+        )
 
     def add_callback(
         self, tag, func, values: dict, description="Run", *args, **kwargs
@@ -199,7 +539,13 @@ class EZInputPrompt:
         >>> def process(values):
         ...     print(f"Processing {values}")
         >>> gui.add_callback("run", process, gui.get_values())
+
+        In form or async mode, the function is run by `show` once the
+        widgets are answered, with the answers in `values`.
         """
+        if self._deferred and self._converters:
+            self._callbacks.append((func, values))
+            return
         self._save_settings()
         func(values)
 
@@ -254,10 +600,9 @@ class EZInputPrompt:
             kwargs["default"] = self.cfg[tag]
         if self.params is not None and tag in self.params:
             kwargs["default"] = str(self.params[tag])
-        value = prompt(message=description + ": ", *args, **kwargs)  # type: ignore[misc]
-        self.cfg[tag] = value
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
+        return self._field(
+            tag, str, *args, message=description + ": ", **kwargs
+        )
 
     def add_float_range(
         self,
@@ -289,6 +634,8 @@ class EZInputPrompt:
             Default is True.
         default : float, optional
             Default value to show (passed via kwargs).
+        value : float, optional
+            Initial value, same as `default` (passed via kwargs).
         *args : tuple
             Additional positional arguments for `prompt_toolkit.prompt`.
         **kwargs : dict
@@ -309,7 +656,9 @@ class EZInputPrompt:
         add_int_range : Integer range input
         add_bounded_float_text : Alternative float range input
         """
-        if "default" in kwargs and isinstance(kwargs["default"], int):
+        if "value" in kwargs:
+            kwargs["default"] = kwargs.pop("value")
+        if "default" in kwargs and not isinstance(kwargs["default"], str):
             kwargs["default"] = str(kwargs["default"])
 
         if self.params is not None:
@@ -318,21 +667,14 @@ class EZInputPrompt:
         elif remember_value and tag in self.cfg:
             kwargs["default"] = str(self.cfg[tag])
 
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            float,
             *args,
             message=description + f" ({vmin}-{vmax}): ",
-            validator=Validator.from_callable(
-                lambda x: x.strip() != ""
-                and x.replace(".", "", 1).isdigit()
-                and vmin <= float(x) <= vmax,
-                error_message=f"Please enter a valid number ({vmin}-{vmax}).",
-                move_cursor_to_end=True,
-            ),
+            validator=_range_validator(float, vmin, vmax),
             **kwargs,
         )
-        self.cfg[tag] = float(value)
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_int_range(
         self,
@@ -364,6 +706,8 @@ class EZInputPrompt:
             Default is True.
         default : int, optional
             Default value to show (passed via kwargs).
+        value : int, optional
+            Initial value, same as `default` (passed via kwargs).
         *args : tuple
             Additional positional arguments for `prompt_toolkit.prompt`.
         **kwargs : dict
@@ -384,7 +728,9 @@ class EZInputPrompt:
         add_float_range : Float range input
         add_bounded_int_text : Alternative integer range input
         """
-        if "default" in kwargs and isinstance(kwargs["default"], int):
+        if "value" in kwargs:
+            kwargs["default"] = kwargs.pop("value")
+        if "default" in kwargs and not isinstance(kwargs["default"], str):
             kwargs["default"] = str(kwargs["default"])
 
         if self.params is not None:
@@ -393,21 +739,14 @@ class EZInputPrompt:
         elif remember_value and tag in self.cfg:
             kwargs["default"] = str(self.cfg[tag])
 
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            int,
             *args,
             message=description + f" ({vmin}-{vmax}): ",
-            validator=Validator.from_callable(
-                lambda x: x.strip() != ""
-                and x.isdigit()
-                and vmin <= int(x) <= vmax,
-                error_message=f"Please enter a valid number ({vmin}-{vmax}).",
-                move_cursor_to_end=True,
-            ),
+            validator=_range_validator(int, vmin, vmax),
             **kwargs,
         )
-        self.cfg[tag] = int(value)
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_check(
         self,
@@ -468,20 +807,16 @@ class EZInputPrompt:
             else:
                 kwargs["default"] = "no"
 
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            _is_yes,
             *args,
             message=description + " (yes/no): ",
-            completer=WordCompleter(["yes", "no"]),
-            validator=Validator.from_callable(
-                lambda x: x in ["yes", "no"],
-                error_message="Please enter 'yes' or 'no'.",
-                move_cursor_to_end=True,
-            ),
+            completer=_YES_NO_COMPLETER,
+            validator=_YES_NO_VALIDATOR,
+            flag=True,
             **kwargs,
         )
-        self.cfg[tag] = value.lower() == "yes"
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_int_text(
         self,
@@ -538,19 +873,14 @@ class EZInputPrompt:
             kwargs["default"] = str(self.cfg[tag])
         if self.params is not None and tag in self.params:
             kwargs["default"] = str(self.params[tag])
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            int,
             *args,
             message=description + ": ",
-            validator=Validator.from_callable(
-                lambda x: x.isdigit(),
-                error_message="Please enter a valid number.",
-                move_cursor_to_end=True,
-            ),
+            validator=_INT_VALIDATOR,
             **kwargs,
         )
-        self.cfg[tag] = int(value)
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_bounded_int_text(
         self,
@@ -609,21 +939,14 @@ class EZInputPrompt:
         if self.params is not None and tag in self.params:
             kwargs["default"] = str(self.params[tag])
 
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            int,
             *args,
             message=description + f" ({vmin}-{vmax}): ",
-            validator=Validator.from_callable(
-                lambda x: x.strip() != ""
-                and x.isdigit()
-                and vmin <= int(x) <= vmax,
-                error_message=f"Please enter a valid number ({vmin}-{vmax}).",
-                move_cursor_to_end=True,
-            ),
+            validator=_range_validator(int, vmin, vmax),
             **kwargs,
         )
-        self.cfg[tag] = int(value)
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_float_text(
         self,
@@ -680,19 +1003,14 @@ class EZInputPrompt:
             kwargs["default"] = str(self.cfg[tag])
         if self.params is not None and tag in self.params:
             kwargs["default"] = str(self.params[tag])
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            float,
             *args,
             message=description + ": ",
-            validator=Validator.from_callable(
-                lambda x: x.replace(".", "", 1).isdigit(),
-                error_message="Please enter a valid number.",
-                move_cursor_to_end=True,
-            ),
+            validator=_FLOAT_VALIDATOR,
             **kwargs,
         )
-        self.cfg[tag] = float(value)
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_bounded_float_text(
         self,
@@ -751,21 +1069,14 @@ class EZInputPrompt:
         if self.params is not None and tag in self.params:
             kwargs["default"] = str(self.params[tag])
 
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            float,
             *args,
             message=description + f" ({vmin}-{vmax}): ",
-            validator=Validator.from_callable(
-                lambda x: x.strip() != ""
-                and x.replace(".", "", 1).isdigit()
-                and vmin <= float(x) <= vmax,
-                error_message=f"Please enter a valid number ({vmin}-{vmax}).",
-                move_cursor_to_end=True,
-            ),
+            validator=_range_validator(float, vmin, vmax),
             **kwargs,
         )
-        self.cfg[tag] = float(value)
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_dropdown(
         self,
@@ -774,12 +1085,15 @@ class EZInputPrompt:
         description: str = "",
         *args,
         remember_value=True,
+        fuzzy=False,
         **kwargs,
     ) -> str:
         """**@unified** - Add a dropdown selection prompt to the GUI.
 
         Prompts the user to select one option from a list. Features
         autocomplete and validates that the input matches one of the options.
+        The options are indexed once per list, see `ezinput_options`, so that
+        lists of many thousands of options complete without lag.
 
         Parameters
         ----------
@@ -792,6 +1106,10 @@ class EZInputPrompt:
         remember_value : bool, optional
             If True, remembers and restores the last selected value.
             Default is True.
+        fuzzy : bool, optional
+            If True, also completes the options containing the typed
+            characters in order, e.g. "s12" completes "sample_0012", after
+            the options starting with them. Default is False.
         value : str, optional
             Initial selected value (passed via kwargs).
         *args : tuple
@@ -820,28 +1138,31 @@ class EZInputPrompt:
         if self.params is not None and tag in self.params:
             kwargs["default"] = self.params[tag]
 
-        value = prompt(  # type: ignore[misc]
+        return self._field(
+            tag,
+            str,
             *args,
             message=description + ": ",
-            completer=WordCompleter(options),
-            validator=Validator.from_callable(
-                lambda x: x in options,
-                error_message="Please select a valid choice from the dropdown.",
-                move_cursor_to_end=True,
-            ),
+            completer=_choice_completer(options, fuzzy),
+            validator=_choice_validator(options),
             **kwargs,
         )
-        self.cfg[tag] = value
-        self.elements[tag] = Element(self.cfg[tag])
-        return self.elements[tag]
 
     def add_path_completer(
-        self, tag: str, description: str, *args, remember_value=True, **kwargs
+        self,
+        tag: str,
+        description: str,
+        *args,
+        accept=None,
+        remember_value=True,
+        **kwargs,
     ) -> Path:
         """**@prompt** - Add a file path input with autocomplete.
 
         Prompts the user for a file or directory path with autocomplete support.
         Validates that the entered path exists on the filesystem.
+        Directory listings and existence checks are cached for a few seconds
+        and listed in a thread, see `ezinput_paths`.
 
         Parameters
         ----------
@@ -849,6 +1170,10 @@ class EZInputPrompt:
             Unique identifier for this widget.
         description : str
             The prompt message displayed to the user.
+        accept : str or list of str, optional
+            File name pattern(s) of the files to complete and accept, e.g.
+            "*.csv" or "*.tif;*.tiff", as in `add_file_upload`. Default is
+            None, any file.
         remember_value : bool, optional
             If True, remembers and restores the last entered path.
             Default is True.
@@ -873,6 +1198,7 @@ class EZInputPrompt:
         --------
         >>> config = gui.add_path_completer("config", "Select config file")
         >>> print(config.value)  # e.g., Path('/home/user/config.yml')
+        >>> data = gui.add_path_completer("data", "Data", accept="*.csv")
         """
         if "value" in kwargs:
             kwargs["default"] = str(kwargs.pop("value"))
@@ -881,20 +1207,16 @@ class EZInputPrompt:
         if self.params is not None and tag in self.params:
             kwargs["default"] = str(self.params[tag])
 
-        value = prompt(  # type: ignore[misc]
+        completer, validator = _path_widgets(accept_patterns(accept))
+        return self._field(
+            tag,
+            Path,
             *args,
             message=description + ": ",
-            completer=PathCompleter(),
-            validator=Validator.from_callable(
-                lambda x: Path(x).exists(),
-                error_message="Please enter a valid path.",
-                move_cursor_to_end=True,
-            ),
+            completer=completer,
+            validator=validator,
             **kwargs,
         )
-        self.cfg[tag] = Path(value)
-        self.elements[tag] = Element(value)
-        return self.elements[tag]
 
     def add_output(self, tag: str, *args, **kwargs):
         """**@unified** - Add an output widget (no-op in terminal).
@@ -927,15 +1249,17 @@ class EZInputPrompt:
         self.elements = {}
 
     def save_parameters(self, path: str):
-        """**@unified** - Save current widget values to a YAML file.
+        """**@unified** - Save current widget values to a parameter file.
 
-        Exports all widget values to a YAML file that can be loaded later
+        Exports all widget values to a YAML, JSON, TOML or msgpack file
+        that can be loaded later
         using `load_parameters`.
 
         Parameters
         ----------
         path : str
-            The file path for saving parameters. If it doesn't end with '.yml',
+            The file path for saving parameters. The format is chosen from
+            the extension (.yml, .yaml, .json, .toml or .msgpack). Otherwise
             the filename will be auto-generated as '{title}_parameters.yml'.
 
         Examples
@@ -947,14 +1271,13 @@ class EZInputPrompt:
         --------
         load_parameters : Load parameters from a file
         """
-        if not path.endswith(".yml"):
+        if not is_supported(path):
             path += f"{self.title}_parameters.yml"
         out = {}
         for tag in self.elements:
             if hasattr(self.elements[tag], "value"):
                 out[tag] = self.elements[tag].value
-        with open(path, "w") as f:
-            yaml.dump(out, f)
+        dump_file(out, path)
 
     def _save_settings(self):
         """**@unified** - Internal method to save settings automatically.
@@ -965,24 +1288,24 @@ class EZInputPrompt:
         Notes
         -----
         Configuration files are stored in `~/.ezinput/{title}.yml`.
+        Values given on the command line or by environment variables are
+        not saved.
         """
-        for tag in self.elements:
-            if hasattr(self.elements[tag], "value"):
-                self.cfg[tag] = self.elements[tag].value
-        config_file = CONFIG_PATH / f"{self.title}.yml"
-        config_file.parent.mkdir(exist_ok=True)
-
-        base_config = self._get_config(self.title)  # loads the config file
-        for key, value in self.cfg.items():
-            base_config[key] = value
-
-        with open(config_file, "w") as f:
-            yaml.dump(base_config, f)
+        self.cfg.save(
+            {
+                tag: element.value
+                for tag, element in self.elements.items()
+                if not tag.startswith("label_")
+                and hasattr(element, "value")
+                and self._sources.get(tag) not in ("command-line", "env")
+            }
+        )
 
     def load_parameters(self, path: str):
-        """**@unified** - Load widget values from a YAML file.
+        """**@unified** - Load widget values from a parameter file.
 
-        Loads parameters from a previously saved YAML file. These values
+        Loads parameters from a previously saved YAML, JSON, TOML or msgpack
+        file. These values
         will be used as defaults when creating widgets.
 
         Parameters
@@ -1006,9 +1329,7 @@ class EZInputPrompt:
         """
         if not os.path.exists(path):
             raise FileNotFoundError(f"The file {path} does not exist.")
-        with open(path, "r") as f:
-            params = yaml.load(f, Loader=yaml.SafeLoader)
-        self.params = params
+        self.params = load_file(path)
 
     def show(self):
         """**@unified** - Finalize and display the GUI.
@@ -1022,8 +1343,150 @@ class EZInputPrompt:
         Unlike the Jupyter version which displays widgets, the terminal
         version has already shown prompts as widgets were added. This
         method primarily handles cleanup and saving.
+
+        In form mode, the widgets added since the last call are shown in
+        one full-screen form instead, see `ezinput_form`, and the callbacks
+        added meanwhile are run once it is submitted. In async mode, they
+        are prompted for one at a time. In express mode, their values are
+        listed first: Enter accepts them all, or the numbers of some of
+        them, e.g. "2,5-7", prompts for only these. Widgets without a valid
+        value are always prompted for.
+
+        Raises
+        ------
+        KeyboardInterrupt
+            If the form or a prompt is cancelled with Ctrl-C.
+        """
+        if not self._converters:
+            self._save_settings()
+            return
+        if self.form:
+            texts = run_form(self.title, self._form)
+        else:
+            texts, rows = {}, self._form
+            if self.express:
+                texts, rows = self._express(self._prompt(**self._summary()))
+            for row in rows:
+                if isinstance(row, FormField):
+                    texts[row.tag] = self._prompt(**_prompt_kwargs(row))
+                else:
+                    _print_label(row)
+        self._submit(texts)
+
+    async def show_async(self):
+        """**@unified** - Finalize and display the GUI without blocking the
+        event loop.
+
+        Same as `show`, but the widgets added in form or async mode are
+        asked with `prompt_async`, so that the other tasks of the event
+        loop, e.g. polling hardware, keep running while waiting for answers.
+
+        Raises
+        ------
+        KeyboardInterrupt
+            If the form or a prompt is cancelled with Ctrl-C.
+
+        Examples
+        --------
+        >>> gui = EZInput("acquisition", async_mode=True)
+        >>> exposure = gui.add_float_range("exposure", "Exposure", 0.0, 1.0)
+        >>> await gui.show_async()
+        """
+        if not self._converters:
+            self._save_settings()
+            return
+        if self.form:
+            texts = await run_form_async(self.title, self._form)
+        else:
+            texts, rows = {}, self._form
+            if self.express:
+                choice = await self._prompt_async(**self._summary())
+                texts, rows = self._express(choice)
+            for row in rows:
+                if isinstance(row, FormField):
+                    kwargs = _prompt_kwargs(row)
+                    texts[row.tag] = await self._prompt_async(**kwargs)
+                else:
+                    _print_label(row)
+        self._submit(texts)
+
+    def _summary(self) -> dict:
+        """Internal method listing the widgets waiting to be asked with
+        their values, numbered, for express mode.
+
+        Returns
+        -------
+        dict
+            Keyword arguments of the prompt choosing the widgets to change.
+        """
+        fields = [row for row in self._form if isinstance(row, FormField)]
+        width = max(len(field.message) for field in fields)
+        number = 0
+        for row in self._form:
+            if not isinstance(row, FormField):
+                _print_label(row)
+                continue
+            number += 1
+            value = row.default
+            if self.elements[row.tag].value is None:
+                value = "(required)"
+            print(f"{number:>3}  {row.message:<{width}}{value}")
+        return {
+            "message": "Press Enter to accept all, or the numbers of the "
+            "fields to change: ",
+            "validator": _selection_validator(len(fields)),
+        }
+
+    def _express(self, choice: str) -> tuple:
+        """Internal method accepting the values listed by `_summary`,
+        except for the widgets chosen to change and those without a valid
+        value.
+
+        Parameters
+        ----------
+        choice : str
+            The numbers of the widgets to change, e.g. "2, 5-7".
+
+        Returns
+        -------
+        tuple
+            Dictionary mapping the tags of the accepted widgets to their
+            value, as text, and the rows left to ask.
         """
+        selected = _parse_selection(choice, len(self._converters))
+        texts, rows, number = {}, [], 0
+        for row in self._form:
+            if not isinstance(row, FormField):
+                continue
+            number += 1
+            if number in selected or self.elements[row.tag].value is None:
+                rows.append(row)
+            else:
+                texts[row.tag] = row.default
+        return texts, rows
+
+    def _submit(self, texts: dict):
+        """Internal method setting the widgets answered in `show` and
+        running the callbacks waiting for them.
+
+        Parameters
+        ----------
+        texts : dict
+            Dictionary mapping the tags of the widgets to their answer.
+        """
+        for tag, text in texts.items():
+            self.cfg[tag] = self._converters[tag](text)
+            self.elements[tag].value = self.cfg[tag]
+            self._sources[tag] = "prompt"
+        callbacks = self._callbacks
+        self._init_prompt()
         self._save_settings()
+        submitted = self.get_values()
+        for func, values in callbacks:
+            for tag in values:
+                if tag in texts and not isinstance(values[tag], Element):
+                    values[tag] = submitted[tag]
+            func(values)
 
     def _get_config(self, title: Optional[str] = None) -> dict:
         """Internal method to retrieve saved configuration.
@@ -1044,23 +1507,24 @@ class EZInputPrompt:
         if title is None:
             title = self.title
 
-        config_file = CONFIG_PATH / f"{title}.yml"
-
-        if not config_file.exists():
-            return {}
+        return get_config(title, self._storage)
 
-        with open(config_file, "r") as f:
-            return yaml.load(f, Loader=yaml.SafeLoader)
-
-    def get_values(self) -> dict:
+    def get_values(self, with_sources: bool = False) -> dict:
         """**@unified** - Get current values of all widgets.
 
         Returns a dictionary of all widget values, excluding label widgets.
 
+        Parameters
+        ----------
+        with_sources : bool, optional
+            If True, each value is given with its source: "command-line",
+            "env" or "prompt". Default is False.
+
         Returns
         -------
         dict
-            Dictionary mapping widget tags to their current values.
+            Dictionary mapping widget tags to their current values, or to
+            (value, source) tuples.
             Label widgets (starting with 'label_') are excluded.
 
         Examples
@@ -1068,6 +1532,8 @@ class EZInputPrompt:
         >>> values = gui.get_values()
         >>> print(values)
         {'name': 'Alice', 'age': 30, 'confirm': True}
+        >>> gui.get_values(with_sources=True)["age"]
+        (30, 'env')
         """
         out = {}
         for tag in self.elements:
@@ -1075,6 +1541,8 @@ class EZInputPrompt:
                 pass
             elif hasattr(self.elements[tag], "value"):
                 out[tag] = self.elements[tag].value
+                if with_sources:
+                    out[tag] = (out[tag], self._sources.get(tag, "prompt"))
         return out
 
     def restore_defaults(self):
@@ -1082,15 +1550,46 @@ class EZInputPrompt:
 
         Deletes the memory file, restoring the values to the defaults setup by the developer.
         Requires rerunning the GUI to take effect. Does not affect saved configuration files.
+        Large values stored in blob files no longer used by any GUI are deleted.
 
         Examples
         --------
         >>> gui.restore_defaults()
         """
-        config_file = CONFIG_PATH / f"{self.title}.yml"
-        if config_file.exists():
-            try:
-                os.remove(config_file)
-            except OSError as e:
-                print(f"Failed to remove {config_file}: {e}")
-        self.cfg = {}
+        blobs = config_blobs(self.title, self._storage)
+        delete_config(self.title, self._storage)
+        collect_blobs(self._storage, names=blobs)
+
+    def compact_config(self, days: float | None = None):
+        """**@unified** - Drop stale tags from the memory file.
+
+        Removes the remembered values of tags that are not widgets of this
+        GUI, such as renamed or removed widgets, and of tags not used for
+        `days` days. Large values stored in blob files no longer used by any
+        GUI are deleted.
+
+        Parameters
+        ----------
+        days : float, optional
+            Also drop the tags not used for this many days. Default is None.
+
+        Returns
+        -------
+        CompactInfo
+            Named tuple with the `dropped` tags and the number of bytes
+            `reclaimed`.
+
+        Examples
+        --------
+        >>> gui.compact_config()
+        CompactInfo(dropped=['old_name'], reclaimed=24)
+        """
+        blobs = config_blobs(self.title, self._storage)
+        info = compact_config(
+            self.title,
+            keep=self.elements,
+            days=days,
+            storage=self._storage,
+        )
+        collect_blobs(self._storage, names=blobs)
+        return info
@@ -0,0 +1,213 @@
+import json
+from collections import namedtuple
+from pathlib import Path, PurePath
+
+import yaml
+
+from .ezinput_codec import PREFIX, decode, encode
+
+"""
+A module to read and write parameter and configuration files in several formats.
+"""
+
+try:
+    from yaml import CSafeDumper as _BaseDumper
+    from yaml import CSafeLoader as _BaseLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _BaseDumper
+    from yaml import SafeLoader as _BaseLoader
+
+
+class SafeLoader(_BaseLoader):
+    """YAML loader using libyaml when available."""
+
+
+class SafeDumper(_BaseDumper):
+    """YAML dumper using libyaml when available."""
+
+
+SafeDumper.add_multi_representer(
+    PurePath, lambda dumper, value: dumper.represent_str(str(value))
+)
+SafeDumper.add_representer(tuple, SafeDumper.represent_list)
+
+
+def _construct_legacy_path(loader, suffix, node):
+    return Path(*loader.construct_sequence(node))
+
+
+def _construct_legacy_tuple(loader, node):
+    return tuple(loader.construct_sequence(node))
+
+
+# files written by older versions with yaml.dump hold python/* tags for
+# paths and tuples; only these two are rebuilt, no other object is created
+SafeLoader.add_multi_constructor(
+    "tag:yaml.org,2002:python/object/apply:pathlib.", _construct_legacy_path
+)
+SafeLoader.add_constructor(
+    "tag:yaml.org,2002:python/tuple", _construct_legacy_tuple
+)
+
+Serializer = namedtuple("Serializer", ["load", "dump", "binary"])
+
+
+def yaml_load(stream):
+    """Parse a YAML document with the fastest safe loader available."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def yaml_dump(data, stream=None):
+    """Write a YAML document with the fastest safe dumper available."""
+    return yaml.dump(data, stream, Dumper=SafeDumper)
+
+
+def _json_dump(data, stream):
+    json.dump(data, stream, indent=2, default=str)
+
+
+def _toml_native(value) -> bool:
+    # TOML has no null and its arrays hold items of a single type
+    if value is None:
+        return False
+    if isinstance(value, dict):
+        return all(_toml_native(item) for item in value.values())
+    if isinstance(value, list):
+        return len({type(item) for item in value}) <= 1 and all(
+            _toml_native(item) for item in value
+        )
+    return True
+
+
+def _toml_encode(value):
+    """Store the values TOML can't represent as JSON strings, which
+    `ezinput_codec.decode` reads back."""
+    if isinstance(value, dict):
+        key = next(iter(value), None)
+        if len(value) == 1 and str(key).startswith(PREFIX):
+            # an encoded value is kept whole, its decoder needs the payload
+            if _toml_native(value):
+                return value
+            return {PREFIX + "json": json.dumps(value)}
+        return {key: _toml_encode(item) for key, item in value.items()}
+    if _toml_native(value):
+        return value
+    return {PREFIX + "json": json.dumps(value)}
+
+
+def _toml_load(stream):
+    import toml
+
+    return toml.load(stream)
+
+
+def _toml_dump(data, stream):
+    import toml
+
+    toml.dump(_toml_encode(data), stream)
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "msgpack files need the msgpack package, install it with "
+            "`pip install ezinput[msgpack]`."
+        ) from e
+    return msgpack
+
+
+def _msgpack_load(stream):
+    msgpack = _import_msgpack()
+    return msgpack.unpack(stream, raw=False)
+
+
+def _msgpack_dump(data, stream):
+    msgpack = _import_msgpack()
+    msgpack.pack(data, stream)
+
+
+SERIALIZERS = {
+    ".yml": Serializer(yaml_load, yaml_dump, False),
+    ".yaml": Serializer(yaml_load, yaml_dump, False),
+    ".json": Serializer(json.load, _json_dump, False),
+    ".toml": Serializer(_toml_load, _toml_dump, False),
+    ".msgpack": Serializer(_msgpack_load, _msgpack_dump, True),
+}
+
+
+def get_serializer(path, default=None) -> Serializer:
+    """Get the serializer matching the extension of a file.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file path.
+    default : str, optional
+        The extension whose serializer is used for unknown extensions, by
+        default None to raise an error instead.
+
+    Returns
+    -------
+    Serializer
+        Named tuple with the `load` and `dump` functions of the format, and
+        whether the file is `binary`.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not one of the `SERIALIZERS` and no `default`
+        is given.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in SERIALIZERS and default is not None:
+        suffix = default
+    if suffix not in SERIALIZERS:
+        raise ValueError(
+            f"Unsupported file extension '{suffix}', "
+            f"expected one of {list(SERIALIZERS)}."
+        )
+    return SERIALIZERS[suffix]
+
+
+def is_supported(path) -> bool:
+    """Check if a file has the extension of one of the `SERIALIZERS`."""
+    return Path(path).suffix.lower() in SERIALIZERS
+
+
+def load_file(path):
+    """Read a parameter file, using the format matching its extension.
+
+    Files with other extensions are read as YAML.
+
+    Parameters
+    ----------
+    path : str or Path
+        The file path.
+
+    Returns
+    -------
+    Any
+        The parsed content, with typed values decoded by
+        `ezinput_codec.decode`.
+    """
+    serializer = get_serializer(path, default=".yml")
+    with open(path, "rb" if serializer.binary else "r") as f:
+        return decode(serializer.load(f))
+
+
+def dump_file(data, path):
+    """Write a parameter file, using the format matching its extension.
+
+    Parameters
+    ----------
+    data : Any
+        The content to write. Typed values such as paths, tuples or NumPy
+        arrays are encoded with `ezinput_codec.encode`.
+    path : str or Path
+        The file path.
+    """
+    serializer = get_serializer(path)
+    with open(path, "wb" if serializer.binary else "w") as f:
+        serializer.dump(encode(data), f)
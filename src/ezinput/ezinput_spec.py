@@ -0,0 +1,306 @@
+import hashlib
+import io
+import json
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from . import ezinput_config
+from .ezinput_codec import decode, encode
+from .ezinput_serializers import get_serializer
+
+"""
+A module to describe GUIs in YAML or JSON spec files instead of code.
+
+A spec lists the widgets of a GUI:
+
+    title: my_analysis
+    widgets:
+      - type: label
+        value: Parameters
+      - tag: threshold
+        type: int_range
+        description: Threshold
+        min: 0
+        max: 255
+        value: 128
+      - tag: method
+        type: dropdown
+        options: [otsu, li]
+
+Any other key of a widget, e.g. `placeholder` or `step`, is passed to the
+`add_*` method of the backend as a keyword argument.
+"""
+
+# bump when the compiled form changes, to ignore older cached specs
+SPEC_VERSION = 1
+
+# positional arguments of each widget type, after the tag
+WIDGET_ARGS = {
+    "label": (),
+    "text": ("description",),
+    "text_area": ("description",),
+    "check": ("description",),
+    "int_text": ("description",),
+    "float_text": ("description",),
+    "path_completer": ("description",),
+    "int_range": ("description", "min", "max"),
+    "float_range": ("description", "min", "max"),
+    "int_slider": ("description", "min", "max"),
+    "float_slider": ("description", "min", "max"),
+    "bounded_int_text": ("description", "min", "max"),
+    "bounded_float_text": ("description", "min", "max"),
+    "dropdown": ("options", "description"),
+    "select_multiple": ("options", "description"),
+}
+
+# type of the value of numeric widgets
+NUMERIC = {
+    "int_text": int,
+    "int_range": int,
+    "int_slider": int,
+    "bounded_int_text": int,
+    "float_text": float,
+    "float_range": float,
+    "float_slider": float,
+    "bounded_float_text": float,
+}
+
+_FIELDS = ("type", "tag", "description", "options", "min", "max", "value")
+
+# a validated widget, keys other than _FIELDS are kept in kwargs
+WidgetSpec = namedtuple(
+    "WidgetSpec",
+    _FIELDS + ("kwargs",),
+    defaults=(None, "", None, None, None, None, None),
+)
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class Spec(namedtuple("Spec", ["title", "width", "widgets"])):
+    """A validated GUI spec.
+
+    Parameters
+    ----------
+    title : str
+        The title of the GUI.
+    width : str
+        The width of the widgets in Jupyter.
+    widgets : tuple of WidgetSpec
+        The widgets, in display order.
+    """
+
+    __slots__ = ()
+
+    def build(self, gui):
+        """Add the widgets of the spec to a GUI.
+
+        Parameters
+        ----------
+        gui : EZInput, EZInputPrompt or EZInputJupyter
+            The GUI to add the widgets to.
+
+        Raises
+        ------
+        ValueError
+            If a widget type is not available in the backend of the GUI.
+        """
+        for widget in self.widgets:
+            method = getattr(gui, f"add_{widget.type}", None)
+            if method is None:
+                raise ValueError(
+                    f"Widget type '{widget.type}' of '{widget.tag}' is not "
+                    f"available in {type(gui).__name__}."
+                )
+            if widget.type == "label":
+                method(widget.tag, widget.value or widget.description)
+                continue
+            args = [getattr(widget, name) for name in WIDGET_ARGS[widget.type]]
+            kwargs = dict(widget.kwargs or {})
+            if widget.value is not None:
+                kwargs["value"] = widget.value
+            method(widget.tag, *args, **kwargs)
+
+    def defaults(self) -> dict:
+        """Get the initial values declared by the spec, by tag."""
+        return {
+            widget.tag: widget.value
+            for widget in self.widgets
+            if widget.type != "label" and widget.value is not None
+        }
+
+
+def _check_widget(index: int, widget, tags: set) -> list:
+    """Get the problems of a widget description, as messages."""
+    if not isinstance(widget, dict):
+        return [f"widget {index}: expected a mapping, got {widget!r}"]
+    kind = widget.get("type")
+    tag = widget.get("tag")
+    name = f"widget {index} ({tag})" if tag else f"widget {index}"
+    if kind not in WIDGET_ARGS:
+        return [
+            (
+                f"{name}: unknown type {kind!r}, expected one of "
+                f"{sorted(WIDGET_ARGS)}"
+            )
+        ]
+    errors = []
+    if kind != "label":
+        if not isinstance(tag, str) or not tag:
+            errors.append(f"{name}: missing tag")
+        elif tag in tags:
+            errors.append(f"{name}: duplicate tag")
+        tags.add(tag)
+    for field in WIDGET_ARGS[kind]:
+        if field != "description" and widget.get(field) is None:
+            errors.append(f"{name}: missing {field}")
+    value = widget.get("value")
+    if kind in NUMERIC:
+        cast = NUMERIC[kind]
+        found = len(errors)
+        for field in ("min", "max", "value"):
+            item = widget.get(field)
+            if item is None:
+                continue
+            if isinstance(item, bool) or not isinstance(item, (int, float)):
+                errors.append(f"{name}: {field} must be a number")
+            elif cast is int and not float(item).is_integer():
+                errors.append(f"{name}: {field} must be an integer")
+        vmin, vmax = widget.get("min"), widget.get("max")
+        numbers = len(errors) == found
+        if numbers and vmin is not None and vmax is not None:
+            if vmin > vmax:
+                errors.append(f"{name}: min is larger than max")
+            elif value is not None and not vmin <= value <= vmax:
+                errors.append(f"{name}: value is out of [{vmin}, {vmax}]")
+    if kind in ("dropdown", "select_multiple"):
+        options = widget.get("options")
+        if options is not None and not isinstance(options, list):
+            errors.append(f"{name}: options must be a list")
+        elif options is not None and value is not None:
+            values = value if kind == "select_multiple" else [value]
+            if not isinstance(values, list) or any(
+                item not in options for item in values
+            ):
+                errors.append(f"{name}: value is not one of the options")
+    return errors
+
+
+def parse_spec(data, title=None) -> Spec:
+    """Validate a spec and convert it to its compiled form.
+
+    Parameters
+    ----------
+    data : dict or list
+        The spec: a mapping with `title`, `width` and `widgets` keys, or
+        just the list of widgets.
+    title : str, optional
+        The title to use if the spec has none.
+
+    Returns
+    -------
+    Spec
+        The compiled spec.
+
+    Raises
+    ------
+    ValueError
+        Listing all the problems found in the spec.
+    """
+    if isinstance(data, list):
+        data = {"widgets": data}
+    errors = []
+    tags = set()
+    if not isinstance(data, dict) or not isinstance(
+        data.get("widgets"), list
+    ):
+        errors.append("A spec must have a list of widgets.")
+    else:
+        for index, widget in enumerate(data["widgets"]):
+            errors.extend(_check_widget(index, widget, tags))
+    if errors:
+        raise ValueError("Invalid spec:\n" + "\n".join(errors))
+    widgets = []
+    for widget in data["widgets"]:
+        kwargs = {k: v for k, v in widget.items() if k not in _FIELDS}
+        fields = {k: v for k, v in widget.items() if k in _FIELDS}
+        cast = NUMERIC.get(widget["type"])
+        for field in ("min", "max", "value"):
+            if cast is not None and fields.get(field) is not None:
+                fields[field] = cast(fields[field])
+        if widget["type"] == "select_multiple" and "value" in fields:
+            fields["value"] = tuple(fields["value"])
+        widgets.append(WidgetSpec(kwargs=kwargs or None, **fields))
+    return Spec(
+        data.get("title", title), data.get("width", "50%"), tuple(widgets)
+    )
+
+
+def _cache_file(digest: str) -> Path:
+    return ezinput_config.CONFIG_PATH / "specs" / f"{digest}.json"
+
+
+def _to_json(spec: Spec) -> str:
+    widgets = [encode(list(widget)) for widget in spec.widgets]
+    return json.dumps([spec.title, spec.width, widgets])
+
+
+def _from_json(text: str) -> Spec:
+    title, width, widgets = json.loads(text)
+    return Spec(
+        title, width, tuple(WidgetSpec(*decode(item)) for item in widgets)
+    )
+
+
+def load_spec(path) -> Spec:
+    """Read, validate and compile a YAML or JSON spec file.
+
+    Compiled specs are cached in memory and in `CONFIG_PATH/specs`, keyed
+    by the SHA-256 hash of the file, so a spec file is only parsed and
+    validated again when its content changes.
+
+    Parameters
+    ----------
+    path : str or Path
+        The spec file.
+
+    Returns
+    -------
+    Spec
+        The compiled spec. Its title defaults to the file name.
+
+    Raises
+    ------
+    ValueError
+        If the spec is invalid.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(
+        b"%d:%s:" % (SPEC_VERSION, path.stem.encode()) + content
+    ).hexdigest()
+    with _CACHE_LOCK:
+        if digest in _CACHE:
+            return _CACHE[digest]
+    cache_file = _cache_file(digest)
+    try:
+        spec = _from_json(cache_file.read_text())
+    except (OSError, ValueError, TypeError):
+        serializer = get_serializer(path, default=".yml")
+        if serializer.binary:
+            data = serializer.load(io.BytesIO(content))
+        else:
+            data = serializer.load(io.StringIO(content.decode()))
+        spec = parse_spec(data, title=path.stem)
+        try:
+            ezinput_config._atomic_write(
+                cache_file, lambda f: f.write(_to_json(spec))
+            )
+        except OSError:
+            pass
+    with _CACHE_LOCK:
+        _CACHE[digest] = spec
+    return spec
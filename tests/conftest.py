@@ -1,6 +1,8 @@
-import pytest
+import sys
 import tempfile
 from pathlib import Path
+
+import pytest
 from prompt_toolkit.application import create_app_session
 from prompt_toolkit.input import create_pipe_input
 from prompt_toolkit.output import DummyOutput
@@ -36,12 +38,10 @@ def temp_config_dir(monkeypatch):
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
 
-        # Patch the CONFIG_PATH in both ezinput modules
-        import ezinput.ezinput
-        import ezinput.ezinput_prompt
+        # Patch the CONFIG_PATH shared by all ezinput modules
+        import ezinput.ezinput_config
 
-        monkeypatch.setattr(ezinput.ezinput, "CONFIG_PATH", temp_path)
-        monkeypatch.setattr(ezinput.ezinput_prompt, "CONFIG_PATH", temp_path)
+        monkeypatch.setattr(ezinput.ezinput_config, "CONFIG_PATH", temp_path)
 
         yield temp_path
 
@@ -56,6 +56,8 @@ def isolate_tests(request, monkeypatch):
         def test_that_needs_real_config():
             ...
     """
+    # widget values are read from the command line, not from pytest's
+    monkeypatch.setattr(sys, "argv", sys.argv[:1])
     # Check if test is marked to use real config
     if "use_real_config" in request.keywords:
         # Don't isolate - let test use real config directory
@@ -65,12 +67,10 @@ def isolate_tests(request, monkeypatch):
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
 
-            import ezinput.ezinput
-            import ezinput.ezinput_prompt
+            import ezinput.ezinput_config
 
-            monkeypatch.setattr(ezinput.ezinput, "CONFIG_PATH", temp_path)
             monkeypatch.setattr(
-                ezinput.ezinput_prompt, "CONFIG_PATH", temp_path
+                ezinput.ezinput_config, "CONFIG_PATH", temp_path
             )
 
             yield temp_path
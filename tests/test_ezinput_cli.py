@@ -0,0 +1,307 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ezinput import EZInput, ezinput_config
+from ezinput.ezinput_cli import (
+    BareFlag,
+    env_name,
+    find_override,
+    parse_argv,
+    read_env,
+)
+
+SCRIPT = """
+from ezinput import EZInput
+
+gui = EZInput("Test_cli_script", add_help=True)
+gui.add_float_range("threshold", "Threshold", 0.0, 1.0, value=0.5)
+gui.add_dropdown("mode", ["fast", "slow"], "Mode")
+gui.add_check("invert", "Invert")
+gui.show()
+print(gui.get_values())
+"""
+
+
+def test_parse_argv():
+    values, show_help = parse_argv(
+        [
+            "input.tif",
+            "--threshold",
+            "0.5",
+            "--mode=fast",
+            "--offset",
+            "-3",
+            "--invert",
+            "--no-denoise",
+            "--max-size",
+            "10",
+        ]
+    )
+    assert values == {
+        "threshold": BareFlag("0.5"),
+        "mode": "fast",
+        "offset": BareFlag("-3"),
+        "invert": BareFlag(None),
+        "no_denoise": BareFlag(None),
+        "max_size": BareFlag("10"),
+    }
+    assert not show_help
+    assert parse_argv(["-h"]) == ({}, True)
+
+
+def test_find_override():
+    cli, _ = parse_argv(
+        ["--no-cache", "--verbose", "input.tif", "--n", "3", "--max_size=4"]
+    )
+    assert find_override("no_cache", cli, {}, flag=True) == (
+        "command-line",
+        True,
+    )
+    assert find_override("cache", cli, {}, flag=True) == (
+        "command-line",
+        False,
+    )
+    # flags don't take the following argument as value
+    assert find_override("verbose", cli, {}, flag=True) == (
+        "command-line",
+        True,
+    )
+    assert find_override("verbose", cli, {}) == ("command-line", "input.tif")
+    assert find_override("n", cli, {}) == ("command-line", "3")
+    assert find_override("max-size", cli, {}) == ("command-line", "4")
+    assert find_override("cache", cli, {}) is None
+    assert find_override("max-size", {}, {"MAX_SIZE": "5"}) == ("env", "5")
+
+
+def test_flag_without_value(temp_config_dir):
+    cli, _ = parse_argv(["--threshold", "--verbose"])
+    assert find_override("verbose", cli, {}, flag=True) == (
+        "command-line",
+        True,
+    )
+    with pytest.raises(ValueError, match="--verbose"):
+        find_override("verbose", cli, {})
+    gui = EZInput("Test_cli_no_value", mode="headless", argv=["--name"])
+    with pytest.raises(ValueError, match="--name"):
+        gui.add_text("name", "Name")
+
+
+def test_command_line_flags_headless(temp_config_dir):
+    gui = EZInput(
+        "Test_cli_flags",
+        mode="headless",
+        argv=["--no-cache", "--dry-run", "input.tif", "--out-dir", "x"],
+    )
+    gui.add_check("no_cache", "No cache", value=False)
+    gui.add_check("dry-run", "Dry run", value=False)
+    gui.add_text("out-dir", "Output")
+    assert gui.get_values() == {
+        "no_cache": True,
+        "dry-run": True,
+        "out-dir": "x",
+    }
+
+
+def test_command_line_values_skip_prompts(mock_input, temp_config_dir):
+    gui = EZInput(
+        "Test_cli_prompt",
+        argv=["--threshold", "0.25", "--mode", "fast", "--no-invert"],
+    )
+    gui.add_float_range("threshold", "Threshold", 0.0, 1.0)
+    gui.add_dropdown("mode", ["fast", "slow"], "Mode")
+    gui.add_check("invert", "Invert")
+    mock_input.send_text("other\n")
+    gui.add_text("name", "Name")
+    gui.show()
+    assert gui.get_values() == {
+        "threshold": 0.25,
+        "mode": "fast",
+        "invert": False,
+        "name": "other",
+    }
+    # one-off values are not remembered as defaults
+    assert ezinput_config.get_config("Test_cli_prompt") == {"name": "other"}
+
+
+def test_overrides_keep_saved_config(mock_input, temp_config_dir):
+    ezinput_config.save_config("Test_cli_saved", {"count": 2, "mode": "slow"})
+    gui = EZInput("Test_cli_saved", argv=["--count", "9", "--mode", "fast"])
+    gui.add_int_range("count", "Count", 0, 10)
+    gui.add_dropdown("mode", ["fast", "slow"], "Mode")
+    gui.show()
+    assert gui.get_values() == {"count": 9, "mode": "fast"}
+    assert ezinput_config.get_config("Test_cli_saved") == {
+        "count": 2,
+        "mode": "slow",
+    }
+
+
+def test_invalid_command_line_value(mock_input, temp_config_dir):
+    gui = EZInput("Test_cli_invalid", argv=["--mode", "medium"])
+    with pytest.raises(ValueError, match="--mode"):
+        gui.add_dropdown("mode", ["fast", "slow"], "Mode")
+
+
+def test_command_line_values_headless(temp_config_dir):
+    gui = EZInput(
+        "Test_cli_headless",
+        mode="headless",
+        argv=["--n", "3", "--choice", "2", "--items", "a,b"],
+    )
+    gui.add_int_range("n", "N", 0, 10, value=1)
+    gui.add_dropdown("choice", [1, 2, 3])
+    gui.add_select_multiple("items", ["a", "b", "c"])
+    assert gui.get_values() == {"n": 3, "choice": 2, "items": ("a", "b")}
+
+
+def _run(tmp_path, *args):
+    script = tmp_path / "script.py"
+    script.write_text(SCRIPT)
+    env = dict(os.environ, EZINPUT_CONFIG_PATH=str(tmp_path / "config"))
+    return subprocess.run(
+        [sys.executable, str(script), *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=False,
+    )
+
+
+def test_script_runs_from_flags(tmp_path):
+    out = _run(tmp_path, "--threshold", "0.8", "--mode", "slow", "--invert")
+    assert out.returncode == 0, out.stderr
+    assert "{'threshold': 0.8, 'mode': 'slow', 'invert': True}" in out.stdout
+
+
+def test_help_lists_widget_flags(tmp_path):
+    out = _run(tmp_path, "--help")
+    assert out.returncode == 0, out.stderr
+    assert "usage: script.py" in out.stdout
+    assert "--threshold FLOAT" in out.stdout
+    assert "Threshold (0.0-1.0) (current: 0.5)" in out.stdout
+    assert "--mode {fast,slow}" in out.stdout
+    assert "--invert, --no-invert" in out.stdout
+
+
+def test_help_when_a_value_is_read(tmp_path):
+    script = tmp_path / "loop.py"
+    script.write_text(
+        "from ezinput import EZInput\n"
+        "gui = EZInput('Test_cli_loop', add_help=True)\n"
+        "n = gui.add_int_range('n', 'Count', 0, 10)\n"
+        "for i in range(n.value):\n"
+        "    print(i)\n"
+    )
+    env = dict(os.environ, EZINPUT_CONFIG_PATH=str(tmp_path / "config"))
+    out = subprocess.run(
+        [sys.executable, str(script), "--help"],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=False,
+    )
+    assert out.returncode == 0, out.stderr
+    assert "--n INT" in out.stdout
+
+
+def test_help_is_opt_in(temp_config_dir):
+    gui = EZInput("Test_cli_no_help", argv=["--help"], mode="headless")
+    assert gui.add_int_range("n", "N", 0, 10, value=3).value == 3
+    gui.show()
+
+
+def test_read_env():
+    environ = {
+        "EZINPUT_MY_APP_THRESHOLD": "0.5",
+        "EZINPUT_MY_APP_": "ignored",
+        "EZINPUT_OTHER_THRESHOLD": "1",
+    }
+    assert read_env("my-app", environ) == {"THRESHOLD": "0.5"}
+    environ = {
+        "EZINPUT_CONFIG_PATH": "/tmp/config",
+        "EZINPUT_CONFIG_MODE": "fast",
+        "EZINPUT_CACHE_PATH": "/tmp/cache",
+    }
+    assert read_env("config", environ) == {"MODE": "fast"}
+    assert read_env("cache", environ) == {}
+    assert env_name("my-app", "max size") == "EZINPUT_MY_APP_MAX_SIZE"
+
+
+def test_environment_values_prompt(mock_input, monkeypatch, temp_config_dir):
+    monkeypatch.setenv("EZINPUT_TEST_ENV_PROMPT_COUNT", "7")
+    monkeypatch.setenv("EZINPUT_TEST_ENV_PROMPT_MODE", "slow")
+    gui = EZInput("Test_env_prompt", argv=["--mode", "fast"])
+    gui.add_int_range("count", "Count", 0, 10)
+    gui.add_dropdown("mode", ["fast", "slow"], "Mode")
+    mock_input.send_text("hello\n")
+    gui.add_text("name", "Name")
+    assert gui.get_values(with_sources=True) == {
+        "count": (7, "env"),
+        "mode": ("fast", "command-line"),
+        "name": ("hello", "prompt"),
+    }
+
+
+def test_invalid_environment_value(mock_input, monkeypatch, temp_config_dir):
+    monkeypatch.setenv("EZINPUT_TEST_ENV_INVALID_COUNT", "70")
+    gui = EZInput("Test_env_invalid")
+    with pytest.raises(ValueError, match="EZINPUT_TEST_ENV_INVALID_COUNT"):
+        gui.add_int_range("count", "Count", 0, 10)
+
+
+def test_environment_values_headless(monkeypatch, temp_config_dir, tmp_path):
+    monkeypatch.setenv("EZINPUT_TEST_ENV_HEADLESS_FLAG", "true")
+    monkeypatch.setenv("EZINPUT_TEST_ENV_HEADLESS_X", "0.25")
+    params = tmp_path / "params.yml"
+    params.write_text("x: 0.5\ny: 2\n")
+    gui = EZInput(
+        "Test_env_headless", mode="headless", params_file=str(params)
+    )
+    gui.add_check("flag", "Flag", value=False)
+    gui.add_float_range("x", "X", 0, 1)
+    gui.add_int_text("y", "Y")
+    gui.add_int_text("z", "Z", value=3)
+    assert gui.get_values(with_sources=True) == {
+        "flag": (True, "env"),
+        "x": (0.25, "env"),
+        "y": (2, "params"),
+        "z": (3, "default"),
+    }
+
+
+def test_environment_values_jupyter(monkeypatch, temp_config_dir):
+    from ezinput import EZInputJupyter
+
+    monkeypatch.setenv("EZINPUT_TEST_ENV_JUPYTER_N", "4")
+    monkeypatch.setenv("EZINPUT_TEST_ENV_JUPYTER_ITEMS", "a,c")
+    monkeypatch.setenv("EZINPUT_TEST_ENV_JUPYTER_ON", "no")
+    gui = EZInputJupyter("Test_env_jupyter")
+    gui.add_int_range("n", "N", 0, 10)
+    gui.add_select_multiple("items", ["a", "b", "c"])
+    gui.add_check("on", "On", value=True)
+    gui.add_text("name", "Name", value="x")
+    assert gui.get_values(with_sources=True) == {
+        "n": (4, "env"),
+        "items": (("a", "c"), "env"),
+        "on": (False, "env"),
+        "name": ("x", "widget"),
+    }
+    gui._save_settings()
+    assert ezinput_config.get_config("Test_env_jupyter") == {"name": "x"}
+    gui["n"].value = 5
+    assert gui.get_values(with_sources=True)["n"] == (5, "widget")
+    gui._save_settings()
+    assert ezinput_config.get_config("Test_env_jupyter") == {
+        "n": 5,
+        "name": "x",
+    }
+
+    monkeypatch.setenv("EZINPUT_TEST_ENV_JUPYTER_BAD", "11")
+    gui = EZInputJupyter("Test_env_jupyter")
+    with pytest.raises(ValueError, match="out of"):
+        gui.add_int_range("bad", "Bad", 0, 10)
@@ -0,0 +1,56 @@
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+
+import pytest
+
+from ezinput.ezinput_codec import decode, encode
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        Path("/data/images"),
+        (1, 2.5, "a"),
+        {"b", "a"},
+        frozenset({1, 2}),
+        datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        date(2024, 5, 1),
+        time(8, 15),
+        [Path("a"), (1, (2, 3))],
+        {"key": (1, 2)},
+        {"!path": "plain dict"},
+        {"!dict": 1},
+    ],
+)
+def test_roundtrip(value):
+    assert decode(encode(value)) == value
+    assert type(decode(encode(value))) is type(value)
+
+
+def test_plain_values_are_unchanged():
+    value = {"a": [1, 2.0, "x", True, None]}
+    assert encode(value) == value
+    assert decode(value) == value
+
+
+def test_encoding_is_compact():
+    assert encode(Path("/tmp")) == {"!path": "/tmp"}
+    assert encode((1, 2)) == {"!tuple": [1, 2]}
+    assert encode({2, 1}) == {"!set": [1, 2]}
+
+
+def test_unknown_tags_are_kept():
+    assert decode({"!unknown": 1}) == {"!unknown": 1}
+
+
+def test_numpy_values():
+    np = pytest.importorskip("numpy")
+    array = np.arange(6, dtype=np.float32).reshape(2, 3)
+    decoded = decode(encode(array))
+    assert decoded.dtype == array.dtype
+    assert np.array_equal(decoded, array)
+    decoded[0, 0] = 1
+    scalar = decode(encode(np.int16(7)))
+    assert scalar == 7 and type(scalar) is np.int16
+    with pytest.raises(TypeError):
+        encode(np.array([object()]))
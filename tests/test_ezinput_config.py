@@ -0,0 +1,618 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ezinput import EZInput, ezinput_config
+
+
+def _concurrent_writer(config_path, writer, saves):
+    ezinput_config.CONFIG_PATH = Path(config_path)
+    snapshot = {}
+    for i in range(saves):
+        ezinput_config.save_config(
+            "Test_concurrent", {f"writer_{writer}": i}, snapshot
+        )
+
+
+def test_config_cache_hits(mock_input):
+    ezinput_config.clear_cache()
+    gui = EZInput("Test_config_cache")
+    mock_input.send_text("hello\n")
+    gui.add_text("name", "Enter name:")
+    gui.show()
+    gui.show()
+    gui2 = EZInput("Test_config_cache")
+    info = ezinput_config.cache_info()
+    # only the very first lookup, before the file existed, was a miss,
+    # the second show() had nothing to save and gui2 shares the live
+    # config of gui
+    assert info.misses == 1
+    assert info.hits == 1
+    assert gui2.cfg is gui.cfg
+    assert gui2.cfg["name"] == "hello"
+
+
+def test_config_cache_detects_external_changes(temp_config_dir):
+    ezinput_config.save_config("Test_config_external", {"a": 1})
+    assert ezinput_config.get_config("Test_config_external") == {"a": 1}
+
+    config_file = temp_config_dir / "Test_config_external.yml"
+    config_file.write_text(yaml.dump({"a": 1, "b": 2, "padding": "x"}))
+    assert ezinput_config.get_config("Test_config_external")["b"] == 2
+
+
+def test_get_config_returns_copy(temp_config_dir):
+    ezinput_config.save_config("Test_config_copy", {"a": 1})
+    cfg = ezinput_config.get_config("Test_config_copy")
+    cfg["a"] = 2
+    assert ezinput_config.get_config("Test_config_copy") == {"a": 1}
+
+
+def test_unchanged_values_are_not_rewritten(mock_input, temp_config_dir):
+    gui = EZInput("Test_config_dirty")
+    mock_input.send_text("hello\n")
+    gui.add_text("name", "Enter name:")
+    gui.show()
+    config_file = temp_config_dir / "Test_config_dirty.yml"
+    stamp = config_file.stat().st_mtime_ns
+
+    gui.show()
+    gui2 = EZInput("Test_config_dirty")
+    mock_input.send_text("\n")
+    gui2.add_text("name", "Enter name:")
+    gui2.show()
+    assert config_file.stat().st_mtime_ns == stamp
+
+
+def test_only_changed_tags_are_merged(temp_config_dir):
+    snapshot = {"a": 1, "b": 1}
+    ezinput_config.save_config("Test_config_merge", dict(snapshot))
+    # another process changes "b" in the meantime
+    ezinput_config.save_config("Test_config_merge", {"b": 2})
+
+    assert ezinput_config.save_config(
+        "Test_config_merge", {"a": 3, "b": 1}, snapshot
+    )
+    assert ezinput_config.get_config("Test_config_merge") == {"a": 3, "b": 2}
+    assert not ezinput_config.save_config(
+        "Test_config_merge", {"a": 3, "b": 1}, snapshot
+    )
+    # 1 and True are different values for YAML
+    assert ezinput_config.save_config(
+        "Test_config_merge", {"a": 3, "b": True}, snapshot
+    )
+
+
+def test_journal_storage_appends_changes(monkeypatch, temp_config_dir):
+    storage = ezinput_config.JournalStorage()
+    monkeypatch.setattr(ezinput_config, "_STORAGE", storage)
+    snapshot = {}
+    ezinput_config.save_config("Test_journal", {"a": 1, "b": "x"}, snapshot)
+    ezinput_config.save_config("Test_journal", {"a": 2, "b": "x"}, snapshot)
+
+    journal = temp_config_dir / "Test_journal.journal"
+    assert len(journal.read_text().splitlines()) == 3
+    assert not (temp_config_dir / "Test_journal.yml").exists()
+
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_journal") == {"a": 2, "b": "x"}
+
+
+def test_journal_storage_recovers_partial_write(monkeypatch, temp_config_dir):
+    storage = ezinput_config.JournalStorage()
+    monkeypatch.setattr(ezinput_config, "_STORAGE", storage)
+    ezinput_config.save_config("Test_journal_crash", {"a": 1})
+    journal = temp_config_dir / "Test_journal_crash.journal"
+    with open(journal, "a") as f:
+        f.write('{"tag": "a", "val')  # interrupted write
+
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_journal_crash") == {"a": 1}
+    ezinput_config.save_config("Test_journal_crash", {"b": 2})
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_journal_crash") == {"a": 1, "b": 2}
+
+
+def test_journal_storage_compaction(monkeypatch, temp_config_dir):
+    storage = ezinput_config.JournalStorage(compact_size=200)
+    monkeypatch.setattr(ezinput_config, "_STORAGE", storage)
+    for i in range(20):
+        ezinput_config.save_config("Test_journal_compact", {"i": i})
+    storage.compact("Test_journal_compact")
+
+    journal = temp_config_dir / "Test_journal_compact.journal"
+    snapshot = temp_config_dir / "Test_journal_compact.yml"
+    assert journal.stat().st_size == 0
+    assert yaml.safe_load(snapshot.read_text()) == {"i": 19}
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_journal_compact") == {"i": 19}
+
+
+def test_sqlite_storage_per_instance(mock_input, temp_config_dir):
+    gui = EZInput("Test_sqlite", storage="sqlite")
+    mock_input.send_text("hello\n")
+    gui.add_text("name", "Enter name:")
+    mock_input.send_text("7\n")
+    gui.add_int_text("count", "Enter count:")
+    gui.show()
+
+    assert (temp_config_dir / "ezinput.db").exists()
+    assert not (temp_config_dir / "Test_sqlite.yml").exists()
+    ezinput_config.clear_cache()
+    gui2 = EZInput("Test_sqlite", storage="sqlite")
+    assert gui2.cfg == {"name": "hello", "count": 7}
+
+    gui2.restore_defaults()
+    assert ezinput_config.get_config("Test_sqlite", "sqlite") == {}
+
+
+def test_sqlite_delete_and_rewrite(temp_config_dir):
+    ezinput_config.save_config(
+        "Test_sqlite_rewrite", {"a": 1}, storage="sqlite"
+    )
+    assert ezinput_config.get_config("Test_sqlite_rewrite", "sqlite") == {
+        "a": 1
+    }
+    # another process, with its own connection, deletes and rewrites it
+    other = ezinput_config.SQLiteStorage(temp_config_dir / "ezinput.db")
+    other.delete("Test_sqlite_rewrite")
+    other.write("Test_sqlite_rewrite", {"a": 2}, {"a": 2})
+    assert ezinput_config.get_config("Test_sqlite_rewrite", "sqlite") == {
+        "a": 2
+    }
+    other.delete("Test_sqlite_rewrite")
+    assert ezinput_config.get_config("Test_sqlite_rewrite", "sqlite") == {}
+    assert "Test_sqlite_rewrite" not in other.titles()
+
+
+def test_migrate_yaml_configs_to_sqlite(temp_config_dir):
+    (temp_config_dir / "Test_migrate_1.yml").write_text(yaml.dump({"a": 1}))
+    (temp_config_dir / "Test_migrate_2.yml").write_text(
+        yaml.dump({"b": [1, 2], "c": "x"})
+    )
+    titles = ezinput_config.migrate_configs("sqlite", remove=True)
+
+    assert titles == ["Test_migrate_1", "Test_migrate_2"]
+    assert not list(temp_config_dir.glob("*.yml"))
+    storage = ezinput_config.get_storage("sqlite")
+    assert sorted(storage.titles()) == titles
+    assert ezinput_config.get_config("Test_migrate_2", "sqlite") == {
+        "b": [1, 2],
+        "c": "x",
+    }
+
+
+def test_concurrent_writers_do_not_lose_updates(temp_config_dir):
+    processes = [
+        multiprocessing.Process(
+            target=_concurrent_writer, args=(str(temp_config_dir), w, 25)
+        )
+        for w in range(4)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+    cfg = yaml.safe_load((temp_config_dir / "Test_concurrent.yml").read_text())
+    assert cfg == {f"writer_{w}": 24 for w in range(4)}
+    assert not list(temp_config_dir.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("storage", ["yaml", "journal", "sqlite"])
+def test_typed_values_roundtrip(temp_config_dir, storage):
+    cfg = {
+        "path": Path("/data/images"),
+        "pair": (1, "a"),
+        "choices": {"x", "y"},
+        "when": datetime(2024, 5, 1, 12, 30),
+        "nested": [(1, 2), {"!path": "not a path"}],
+    }
+    ezinput_config.save_config("Test_typed", cfg, storage=storage)
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_typed", storage) == cfg
+
+
+def test_typed_values_are_safe_yaml(temp_config_dir):
+    ezinput_config.save_config("Test_typed_yaml", {"path": Path("/tmp")})
+    text = (temp_config_dir / "Test_typed_yaml.yml").read_text()
+    assert "python/" not in text
+    assert yaml.safe_load(text) == {"path": {"!path": "/tmp"}}
+
+
+def test_legacy_python_tags_are_read(temp_config_dir):
+    legacy = yaml.dump({"path": Path("/tmp/x"), "pair": (1, 2)})
+    (temp_config_dir / "Test_legacy.yml").write_text(legacy)
+    assert ezinput_config.get_config("Test_legacy") == {
+        "path": Path("/tmp/x"),
+        "pair": (1, 2),
+    }
+
+
+def test_large_values_are_stored_in_blobs(temp_config_dir):
+    text = "x" * (ezinput_config.BLOB_THRESHOLD + 1)
+    ezinput_config.save_config("Test_blob", {"text": text, "small": 1})
+    stored = yaml.safe_load((temp_config_dir / "Test_blob.yml").read_text())
+    assert stored["small"] == 1
+    assert list(stored["text"]) == [ezinput_config.BLOB_TAG]
+
+    ezinput_config.clear_cache()
+    cfg = ezinput_config.get_config("Test_blob")
+    assert isinstance(dict.__getitem__(cfg, "text"), ezinput_config.Blob)
+    assert cfg["text"] == text
+    assert dict(cfg) == {"text": text, "small": 1}
+
+
+def test_blobs_are_deduplicated_and_collected(monkeypatch, temp_config_dir):
+    monkeypatch.setattr(ezinput_config, "BLOB_GRACE", 0)
+    values = {"items": list(range(ezinput_config.BLOB_THRESHOLD))}
+    ezinput_config.save_config("Test_blob_a", values)
+    ezinput_config.save_config("Test_blob_b", values)
+    blobs = list(ezinput_config.blob_dir().iterdir())
+    assert len(blobs) == 1
+
+    gui = EZInput("Test_blob_a")
+    gui.restore_defaults()
+    assert blobs[0].exists()
+    assert ezinput_config.get_config("Test_blob_b") == values
+
+    gui = EZInput("Test_blob_b")
+    gui.restore_defaults()
+    assert not blobs[0].exists()
+
+
+@pytest.mark.parametrize("storage", ["yaml", "journal", "sqlite"])
+def test_collect_blobs_of_a_config(monkeypatch, temp_config_dir, storage):
+    monkeypatch.setattr(ezinput_config, "BLOB_GRACE", 0)
+    size = ezinput_config.BLOB_THRESHOLD + 1
+    shared = {"items": list(range(size))}
+    ezinput_config.save_config("Test_blob_c", shared, storage=storage)
+    ezinput_config.save_config(
+        "Test_blob_d", dict(shared, own="y" * size), storage=storage
+    )
+    ezinput_config.save_config("Test_blob_e", {"orphan": "z" * size})
+    ezinput_config.delete_config("Test_blob_e")
+    assert len(list(ezinput_config.blob_dir().iterdir())) == 3
+
+    blobs = ezinput_config.config_blobs("Test_blob_d", storage)
+    assert len(blobs) == 2
+    ezinput_config.delete_config("Test_blob_d", storage)
+    removed = ezinput_config.collect_blobs(storage, names=blobs)
+    # the blob still used by Test_blob_c is kept, and blobs of other
+    # configs are left to a full collection
+    assert len(removed) == 1
+    assert len(list(ezinput_config.blob_dir().iterdir())) == 2
+    assert ezinput_config.get_config("Test_blob_c", storage) == shared
+    assert len(ezinput_config.collect_blobs(storage)) == 1
+
+
+def test_large_arrays_are_memory_mapped(temp_config_dir):
+    np = pytest.importorskip("numpy")
+    array = np.arange(ezinput_config.BLOB_THRESHOLD, dtype=np.float64)
+    ezinput_config.save_config("Test_blob_array", {"array": array})
+    ezinput_config.clear_cache()
+    loaded = ezinput_config.get_config("Test_blob_array")["array"]
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, array)
+
+
+def test_config_path_from_environment(tmp_path):
+    code = "from ezinput.ezinput_config import CONFIG_PATH; print(CONFIG_PATH)"
+    env = dict(os.environ, EZINPUT_CONFIG_PATH=str(tmp_path / "cfg"))
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == str(tmp_path / "cfg")
+
+
+def _writeback(tmp_path):
+    return ezinput_config.WriteBackStorage(tmp_path / "cache", sync_delay=60)
+
+
+def test_writeback_storage_syncs_in_background(temp_config_dir, tmp_path):
+    storage = _writeback(tmp_path)
+    storage.sync_delay = 0.05
+    ezinput_config.save_config("Test_writeback", {"a": 1}, storage=storage)
+    assert storage.local_file("Test_writeback").exists()
+    time.sleep(0.5)
+    assert not storage.pending
+    remote = temp_config_dir / "Test_writeback.yml"
+    assert yaml.safe_load(remote.read_text()) == {"a": 1}
+
+
+def test_writeback_storage_syncs_saves_pending_at_exit(tmp_path):
+    code = (
+        "import sys\n"
+        "from ezinput import ezinput_config\n"
+        "from ezinput.ezinput_jupyter import EZInputJupyter\n"
+        "storage = ezinput_config.WriteBackStorage(sys.argv[1], 60)\n"
+        "gui = EZInputJupyter('Test_exit', save_delay=60, storage=storage)\n"
+        "gui.add_int_range('n', 'N', 0, 10)\n"
+        "gui.show()\n"
+        "gui['n'].value = 5\n"
+    )
+    env = dict(os.environ, EZINPUT_CONFIG_PATH=str(tmp_path / "config"))
+    subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path / "cache")],
+        env=env,
+        check=True,
+        timeout=60,
+    )
+    remote = tmp_path / "config" / "Test_exit.yml"
+    assert yaml.safe_load(remote.read_text()) == {"n": 5}
+
+
+def test_writeback_storage_stages_blobs(temp_config_dir, tmp_path):
+    storage = _writeback(tmp_path)
+    text = "x" * (ezinput_config.BLOB_THRESHOLD + 1)
+    ezinput_config.save_config(
+        "Test_writeback_blob", {"t": text}, storage=storage
+    )
+    assert not (temp_config_dir / "blobs").exists()
+    staged = list(storage.blob_dir.iterdir())
+    assert len(staged) == 1
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_writeback_blob", storage) == {
+        "t": text
+    }
+
+    storage.flush()
+    assert not staged[0].exists()
+    assert (temp_config_dir / "blobs" / staged[0].name).exists()
+    ezinput_config.clear_cache()
+    cfg = ezinput_config.get_config("Test_writeback_blob", storage)
+    assert cfg["t"] == text
+
+
+def test_writeback_storage_pulls_in_background(
+    monkeypatch, temp_config_dir, tmp_path
+):
+    (temp_config_dir / "Test_writeback_slow.yml").write_text("a: 1\n")
+    storage = ezinput_config.WriteBackStorage(
+        tmp_path / "cache", sync_delay=60, pull_timeout=0.05
+    )
+    read_remote = storage._read_remote
+
+    def slow_read_remote(title):
+        time.sleep(0.3)
+        return read_remote(title)
+
+    monkeypatch.setattr(storage, "_read_remote", slow_read_remote)
+    t0 = time.perf_counter()
+    assert ezinput_config.get_config("Test_writeback_slow", storage) == {}
+    assert time.perf_counter() - t0 < 0.25
+    # saved before the copy finished, then merged over CONFIG_PATH
+    ezinput_config.save_config(
+        "Test_writeback_slow", {"b": 2}, storage=storage
+    )
+    time.sleep(0.5)
+    storage.flush()
+    assert ezinput_config.get_config("Test_writeback_slow", storage) == {
+        "a": 1,
+        "b": 2,
+    }
+    remote = temp_config_dir / "Test_writeback_slow.yml"
+    assert yaml.safe_load(remote.read_text()) == {"a": 1, "b": 2}
+
+
+def test_writeback_storage_pulls_and_merges(temp_config_dir, tmp_path):
+    remote = temp_config_dir / "Test_writeback_merge.yml"
+    remote.write_text(yaml.dump({"a": 1, "b": 1}))
+    storage = _writeback(tmp_path)
+    assert ezinput_config.get_config("Test_writeback_merge", storage) == {
+        "a": 1,
+        "b": 1,
+    }
+
+    # b changed elsewhere, a changed locally
+    remote.write_text(yaml.dump({"a": 1, "b": 2}))
+    ezinput_config.save_config("Test_writeback_merge", {"a": 3}, {}, storage)
+    assert yaml.safe_load(remote.read_text()) == {"a": 1, "b": 2}
+    storage.flush()
+    assert yaml.safe_load(remote.read_text()) == {"a": 3, "b": 2}
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_writeback_merge", storage) == {
+        "a": 3,
+        "b": 2,
+    }
+    assert storage.conflicts == []
+
+
+def test_writeback_storage_detects_conflicts(temp_config_dir, tmp_path):
+    storage = _writeback(tmp_path)
+    ezinput_config.save_config(
+        "Test_writeback_conflict", {"a": 1}, {}, storage
+    )
+    storage.flush()
+    remote = temp_config_dir / "Test_writeback_conflict.yml"
+    remote.write_text(yaml.dump({"a": 2}))
+    ezinput_config.save_config(
+        "Test_writeback_conflict", {"a": 3}, {}, storage
+    )
+    storage.flush()
+    assert storage.conflicts == [("Test_writeback_conflict", ["a"])]
+    assert yaml.safe_load(remote.read_text()) == {"a": 3}
+
+
+def test_writeback_storage_delete(temp_config_dir, tmp_path):
+    storage = _writeback(tmp_path)
+    ezinput_config.save_config(
+        "Test_writeback_delete", {"a": 1}, {}, storage
+    )
+    storage.flush()
+    ezinput_config.delete_config("Test_writeback_delete", storage)
+    storage.flush()
+    assert not (temp_config_dir / "Test_writeback_delete.yml").exists()
+    assert ezinput_config.get_config("Test_writeback_delete", storage) == {}
+
+
+def test_same_title_shares_live_config(mock_input, temp_config_dir):
+    gui = EZInput("Test_shared")
+    gui2 = EZInput("Test_shared")
+    assert gui.cfg is gui2.cfg
+    mock_input.send_text("hello\n")
+    gui.add_text("name", "Enter name:")
+    assert gui2.cfg["name"] == "hello"
+    gui.show()
+
+    # gui2 does not overwrite the value saved by gui with a stale copy
+    mock_input.send_text("7\n")
+    gui2.add_int_text("count", "Enter count:")
+    gui2.show()
+    assert ezinput_config.get_config("Test_shared") == {
+        "name": "hello",
+        "count": 7,
+    }
+
+    # values saved by another process are picked up by both
+    config_file = temp_config_dir / "Test_shared.yml"
+    config_file.write_text(yaml.dump({"name": "other", "count": 7}))
+    gui3 = EZInput("Test_shared")
+    assert gui3.cfg is gui.cfg
+    assert gui.cfg["name"] == "other"
+
+    gui.restore_defaults()
+    assert gui2.cfg == {}
+
+
+def test_compact_config_drops_absent_tags(mock_input, temp_config_dir):
+    ezinput_config.save_config(
+        "Test_compact", {"old_name": "x" * 100, "label_1": "Title"}
+    )
+    gui = EZInput("Test_compact")
+    gui.add_label(value="Title")
+    mock_input.send_text("hello\n")
+    gui.add_text("name", "Enter name:")
+    gui.show()
+    assert "label_2" not in ezinput_config.get_config("Test_compact")
+
+    info = gui.compact_config()
+    assert info.dropped == ["label_1", "old_name"]
+    assert info.reclaimed > 100
+    assert ezinput_config.get_config("Test_compact") == {"name": "hello"}
+    assert "old_name" not in gui.cfg
+
+
+@pytest.mark.parametrize("storage", ["yaml", "journal", "sqlite"])
+def test_compact_config_drops_unused_tags(temp_config_dir, storage):
+    title = "Test_compact_days"
+    ezinput_config.save_config(
+        title, {"old": 1, "new": 2, "unseen": 3}, storage=storage
+    )
+    now = time.time()
+    ezinput_config.touch_tags(
+        title, ["old"], now=now - 40 * 24 * 3600, storage=storage
+    )
+    ezinput_config.touch_tags(title, ["new"], now=now, storage=storage)
+    info = ezinput_config.compact_config(title, days=30, storage=storage)
+    assert info.dropped == ["old"]
+    ezinput_config.clear_cache()
+    cfg = ezinput_config.get_config(title, storage)
+    assert cfg == {"new": 2, "unseen": 3}
+    # tags without a recorded usage start aging at the first compaction
+    usage = ezinput_config.tag_usage(title, storage)
+    assert "unseen" in usage
+    assert "old" not in usage
+
+
+def test_touch_tags_is_rate_limited(temp_config_dir):
+    ezinput_config.touch_tags("Test_touch", ["a"], now=1000.0)
+    usage_file = ezinput_config.usage_file("Test_touch")
+    stamp = usage_file.stat().st_mtime_ns
+    ezinput_config.touch_tags("Test_touch", ["a"], now=1001.0)
+    assert usage_file.stat().st_mtime_ns == stamp
+    assert ezinput_config.tag_usage("Test_touch") == {"a": 1000.0}
+
+
+def test_writeback_usage_kept_local(temp_config_dir, tmp_path):
+    storage = _writeback(tmp_path)
+    shared = ezinput_config.shared_config("Test_usage_local", storage)
+    shared.save({"a": 1})
+    shared.touch(["b"])
+    assert storage.usage_file("Test_usage_local").exists()
+    assert list(temp_config_dir.glob(".*.used.json")) == []
+    assert set(ezinput_config.tag_usage("Test_usage_local", storage)) == {
+        "a",
+        "b",
+    }
+    storage.flush()
+
+
+@pytest.mark.skipif(ezinput_config.fcntl is None, reason="needs fcntl")
+@pytest.mark.parametrize("storage", ["yaml", "journal"])
+def test_lock_files_are_removed(temp_config_dir, storage):
+    ezinput_config.save_config("Test_lock", {"a": 1}, storage=storage)
+    lock = temp_config_dir / ".Test_lock.lock"
+    assert lock.exists()
+    ezinput_config.delete_config("Test_lock", storage)
+    assert not lock.exists()
+
+    ezinput_config.save_config("Test_lock_kept", {"a": 1}, storage=storage)
+    (temp_config_dir / ".Test_lock_orphan.lock").touch()
+    removed = ezinput_config.collect_locks(storage)
+    assert removed == [temp_config_dir / ".Test_lock_orphan.lock"]
+    assert (temp_config_dir / ".Test_lock_kept.lock").exists()
+
+
+@pytest.mark.skipif(ezinput_config.fcntl is None, reason="needs fcntl")
+def test_lock_removed_while_waiting(temp_config_dir):
+    path = temp_config_dir / ".Test_lock_wait.lock"
+    acquired = []
+
+    def wait():
+        with ezinput_config._file_lock(path):
+            acquired.append(path.exists())
+
+    with ezinput_config._file_lock(path):
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.1)
+        ezinput_config._remove_lock(path)
+    waiter.join(5)
+    # the waiter locked a new file rather than the removed one
+    assert acquired == [True]
+
+
+def test_gc_command(temp_config_dir):
+    ezinput_config.save_config("Test_gc", {"a": 1, "label_1": "x" * 50})
+    ezinput_config.save_config("Test_gc_clean", {"b": 2})
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from ezinput.ezinput_config import gc; gc()",
+            "--path",
+            str(temp_config_dir),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "Test_gc: dropped label_1" in result.stdout
+    assert "Compacted 1 configurations" in result.stdout
+    ezinput_config.clear_cache()
+    assert ezinput_config.get_config("Test_gc") == {"a": 1}
+    assert ezinput_config.get_config("Test_gc_clean") == {"b": 2}
+
+
+def test_writeback_storage_syncs_compaction(temp_config_dir, tmp_path):
+    storage = _writeback(tmp_path)
+    title = "Test_writeback_compact"
+    ezinput_config.save_config(title, {"a": 1, "b": 2}, {}, storage)
+    storage.flush()
+    ezinput_config.compact_config(title, keep=["a"], storage=storage)
+    storage.flush()
+    remote = yaml.safe_load((temp_config_dir / f"{title}.yml").read_text())
+    assert remote == {"a": 1}
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ezinput import EZInput, EZInputHeadless, ezinput_config
+
+
+def _params(tmp_path, params):
+    path = tmp_path / "params.yml"
+    path.write_text(yaml.dump(params))
+    return str(path)
+
+
+def test_mode_argument_selects_headless(temp_config_dir):
+    gui = EZInput("Test_headless_mode", mode="headless")
+    assert gui.mode == "headless"
+    assert isinstance(gui, EZInputHeadless)
+
+
+def test_mode_from_environment(monkeypatch, temp_config_dir):
+    monkeypatch.setenv("EZINPUT_MODE", "headless")
+    assert EZInput("Test_headless_env").mode == "headless"
+
+
+def test_unknown_mode_is_rejected(temp_config_dir):
+    with pytest.raises(ValueError, match="Unknown mode"):
+        EZInput("Test_headless_unknown", mode="batch")
+
+
+def test_values_resolve_from_params_then_cfg_then_default(
+    temp_config_dir, tmp_path
+):
+    ezinput_config.save_config(
+        "Test_headless_order", {"threshold": 10, "method": "li"}
+    )
+    gui = EZInput(
+        "Test_headless_order",
+        mode="headless",
+        params_file=_params(tmp_path, {"threshold": 20}),
+    )
+    gui.add_label(value="Parameters")
+    gui.add_int_range("threshold", "Threshold", 0, 255, value=5)
+    gui.add_dropdown("method", ["otsu", "li"], "Method", value="otsu")
+    gui.add_check("invert", "Invert", value=False)
+    gui.add_text("name", "Name", value="run")
+    gui.show()
+    assert gui.get_values() == {
+        "threshold": 20,
+        "method": "li",
+        "invert": False,
+        "name": "run",
+    }
+    # headless runs don't change the remembered values
+    assert ezinput_config.get_config("Test_headless_order") == {
+        "threshold": 10,
+        "method": "li",
+    }
+    # nor write any file
+    assert list(temp_config_dir.glob(".*.used.json")) == []
+
+
+def test_stale_remembered_values_are_skipped(temp_config_dir):
+    ezinput_config.save_config("Test_headless_stale", {"n": 50, "m": "x"})
+    gui = EZInput("Test_headless_stale", mode="headless")
+    assert gui.add_int_range("n", "N", 0, 10, value=3).value == 3
+    assert gui.add_dropdown("m", ["a", "b"], value="a").value == "a"
+    gui.show()
+
+
+def test_placeholder_is_not_a_value(temp_config_dir):
+    gui = EZInput("Test_headless_placeholder", mode="headless")
+    assert gui.add_text("a", "A", "e.g. sample_1").value == ""
+    assert gui.add_text("b", "B", "e.g. sample_1", value="x").value == "x"
+
+
+def test_all_missing_and_invalid_values_are_reported(
+    temp_config_dir, tmp_path
+):
+    gui = EZInput(
+        "Test_headless_errors",
+        mode="headless",
+        params_file=_params(
+            tmp_path, {"a": 300, "b": "c", "p": "/does/not/exist"}
+        ),
+    )
+    gui.add_int_range("a", "A", 0, 255)
+    gui.add_dropdown("b", ["x", "y"])
+    gui.add_float_text("c", "C")
+    gui.add_path_completer("p", "P")
+    gui.add_select_multiple("s", ["x", "y"], value=["z"])
+    gui.add_int_text("ok", "OK", value=1)
+    with pytest.raises(ValueError) as error:
+        gui.show()
+    message = str(error.value)
+    for tag in ("a:", "b:", "c: missing value", "p:", "s:"):
+        assert tag in message
+    assert "ok:" not in message
+    with pytest.raises(ValueError):
+        gui.get_values()
+    with pytest.raises(ValueError):
+        gui.add_callback("run", print, {})
+
+
+def test_params_values_are_converted(temp_config_dir, tmp_path):
+    gui = EZInput(
+        "Test_headless_convert",
+        mode="headless",
+        params_file=_params(
+            tmp_path,
+            {"n": 4.0, "x": 1, "flag": "yes", "path": str(tmp_path)},
+        ),
+    )
+    assert gui.add_int_text("n").value == 4
+    assert gui.add_float_range("x", "X", 0, 2).value == 1.0
+    assert gui.add_check("flag", "Flag").value is True
+    assert gui.add_path_completer("path", "Path").value == Path(tmp_path)
+
+
+def test_spec_runs_headless(temp_config_dir, tmp_path):
+    spec = tmp_path / "job.yml"
+    spec.write_text(
+        yaml.dump(
+            {
+                "widgets": [
+                    {
+                        "tag": "n",
+                        "type": "int_slider",
+                        "min": 0,
+                        "max": 9,
+                        "value": 2,
+                    },
+                    {
+                        "tag": "f",
+                        "type": "select_multiple",
+                        "options": ["a", "b"],
+                    },
+                ]
+            }
+        )
+    )
+    gui = EZInput.from_spec(spec, mode="headless")
+    gui.show()
+    assert gui.get_values() == {"n": 2, "f": ()}
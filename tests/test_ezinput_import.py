@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+
+# run in a fresh interpreter, records every filesystem write made while
+# importing ezinput
+IMPORT_CHECK = """
+import os
+import sys
+
+writes = []
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND
+WRITE_EVENTS = (
+    "os.mkdir", "os.rename", "os.remove", "os.rmdir", "os.symlink",
+    "os.truncate", "os.chmod", "os.utime",
+)
+
+
+def hook(event, args):
+    if event == "open" and args[2] & WRITE_FLAGS:
+        writes.append((event, args[0]))
+    elif event in WRITE_EVENTS:
+        writes.append((event, args[0]))
+
+
+sys.addaudithook(hook)
+import ezinput  # noqa: E402
+
+print(writes)
+"""
+
+
+def test_import_does_not_write_files(tmp_path):
+    config_path = tmp_path / "missing" / ".ezinput"
+    env = dict(
+        os.environ,
+        EZINPUT_CONFIG_PATH=str(config_path),
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "[]"
+    assert not config_path.exists()
+
+
+def test_terminal_gui_does_not_load_widgets(tmp_path):
+    code = (
+        "import sys\n"
+        "from ezinput import EZInput\n"
+        "gui = EZInput('Test_lazy_import')\n"
+        "assert gui.mode == 'prompt'\n"
+        "print(sorted({'ipywidgets', 'IPython'} & set(sys.modules)))\n"
+    )
+    env = dict(os.environ, EZINPUT_CONFIG_PATH=str(tmp_path))
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_backends_are_loaded_on_demand():
+    import ezinput
+    from ezinput.ezinput_jupyter import EZInputJupyter
+    from ezinput.ezinput_prompt import EZInputPrompt
+
+    assert ezinput.EZInputJupyter is EZInputJupyter
+    assert ezinput.EZInputPrompt is EZInputPrompt
+    assert "EZInputJupyter" in dir(ezinput)
+
+
+def test_headless_gui_does_not_load_ui_libraries(tmp_path):
+    code = (
+        "import sys\n"
+        "from ezinput import EZInput\n"
+        "gui = EZInput('Test_lazy_headless')\n"
+        "assert gui.mode == 'headless'\n"
+        "gui.add_int_range('n', 'N', 0, 10, value=3)\n"
+        "gui.show()\n"
+        "names = {'ipywidgets', 'IPython', 'prompt_toolkit', 'sqlite3',\n"
+        "         'argparse', 'tempfile', 'getpass'}\n"
+        "print(sorted(names & set(sys.modules)))\n"
+    )
+    env = dict(
+        os.environ, EZINPUT_CONFIG_PATH=str(tmp_path), EZINPUT_MODE="headless"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,83 @@
+import time
+
+import yaml
+
+from ezinput import EZInputJupyter
+from ezinput.ezinput_jupyter import DebouncedSaver
+
+
+def test_debounced_saver_merges_bursts():
+    calls = []
+    saver = DebouncedSaver(lambda: calls.append(1), delay=0.05, max_delay=1.0)
+    for _ in range(20):
+        saver.request()
+    assert calls == []
+    assert saver.pending
+    time.sleep(0.3)
+    assert calls == [1]
+    assert not saver.pending
+
+
+def test_debounced_saver_max_delay():
+    calls = []
+    saver = DebouncedSaver(lambda: calls.append(1), delay=0.1, max_delay=0.2)
+    start = time.monotonic()
+    while time.monotonic() - start < 0.5:
+        saver.request()
+        time.sleep(0.01)
+    saver.flush()
+    # the burst never went quiet, but max_delay forced intermediate saves
+    assert len(calls) >= 2
+
+
+def test_value_changes_are_written_once(temp_config_dir):
+    gui = EZInputJupyter("Test_jupyter_debounce", save_delay=10)
+    gui.add_int_range("slider", "Slider", 0, 100)
+    gui.show()
+    for value in range(1, 50):
+        gui["slider"].value = value
+    config_file = temp_config_dir / "Test_jupyter_debounce.yml"
+    assert not config_file.exists()
+    gui._flush_settings()
+    assert yaml.safe_load(config_file.read_text())["slider"] == 49
+
+
+def test_restore_defaults_cancels_pending_save(temp_config_dir):
+    gui = EZInputJupyter("Test_jupyter_restore", save_delay=0.05)
+    gui.add_int_range("s", "S", 0, 10)
+    gui.show()
+    gui["s"].value = 5
+    assert gui._saver.pending
+    gui.restore_defaults()
+    assert not gui._saver.pending
+    time.sleep(0.3)
+    assert not (temp_config_dir / "Test_jupyter_restore.yml").exists()
+
+
+def test_callback_flushes_pending_changes(temp_config_dir):
+    seen = {}
+
+    def callback(values):
+        config_file = temp_config_dir / "Test_jupyter_callback.yml"
+        seen.update(yaml.safe_load(config_file.read_text()))
+
+    gui = EZInputJupyter("Test_jupyter_callback", save_delay=10)
+    gui.add_text("name", "Name:")
+    gui.add_callback("run", callback, gui.elements)
+    gui.show()
+    gui["name"].value = "Alice"
+    gui["run"].click()
+    assert seen["name"] == "Alice"
+    assert not gui._saver.pending
+
+
+def test_select_multiple_is_remembered(temp_config_dir):
+    gui = EZInputJupyter("Test_jupyter_select_multiple")
+    gui.add_select_multiple("features", ["A", "B", "C"], "Features")
+    gui.show()
+    gui["features"].value = ("A", "C")
+    gui._flush_settings()
+
+    gui2 = EZInputJupyter("Test_jupyter_select_multiple")
+    gui2.add_select_multiple("features", ["A", "B", "C"], "Features")
+    assert gui2["features"].value == ("A", "C")
@@ -0,0 +1,64 @@
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+from ezinput import EZInput
+from ezinput.ezinput_options import IndexedCompleter, OptionIndex
+
+OPTIONS = ["beta", "Alpha", "alphabet", "gamma", "alpine", "delta"]
+
+
+def _complete(completer, text):
+    completions = completer.get_completions(Document(text), CompleteEvent())
+    return [c.text for c in completions]
+
+
+def test_prefix():
+    index = OptionIndex(OPTIONS)
+    options = [OPTIONS[i] for i in index.prefix("al")]
+    # in list order, ignoring case
+    assert options == ["Alpha", "alphabet", "alpine"]
+    assert index.prefix("alpha") == [1, 2]
+    assert index.prefix("z") == []
+    assert index.prefix("", limit=2) == [0, 1]
+    assert len(index.prefix("al", limit=2)) == 2
+
+
+def test_contains():
+    index = OptionIndex(OPTIONS)
+    assert "Alpha" in index
+    assert "alpha" not in index
+    assert len(index) == len(OPTIONS)
+
+
+def test_fuzzy():
+    index = OptionIndex(["sample_0012", "sample_0120", "s12", "other"])
+    # tightest matches first
+    assert index.fuzzy("s12") == [2, 1, 0]
+    assert index.fuzzy("s12", limit=1) == [2]
+    assert index.fuzzy("s12", exclude={2}) == [1, 0]
+    assert index.fuzzy("xyz") == []
+
+
+def test_completer():
+    index = OptionIndex(OPTIONS)
+    completer = IndexedCompleter(index)
+    assert _complete(completer, "alp") == ["Alpha", "alphabet", "alpine"]
+    assert _complete(completer, "lph") == []
+    completer = IndexedCompleter(index, fuzzy=True, limit=3)
+    assert _complete(completer, "alp") == ["Alpha", "alphabet", "alpine"]
+    assert _complete(completer, "lph") == ["Alpha", "alphabet"]
+    # prefix matches first, then fuzzy ones
+    assert _complete(completer, "be") == ["beta", "alphabet"]
+    # the whole text is replaced by the option
+    completions = list(
+        completer.get_completions(Document("al"), CompleteEvent())
+    )
+    assert completions[0].start_position == -2
+
+
+def test_prompt_dropdown_large(mock_input):
+    options = [f"sample_{i:05d}" for i in range(50000)]
+    gui = EZInput("Test_options_prompt")
+    mock_input.send_text("sample_04242\n")
+    value = gui.add_dropdown("sample", options, "Sample", fuzzy=True)
+    assert value.value == "sample_04242"
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+from prompt_toolkit.validation import ValidationError
+
+from ezinput import EZInput, ezinput_config
+from ezinput.ezinput_paths import (
+    CachedPathCompleter,
+    DirectoryCache,
+    PathValidator,
+    accept_patterns,
+)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name in ("a.csv", "b.csv", "c.txt"):
+        (tmp_path / name).write_text("")
+    (tmp_path / "sub").mkdir()
+    return tmp_path
+
+
+def _complete(completer, text):
+    completions = completer.get_completions(Document(text), CompleteEvent())
+    return [c.display_text for c in completions]
+
+
+def test_accept_patterns():
+    assert accept_patterns(None) == ()
+    assert accept_patterns("*.csv") == ("*.csv",)
+    assert accept_patterns("*.tif; *.tiff") == ("*.tif", "*.tiff")
+    assert accept_patterns(["*.csv", "*.txt"]) == ("*.csv", "*.txt")
+
+
+def test_listdir_cached(folder):
+    cache = DirectoryCache()
+    assert cache.listdir(str(folder)) == {
+        "a.csv": False,
+        "b.csv": False,
+        "c.txt": False,
+        "sub": True,
+    }
+    (folder / "d.csv").write_text("")
+    assert "d.csv" not in cache.listdir(str(folder))
+    cache.clear()
+    assert "d.csv" in cache.listdir(str(folder))
+    # expired listings are listed again
+    cache = DirectoryCache(ttl=0)
+    cache.listdir(str(folder))
+    (folder / "e.csv").write_text("")
+    assert "e.csv" in cache.listdir(str(folder))
+
+
+def test_exists_memoized(folder, monkeypatch):
+    cache = DirectoryCache()
+    calls = []
+    exists = Path.exists
+
+    def counting_exists(self, *args, **kwargs):
+        calls.append(self)
+        return exists(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "exists", counting_exists)
+    assert not cache.exists(folder / "missing")
+    assert not cache.exists(folder / "missing")
+    assert len(calls) == 1
+    # once the folder is listed, its entries are checked without stat
+    cache.listdir(str(folder))
+    assert cache.exists(folder / "a.csv")
+    assert cache.exists(str(folder / "sub"))
+    assert not cache.exists(folder / "other")
+    assert len(calls) == 1
+
+
+def test_completer_accept(folder):
+    completer = CachedPathCompleter(accept="*.csv", cache=DirectoryCache())
+    assert _complete(completer, f"{folder}/") == ["a.csv", "b.csv", "sub/"]
+    assert _complete(completer, f"{folder}/b") == ["b.csv"]
+    completer = CachedPathCompleter(cache=DirectoryCache())
+    assert _complete(completer, f"{folder}/c") == ["c.txt"]
+
+
+def test_validator_accept(folder):
+    validator = PathValidator(accept="*.csv", cache=DirectoryCache())
+    validator.validate(Document(str(folder / "a.csv")))
+    with pytest.raises(ValidationError, match="valid path"):
+        validator.validate(Document(str(folder / "z.csv")))
+    with pytest.raises(ValidationError, match=r"matching \*\.csv"):
+        validator.validate(Document(str(folder / "c.txt")))
+
+
+def test_prompt_path_accept(mock_input, folder):
+    gui = EZInput("Test_paths_prompt")
+    mock_input.send_text(f"{folder / 'a.csv'}\n")
+    path = gui.add_path_completer("path", "Data", accept="*.csv")
+    assert path.value == folder / "a.csv"
+    gui.show()
+    ezinput_config.clear_cache()
+    saved = ezinput_config.get_config("Test_paths_prompt")["path"]
+    assert saved == folder / "a.csv"
+
+
+def test_headless_path_accept(temp_config_dir, folder):
+    gui = EZInput("Test_paths_headless", mode="headless", argv=[])
+    gui.add_path_completer(
+        "data", "Data", accept="*.csv", value=str(folder / "c.txt")
+    )
+    with pytest.raises(ValueError, match=r"does not match \*\.csv"):
+        gui.show()
@@ -1,6 +1,10 @@
-from ezinput import EZInput
+import asyncio
+
+import pytest
 import yaml
 
+from ezinput import EZInput
+
 
 def test_env_detection():
     gui = EZInput(title="Test_prompt_1")
@@ -291,3 +295,178 @@ def test_save_and_load_parameters_roundtrip(tmp_path, mock_input):
     assert values2["t"] == "alpha"
     assert values2["i"] == 9
     assert values2["f"] == 1.5
+
+
+def test_save_and_load_parameters_formats(tmp_path, mock_input):
+    gui = EZInput("Test_prompt_formats")
+    mock_input.send_text("alpha\n")
+    gui.add_text("t", "Enter text:", remember_value=True)
+    mock_input.send_text("9\n")
+    gui.add_int_text("i", "Enter int:", remember_value=True)
+
+    for name in ("params.json", "params.toml"):
+        out_file = tmp_path / name
+        gui.save_parameters(str(out_file))
+
+        gui2 = EZInput("Test_prompt_formats_2", params_file=str(out_file))
+        mock_input.send_text("\n")
+        gui2.add_text("t", "Enter text:", remember_value=True)
+        mock_input.send_text("\n")
+        gui2.add_int_text("i", "Enter int:", remember_value=True)
+        assert gui2.get_values() == {"t": "alpha", "i": 9}
+
+
+def test_session_reused_across_fields(mock_input):
+    gui = EZInput("Test_prompt_session")
+    mock_input.send_text("Option 2\nfree text\n5\n")
+    gui.add_dropdown("dropdown", ["Option 1", "Option 2"], "Select:")
+    session = gui._session
+    # the completer and validator of the dropdown must not leak
+    gui.add_text("text", "Enter text:")
+    gui.add_int_range("number", "Number:", 0, 10)
+    assert gui._session is session
+    assert session.completer is None
+    assert gui.get_values() == {
+        "dropdown": "Option 2",
+        "text": "free text",
+        "number": 5,
+    }
+
+
+def test_validators_cached():
+    from ezinput import ezinput_prompt
+
+    options = ["Option 1", "Option 2"]
+    assert ezinput_prompt._choice_validator(
+        options
+    ) is ezinput_prompt._choice_validator(list(options))
+    assert ezinput_prompt._choice_completer(
+        options
+    ) is ezinput_prompt._choice_completer(list(options))
+    assert ezinput_prompt._range_validator(
+        int, 0, 10
+    ) is ezinput_prompt._range_validator(int, 0, 10)
+    assert ezinput_prompt._range_validator(
+        int, 0, 10
+    ) is not ezinput_prompt._range_validator(int, 0, 100)
+
+
+def test_form(mock_input):
+    gui = EZInput("Test_prompt_form", form=True)
+    gui.add_label(value="Settings")
+    name = gui.add_text("name", "Name", value="Alice")
+    number = gui.add_int_range("number", "Number", 0, 10)
+    gui.add_dropdown("choice", ["a", "b"], "Choice", value="a")
+    gui.add_check("check", "Check", value=False)
+    # nothing is asked until show
+    assert name.value == "Alice"
+    assert number.value is None
+    # 42 is rejected inline, shift-tab goes back to the first field
+    mock_input.send_text("\t42\n\x7f\n\x1b[Z\x1b[Z")
+    mock_input.send_text("\x7f" * 5 + "Bob\t\t\x7fb\n\x7f\x7fyes\n")
+    gui.show()
+    assert gui.get_values(with_sources=True) == {
+        "name": ("Bob", "prompt"),
+        "number": (4, "prompt"),
+        "choice": ("b", "prompt"),
+        "check": (True, "prompt"),
+    }
+    assert number.value == 4
+    assert gui._get_config()["number"] == 4
+
+
+def test_form_callback_and_override(mock_input, monkeypatch):
+    monkeypatch.setenv("EZINPUT_TEST_PROMPT_FORM_2_NUMBER", "3")
+    gui = EZInput("Test_prompt_form_2", form=True, argv=[])
+    gui.add_text("name", "Name")
+    gui.add_int_range("number", "Number", 0, 10)
+    calls = []
+    gui.add_callback("run", calls.append, gui.get_values())
+    assert calls == []
+    mock_input.send_text("Bob\n")
+    gui.show()
+    assert calls == [{"name": "Bob", "number": 3}]
+    assert gui.get_values(with_sources=True)["number"] == (3, "env")
+
+
+def test_show_async_keeps_loop_running(mock_input):
+    gui = EZInput("Test_prompt_async", async_mode=True)
+    gui.add_label(value="Acquisition")
+    gui.add_text("name", "Name")
+    exposure = gui.add_float_range("exposure", "Exposure", 0.0, 1.0)
+    # nothing is asked until show_async
+    assert exposure.value is None
+    period = 0.01
+    lateness = []
+
+    async def ticker():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + period
+        while True:
+            await asyncio.sleep(deadline - loop.time())
+            lateness.append(loop.time() - deadline)
+            deadline += period
+
+    async def operator():
+        # answer while the prompt is waiting for input
+        await asyncio.sleep(20 * period)
+        mock_input.send_text("Bob\n")
+        await asyncio.sleep(20 * period)
+        mock_input.send_text("0.5\n")
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        answer = asyncio.create_task(operator())
+        await gui.show_async()
+        await answer
+        task.cancel()
+
+    asyncio.run(main())
+    assert gui.get_values() == {"name": "Bob", "exposure": 0.5}
+    # a blocking prompt would stop the ticker until both answers are in
+    assert len(lateness) >= 10
+    assert max(lateness) < 0.2
+
+
+def test_express_accept_all(mock_input, capsys):
+    gui = EZInput("Test_prompt_express", express=True)
+    gui.add_label(value="Settings")
+    gui.add_text("name", "Name", value="Alice")
+    gui.add_int_range("number", "Number", 0, 10, value=3)
+    gui.add_check("check", "Check", value=True)
+    # a single Enter accepts every listed value
+    mock_input.send_text("\n")
+    gui.show()
+    out = capsys.readouterr().out
+    assert "Settings" in out
+    assert "  1  Name: " in out and "Alice" in out
+    assert gui.get_values() == {"name": "Alice", "number": 3, "check": True}
+
+
+def test_express_change_some(mock_input, capsys):
+    gui = EZInput("Test_prompt_express_2", express=True)
+    gui.add_text("name", "Name", value="Alice")
+    gui.add_int_range("number", "Number", 0, 10)
+    gui.add_check("check", "Check", value=True)
+    gui.add_dropdown("choice", ["a", "b"], "Choice", value="a")
+    # 9 is not a field, the number without a value is always asked
+    mock_input.send_text("9\n\x7f3-4\n7\n\x7f\x7f\x7fno\n\x7fb\n")
+    gui.show()
+    assert "(required)" in capsys.readouterr().out
+    assert gui.get_values() == {
+        "name": "Alice",
+        "number": 7,
+        "check": False,
+        "choice": "b",
+    }
+
+
+def test_parse_selection():
+    from ezinput.ezinput_prompt import _parse_selection
+
+    assert _parse_selection("", 5) == set()
+    assert _parse_selection("2, 4-5", 5) == {2, 4, 5}
+    assert _parse_selection("1 3", 5) == {1, 3}
+    for text in ("0", "6", "x", "4-2", "-3"):
+        with pytest.raises(ValueError):
+            _parse_selection(text, 5)
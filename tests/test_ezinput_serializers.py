@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ezinput import ezinput_serializers
+from ezinput.ezinput_serializers import (
+    SERIALIZERS,
+    dump_file,
+    get_serializer,
+    is_supported,
+    load_file,
+    yaml_dump,
+    yaml_load,
+)
+
+
+def test_libyaml_used_when_available():
+    if yaml.__with_libyaml__:
+        assert issubclass(ezinput_serializers.SafeLoader, yaml.CSafeLoader)
+        assert issubclass(ezinput_serializers.SafeDumper, yaml.CSafeDumper)
+    else:
+        assert issubclass(ezinput_serializers.SafeLoader, yaml.SafeLoader)
+
+
+def test_yaml_roundtrip_is_safe():
+    data = {"a": 1, "b": [1.5, "x"], "c": (1, 2), "d": Path("/tmp/x")}
+    text = yaml_dump(data)
+    assert "!!python" not in text
+    assert yaml_load(text) == {
+        "a": 1,
+        "b": [1.5, "x"],
+        "c": [1, 2],
+        "d": "/tmp/x",
+    }
+
+
+@pytest.mark.parametrize("suffix", [".yml", ".yaml", ".json", ".toml"])
+def test_file_roundtrip(tmp_path, suffix):
+    data = {"text": "value", "number": 3, "ratio": 0.5, "flag": True}
+    path = tmp_path / f"params{suffix}"
+    dump_file(data, path)
+    assert load_file(path) == data
+
+
+@pytest.mark.parametrize("suffix", list(SERIALIZERS))
+@pytest.mark.parametrize(
+    "value",
+    [
+        (1, 2),
+        (1, "a", None),
+        Path("/data/images"),
+        [1, "a", 2.5, True],
+        [[1, 2], ["a"]],
+        [{"a": 1}, 2],
+        None,
+        {"nested": None, "items": [None, Path("a")]},
+        {"!json": "not encoded"},
+    ],
+)
+def test_typed_value_roundtrip(tmp_path, suffix, value):
+    if suffix == ".msgpack":
+        pytest.importorskip("msgpack")
+    data = {"value": value, "text": "value"}
+    path = tmp_path / f"params{suffix}"
+    dump_file(data, path)
+    assert load_file(path) == data
+    assert type(load_file(path)["value"]) is type(value)
+
+
+def test_msgpack_is_optional(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "msgpack", None)
+    with pytest.raises(ImportError, match=r"ezinput\[msgpack\]"):
+        dump_file({"a": 1}, tmp_path / "params.msgpack")
+
+
+def test_unsupported_extension(tmp_path):
+    assert not is_supported("params.txt")
+    assert is_supported("PARAMS.JSON")
+    with pytest.raises(ValueError):
+        get_serializer(tmp_path / "params.txt")
+    with pytest.raises(ValueError):
+        dump_file({"a": 1}, tmp_path / "params.txt")
+
+
+@pytest.mark.parametrize("name", ["params.txt", "params.cfg", "params"])
+def test_unknown_extension_is_read_as_yaml(tmp_path, name):
+    path = tmp_path / name
+    path.write_text("a: 1\nb: [x, y]\n")
+    assert load_file(path) == {"a": 1, "b": ["x", "y"]}
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+import yaml
+
+from ezinput import EZInput, ezinput_spec
+from ezinput.ezinput_spec import load_spec, parse_spec
+
+SPEC = {
+    "title": "Test_spec",
+    "widgets": [
+        {"type": "label", "value": "Parameters"},
+        {"tag": "name", "type": "text", "description": "Name"},
+        {
+            "tag": "count",
+            "type": "int_range",
+            "description": "Count",
+            "min": 0,
+            "max": 10,
+            "value": 3,
+        },
+        {
+            "tag": "method",
+            "type": "dropdown",
+            "description": "Method",
+            "options": ["a", "b"],
+            "value": "b",
+        },
+    ],
+}
+
+
+def test_from_spec_builds_prompt_gui(tmp_path, mock_input):
+    path = tmp_path / "gui.yml"
+    path.write_text(yaml.dump(SPEC))
+    mock_input.send_text("alice\n")
+    mock_input.send_text("\n")
+    mock_input.send_text("\n")
+    gui = EZInput.from_spec(path)
+    assert gui.title == "Test_spec"
+    assert gui.spec.defaults() == {"count": 3, "method": "b"}
+    assert gui.get_values() == {"name": "alice", "count": 3, "method": "b"}
+
+
+def test_spec_validation_reports_all_errors():
+    widgets = [
+        {"type": "int_range", "tag": "x", "min": 5, "max": 1},
+        {"type": "unknown", "tag": "y"},
+        {"type": "text", "description": "no tag"},
+        {"type": "dropdown", "tag": "d", "options": [1], "value": 2},
+        {"type": "float_text", "tag": "d"},
+    ]
+    with pytest.raises(ValueError) as error:
+        parse_spec(widgets)
+    message = str(error.value)
+    assert "widget 0 (x): min is larger than max" in message
+    assert "unknown type 'unknown'" in message
+    assert "widget 2: missing tag" in message
+    assert "value is not one of the options" in message
+    assert "widget 4 (d): duplicate tag" in message
+
+
+def test_compiled_spec_is_cached(monkeypatch, tmp_path):
+    path = tmp_path / "gui.json"
+    path.write_text(json.dumps(SPEC))
+    spec = load_spec(path)
+    assert list(ezinput_spec.ezinput_config.CONFIG_PATH.glob("specs/*.json"))
+
+    # a new process only reads the compact cached form
+    monkeypatch.setattr(ezinput_spec, "_CACHE", {})
+    monkeypatch.setattr(ezinput_spec, "parse_spec", None)
+    assert load_spec(path) == spec
+
+    path.write_text(json.dumps(dict(SPEC, title="Changed")))
+    monkeypatch.setattr(ezinput_spec, "parse_spec", parse_spec)
+    assert load_spec(path).title == "Changed"